@@ -0,0 +1,367 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# asyncviyaclient.py
+# October 2026
+#
+# An asyncio version of callrestapi for tools that need hundreds of requests in flight at once, for example
+# walking a large folder tree or listing every identity. It has the same semantics as callrestapi: headers,
+# etag in and out, stoponerror, head returning the status code and multipart requests.
+#
+# The HTTP backend is chosen when the module is imported: aiohttp if it is installed, then httpx, otherwise
+# the requests are made with the synchronous callrestapi code on a thread pool so tools still work.
+#
+# AsyncViyaClient
+#   callrestapi        same arguments and return values as sharedfunctions.callrestapi
+#   callrestapi_many   make a batch of requests and return a list of RestCallResult in the same order
+#   iterpaged          async generator of the items of a collection, following the links with rel=next
+#
+# The number of requests in flight is limited by a semaphore, max_concurrency defaults to PYVIYA_ASYNC_CONCURRENCY
+# or pyviya.async.concurrency in application.properties.
+#
+# Responses with a status the RetryPolicy retries (429, 502, 503, 504) are retried with the same policy, backoff
+# and budget as the ViyaClient, and every request is recorded by the profiler when profiling is on. Compared
+# with callrestapi there are some gaps when aiohttp or httpx is used:
+#   - the AdaptiveLimiter is not used, it blocks a thread while it waits, the semaphore is a fixed limit instead
+#   - connection errors raise the exception of the backend and are not retried
+#   - responses are not read from or written to the ResponseCache
+#   - PYVIYA_MAX_RPS is not applied
+# Without aiohttp or httpx the synchronous code is used and none of these apply.
+#
+# Example:
+#
+#   import asyncio
+#   from asyncviyaclient import AsyncViyaClient
+#
+#   async def main():
+#       async with AsyncViyaClient(max_concurrency=100) as client:
+#           async for group in client.iterpaged('/identities/groups?limit=1000'):
+#               print(group['id'])
+#
+#   asyncio.run(main())
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 json is encoded and decoded with jsonbody and jsonloads from sharedfunctions
+#  18OCT2026 the auth token is read on a thread, multipart files are rewound before a retry, the retry policy and profiler are used
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import asyncio
+import os
+import ssl
+import sys
+import time
+
+from sharedfunctions import getbaseurl, getauthtoken, gettokenmanager, getcliprofile, getpyviyasetting, \
+    RestCallResult, RESTMETHODS, _restcall, _decoderesult, _callrestapi_argnames, jsonloads, jsonbody, \
+    RetryPolicy, getretryafter, getprofiler, rewindfiles
+
+# choose the backend, aiohttp then httpx, None means use the synchronous client on a thread pool
+try:
+    import aiohttp
+    backend='aiohttp'
+except ImportError:
+    try:
+        import httpx
+        backend='httpx'
+    except ImportError:
+        backend=None
+
+
+class AsyncViyaClient(object):
+
+    def __init__(self,max_concurrency=None,retrypolicy=None):
+
+        if max_concurrency is None:
+            max_concurrency=int(getpyviyasetting('PYVIYA_ASYNC_CONCURRENCY','pyviya.async.concurrency',50))
+
+        if retrypolicy is None:
+            retrypolicy=RetryPolicy()
+
+        self.max_concurrency=max_concurrency
+        self.retrypolicy=retrypolicy
+        self.backend=backend
+        self.session=None
+        self.semaphore=None
+
+    async def __aenter__(self):
+
+        await self.open()
+        return self
+
+    async def __aexit__(self,exc_type,exc,tb):
+
+        await self.close()
+
+    # create the backend session, called on first use if the client is not used as a context manager
+    async def open(self):
+
+        if self.semaphore is None:
+            self.semaphore=asyncio.Semaphore(self.max_concurrency)
+
+        if self.session is not None:
+            return
+
+        verify=self.getsslverify()
+
+        if self.backend=='aiohttp':
+            if verify is False: sslarg=False
+            elif verify is True: sslarg=None
+            else: sslarg=ssl.create_default_context(cafile=verify)
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency,ssl=sslarg)
+            self.session=aiohttp.ClientSession(connector=connector)
+
+        elif self.backend=='httpx':
+            limits=httpx.Limits(max_connections=self.max_concurrency,max_keepalive_connections=self.max_concurrency)
+            self.session=httpx.AsyncClient(verify=verify,limits=limits,timeout=None)
+
+    async def close(self):
+
+        if self.session is not None:
+            if self.backend=='aiohttp':
+                await self.session.close()
+            else:
+                await self.session.aclose()
+            self.session=None
+
+    # False when PYVIYA_INSECURE is set, otherwise the CA bundle used by requests or True
+    @staticmethod
+    def getsslverify():
+
+        if getcliprofile().insecure:
+            return False
+
+        cafile=os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('SSL_CERT_FILE')
+        if cafile:
+            return cafile
+
+        return True
+
+    # send one request and return the status code, headers and body
+    async def _send(self,reqtype,url,head,json_data,data,params):
+
+        method=reqtype.replace('multipart','').upper()
+        multipart=reqtype.endswith('multipart')
+
+        if self.backend=='aiohttp':
+
+            if multipart:
+                body=aiohttp.FormData()
+                for name,value in data.items():
+                    if isinstance(value,(tuple,list)):
+                        body.add_field(name,value[1],filename=value[0],content_type=value[2] if len(value)>2 else None)
+                    else:
+                        body.add_field(name,value,filename=os.path.basename(getattr(value,'name',name)))
+            else:
+                body=json_data
+
+            async with self.session.request(method,url,headers=head,data=body,params=params) as ret:
+                content=await ret.read()
+                return ret.status,ret.headers,content
+
+        elif self.backend=='httpx':
+
+            if multipart:
+                ret=await self.session.request(method,url,headers=head,files=data,params=params)
+            else:
+                ret=await self.session.request(method,url,headers=head,content=json_data,params=params)
+
+            return ret.status_code,ret.headers,ret.content
+
+    # send one request and record it when profiling is on
+    async def _sendprofiled(self,reqtype,url,head,json_data,data,params):
+
+        profiler=getprofiler()
+        if profiler is None:
+            return await self._send(reqtype,url,head,json_data,data,params)
+
+        method=reqtype.replace('multipart','').upper()
+        starttime=time.time()
+
+        try:
+            status,headers,content=await self._send(reqtype,url,head,json_data,data,params)
+        except Exception:
+            profiler.record(method,url,None,0,0.0,time.time()-starttime)
+            raise
+
+        profiler.record(method,url,status,len(content or b''),0.0,time.time()-starttime)
+        return status,headers,content
+
+    # build the request, send it, refresh the token and retry once on a 401, retry transient errors when the retry policy allows it
+    # returns the status code, headers and result in the same way callrestapi decodes them
+    async def _restcall(self,reqval,reqtype,acceptType='application/json',contentType='application/json',data={},header={},params={},etagIn=''):
+
+        await self.open()
+        loop=asyncio.get_event_loop()
+
+        async with self.semaphore:
+
+            # no async backend, make the request with the synchronous client on a thread
+            if self.backend is None:
+                ret=await loop.run_in_executor(None,lambda: _restcall(reqval,reqtype,acceptType,contentType,data,header,params,etagIn))
+                result=None
+                if not (400 <= ret.status_code <=599) or reqtype=="head":
+                    result=_decoderesult(ret,reqtype)
+                return ret.status_code,ret.headers,result,ret.text
+
+            baseurl=getbaseurl()
+            oaval=await loop.run_in_executor(None,getauthtoken,baseurl)
+
+            # build the authorization header
+            head= {'Content-type':contentType,'Accept':acceptType}
+            head.update({"Authorization" : oaval})
+            head.update({str(key):str(value) for key,value in header.items()})
+            if etagIn!='':
+                head.update({"If-Match" : etagIn})
+
+            json_data=None
+            if reqtype in ["postmultipart","putmultipart"]:
+                head.pop("Content-type",None)
+                head.pop("content-type",None)
+            else:
+                json_data=jsonbody(data)
+
+            method=reqtype.replace('multipart','').upper()
+            attempt=0
+            refreshed=False
+
+            while True:
+
+                status,headers,content=await self._sendprofiled(reqtype,baseurl+reqval,head,json_data,data,params)
+
+                # the token was rejected, refresh it and try the request once more
+                if status==401 and not refreshed:
+                    oaval=await loop.run_in_executor(None,gettokenmanager(baseurl).refresh,oaval)
+                    head.update({"Authorization" : oaval})
+                    refreshed=True
+                elif self.retrypolicy.canretry(method,attempt,status):
+                    delay=getretryafter(headers.get('Retry-After'))
+                    if delay is None:
+                        delay=self.retrypolicy.getdelay(attempt)
+                    await asyncio.sleep(delay)
+                    attempt=attempt+1
+                else:
+                    break
+
+                # files that were sent must be read again from the start
+                rewindfiles(data if reqtype in ["postmultipart","putmultipart"] else None)
+
+        text=content.decode('utf-8','replace')
+
+        if reqtype=="head":
+            result=headers
+        elif 400 <= status <=599:
+            result=None
+        else:
+            # is it json
+            try:
+                result=jsonloads(content)
+            except ValueError:
+                result=text
+
+        return status,headers,result,text
+
+    # same arguments and return values as sharedfunctions.callrestapi
+    async def callrestapi(self,reqval, reqtype, acceptType='application/json', contentType='application/json',data={},header={},params={},stoponerror=1,returnEtag=False,etagIn='',noprint=0):
+
+        if reqtype not in RESTMETHODS:
+            print("NOTE: Invalid method")
+            sys.exit()
+
+        status,headers,result,text=await self._restcall(reqval,reqtype,acceptType,contentType,data,header,params,etagIn)
+
+        # response error if status code between these numbers
+        # for head request, tolerate this 4xx+ responses
+        if (400 <= status <=599) and reqtype!="head":
+            if not noprint: print("http response code: "+ str(status))
+            if not noprint: print("ret.text: "+text)
+            if stoponerror: sys.exit()
+
+        etagOut=headers.get('etag')
+
+        if returnEtag and reqtype!="head":
+            return result,etagOut
+        elif returnEtag and reqtype=="head":
+            return result,etagOut,status
+        elif reqtype=="head":
+            return result,status
+        else:
+            return result
+
+    # make a batch of requests concurrently, requests are the same as for sharedfunctions.callrestapi_many
+    async def callrestapi_many(self,requestlist):
+
+        return await asyncio.gather(*[self._callrestapi_one(request) for request in requestlist])
+
+    async def _callrestapi_one(self,request):
+
+        if isinstance(request,dict):
+            kwargs=dict(request)
+        else:
+            kwargs=dict(zip(_callrestapi_argnames,request))
+
+        kwargs.setdefault('reqtype','get')
+
+        for name in ['stoponerror','returnEtag','noprint']:
+            kwargs.pop(name,None)
+
+        if kwargs['reqtype'] not in RESTMETHODS:
+            return RestCallResult(request,error="Invalid method "+str(kwargs['reqtype']))
+
+        try:
+            status,headers,result,text=await self._restcall(**kwargs)
+        except SystemExit:
+            return RestCallResult(request,error="Request stopped, check the profile and credentials.")
+        except Exception as e:
+            return RestCallResult(request,error=str(e))
+
+        if (400 <= status <=599) and kwargs['reqtype']!="head":
+            return RestCallResult(request,status_code=status,etag=headers.get('etag'),error=text)
+
+        return RestCallResult(request,result,status,headers.get('etag'))
+
+    # yield the items of a collection one page at a time, following the links with rel=next
+    async def iterpaged(self,reqval,acceptType='application/json',header={},params={},stoponerror=1):
+
+        while reqval is not None:
+
+            response=await self.callrestapi(reqval,'get',acceptType,header=header,params=params,stoponerror=stoponerror)
+
+            if not isinstance(response,dict):
+                return
+
+            for item in response.get('items',[]):
+                yield item
+
+            # the next link already contains the query parameters
+            reqval=None
+            params={}
+            for link in response.get('links',[]):
+                if link.get('rel')=='next':
+                    reqval=link.get('href')
+                    break
+
+
+# runasync
+# run a coroutine from a synchronous tool and return its result
+# change history
+#   18OCT2026 initial development
+
+def runasync(coroutine):
+
+    return asyncio.run(coroutine)
@@ -50,7 +50,7 @@ parser.add_argument("-m","--method", help="Enter the REST method.",default="get"
 parser.add_argument("-i","--inputfile",help="Enter the full path to an input json file",default=None)
 parser.add_argument("-a","--accepttype",help="Enter REST Content Type you want returned e.g application/vnd.sas.identity.basic+json",default="application/json")
 parser.add_argument("-c","--contenttype",help="Enter REST Content Type for POST e.g application/vnd.sas.identity.basic+json",default="application/json")
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='json')
 parser.add_argument("-t","--text", help="Display Simple Text Results.", action='store_true')
 parser.add_argument("-hf","--headerfile",help="Enter the full path to a header json file",default=None)
 
@@ -0,0 +1,261 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# casaccess.py
+# October 2026
+#
+# Effective access of caslibs and tables on every CAS server, evaluated in bulk. The servers, caslibs and tables
+# are walked concurrently on one thread pool: each caslib listing, table listing and access request is scheduled
+# as soon as the listing it comes from returns, with at most workers requests in flight in total and at most
+# perserver requests in flight to any one CAS server, so a large server does not hold up the others or get
+# overloaded. The results are returned as each request completes rather than at the end of each server.
+#
+# With a checkpoint file every caslib or table whose rows have been written is recorded in it, and a run started
+# with the same file skips them, so an interrupted run carries on where it stopped.
+#
+# CASAccessScanner
+#   scan       generator of units, one for each caslib or table with its effective access items
+#   complete   record a unit in the checkpoint after its rows have been written
+#
+# Each unit is a dictionary with key, server, caslib, table, items, error and message. items are the access
+# control items, error is set when the caslibs, tables or access controls could not be read and message when
+# there is nothing to evaluate, for example a caslib with no tables. table is None when caslibs are scanned and
+# an empty string for the units of a whole caslib when tables are scanned.
+#
+# Example:
+#
+#   from casaccess import CASAccessScanner
+#
+#   scanner=CASAccessScanner(workers=16,perserver=8,checkpoint='/tmp/tableaccess.checkpoint')
+#   for unit in scanner.scan(tables=True):
+#       for item in unit['items']:
+#           print(unit['server'],unit['caslib'],unit['table'],item['identity'],item.get('select'))
+#       scanner.complete(unit)
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import concurrent.futures
+import json
+import os
+from collections import deque
+
+from sharedfunctions import callrestapi, callrestapi_result, getpyviyasetting
+
+
+class Checkpoint(object):
+
+    def __init__(self,filename):
+
+        self.filename=filename
+        self.done=set()
+
+        if os.path.isfile(filename):
+            with open(filename) as f:
+                for line in f:
+                    line=line.strip()
+                    if not line: continue
+                    try:
+                        self.done.add(tuple(json.loads(line)))
+                    except ValueError:
+                        # the last line of an interrupted run may be incomplete
+                        pass
+
+        self.file=open(filename,'a')
+
+    # True when the checkpoint already had units in it, the run is a resumed one
+    def resumed(self):
+
+        return len(self.done)>0
+
+    def isdone(self,key):
+
+        return tuple(key) in self.done
+
+    def mark(self,key):
+
+        self.done.add(tuple(key))
+        self.file.write(json.dumps(list(key))+'\n')
+        self.file.flush()
+
+    def close(self):
+
+        self.file.close()
+
+
+class CASAccessScanner(object):
+
+    def __init__(self,workers=None,perserver=None,checkpoint=None):
+
+        if workers is None:
+            workers=int(getpyviyasetting('PYVIYA_WORKERS','pyviya.workers',8))
+        if perserver is None:
+            perserver=int(getpyviyasetting('PYVIYA_CAS_PERSERVER','pyviya.cas.perserver',4))
+
+        self.workers=max(1,workers)
+        self.perserver=max(1,perserver)
+        self.checkpoint=None
+
+        if checkpoint is not None:
+            self.checkpoint=Checkpoint(checkpoint)
+
+    def resumed(self):
+
+        return self.checkpoint is not None and self.checkpoint.resumed()
+
+    # units that failed are not recorded so they are tried again when the run is resumed
+    def complete(self,unit):
+
+        if self.checkpoint is not None and unit['error'] is None:
+            self.checkpoint.mark(unit['key'])
+
+    # walk the servers, caslibs and, when tables is True, the tables in each caslib and return a unit for each
+    # caslib or table as soon as its access controls are read
+    # caslibfilter and tablefilter are added to the caslib and table listings, e.g. '&filter=contains(name,"HR")'
+    # sourcetables evaluates the source table of an in-memory table when it has one
+    def scan(self,tables=False,caslibfilter='',tablefilter='',sourcetables=False):
+
+        serverlist_result_json=callrestapi('/casManagement/servers','get')
+
+        # server name to the tasks waiting for it, and the number of requests in flight to it
+        pending={}
+        running={}
+
+        for server in serverlist_result_json['items']:
+            servername=server['name']
+            pending[servername]=deque([{'kind':'caslibs','server':servername,
+                                        'request':{'reqval':'/casManagement/servers/'+servername+'/caslibs?excludeItemLinks=true&limit=10000'+caslibfilter,'reqtype':'get'}}])
+            running[servername]=0
+
+        inflight={}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+            while True:
+
+                # start tasks from each server in turn while there is room
+                started=True
+                while started and len(inflight)<self.workers:
+                    started=False
+                    for servername in pending:
+                        if pending[servername] and running[servername]<self.perserver and len(inflight)<self.workers:
+                            task=pending[servername].popleft()
+                            inflight[executor.submit(callrestapi_result,task['request'])]=task
+                            running[servername]=running[servername]+1
+                            started=True
+
+                if not inflight:
+                    break
+
+                finished,notfinished=concurrent.futures.wait(list(inflight),return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in finished:
+
+                    task=inflight.pop(future)
+                    running[task['server']]=running[task['server']]-1
+                    restresult=future.result()
+
+                    for unit in self._handle(task,restresult,tables,tablefilter,sourcetables,pending):
+                        yield unit
+
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+
+    # queue the requests that follow from a finished task and return the units it completes
+    def _handle(self,task,restresult,tables,tablefilter,sourcetables,pending):
+
+        servername=task['server']
+        units=[]
+
+        if task['kind']=='caslibs':
+
+            if restresult.error is not None:
+                return [self._unit(servername,None,None,[],error=restresult.error)]
+
+            for caslib in restresult.result.get('items',[]):
+
+                caslibname=caslib['name']
+
+                if tables:
+                    pending[servername].append({'kind':'tables','server':servername,'caslib':caslibname,
+                                                'request':{'reqval':'/casManagement/servers/'+servername+'/caslibs/'+caslibname+'/tables?excludeItemLinks=true&limit=10000'+tablefilter,'reqtype':'get'}})
+                elif not self._isdone(servername,caslibname,None):
+                    pending[servername].append({'kind':'access','server':servername,'caslib':caslibname,'table':None,
+                                                'request':{'reqval':'/casAccessManagement/servers/'+servername+'/caslibControls/'+caslibname+'?accessControlType=effective&limit=10000','reqtype':'get'}})
+
+        elif task['kind']=='tables':
+
+            caslibname=task['caslib']
+            tables_result_json=restresult.result
+
+            if restresult.error is not None or tables_result_json is None:
+                units.append(self._unit(servername,caslibname,'',[],error=restresult.error or 'no response'))
+                return units
+
+            if 'items' not in tables_result_json:
+                message=tables_result_json.get('message')
+            elif tables_result_json.get('count')==0:
+                message='[0 tables]'
+            else:
+                message=None
+
+            if message is not None:
+                if not self._isdone(servername,caslibname,''):
+                    units.append(self._unit(servername,caslibname,'',[],message=message))
+                return units
+
+            for table in tables_result_json['items']:
+
+                tablename=table['name']
+                # the in-memory table name is used unless the source table name was asked for
+                if sourcetables and 'tableReference' in table:
+                    if 'sourceTableName' in table['tableReference']:
+                        tablename=table['tableReference']['sourceTableName']
+
+                if self._isdone(servername,caslibname,tablename):
+                    continue
+
+                reqval='/casAccessManagement/servers/'+servername+'/caslibs/'+caslibname+'/tableControls/'+tablename+'?accessControlType=effective'
+                pending[servername].append({'kind':'access','server':servername,'caslib':caslibname,'table':tablename,
+                                            'request':{'reqval':reqval,'reqtype':'get'}})
+
+        else:
+
+            if restresult.error is not None:
+                units.append(self._unit(servername,task['caslib'],task['table'],[],error=restresult.error))
+            else:
+                units.append(self._unit(servername,task['caslib'],task['table'],restresult.result.get('items',[])))
+
+        return units
+
+    def _isdone(self,servername,caslibname,tablename):
+
+        return self.checkpoint is not None and self.checkpoint.isdone(self._key(servername,caslibname,tablename))
+
+    def _key(self,servername,caslibname,tablename):
+
+        if tablename is None:
+            return (servername,caslibname)
+
+        return (servername,caslibname,tablename)
+
+    def _unit(self,servername,caslibname,tablename,items,error=None,message=None):
+
+        return {'key':self._key(servername,caslibname,tablename),'server':servername,'caslib':caslibname,'table':tablename,
+                'items':items,'error':error,'message':message}
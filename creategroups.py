@@ -20,6 +20,7 @@
 # 30mar2023 Added some more error checking
 # 30mar2023 Added -skipfirstrow for situations where first row is a header
 # 21dec2023 skip rows with no id
+# 18OCT2026 all existing groups are read, not just the first page, and members are looked up in bulk with IdentityCache
 #
 # Format of csv file is two columns
 #  Column 1 group id
@@ -48,6 +49,7 @@
 #
 import argparse, csv, os, sys
 from sharedfunctions import callrestapi, getfolderid, file_accessible, getidsanduris
+from identitycache import IdentityCache
 
 version=int(str(sys.version_info[0]))
 
@@ -73,20 +75,11 @@ reqtype="post"
 
 check=file_accessible(file,'r')
 
-allgroups=callrestapi("/identities/groups","get")
+identities=IdentityCache()
 
 # create a list of all groups
 
-groupslist=[]
-
-if 'items' in allgroups:
-
-        total_items=allgroups['count']
-        returned_items=len(allgroups['items'])
-
-        for i in range(0,returned_items):
-
-           groupslist.append(allgroups['items'][i]['id'])
+groupslist=set(identities.loadgroups())
 
 # file can be read
 if check:
@@ -97,8 +90,15 @@ if check:
 
         if skipfirstrow: next(filecontents,None)
 
+        rows=list(filecontents)
+
+        # look up all the members in the file at once
+        members=[row[3] for row in rows if len(row)>=4 and row[3]!=""]
+        identities.getusers(members)
+        identities.getgroups(members)
+
         rownum=0
-        for row in filecontents:
+        for row in rows:
 
             rownum=rownum+1
             cols=len(row)
@@ -134,7 +134,11 @@ if check:
 
                     myresult=callrestapi(reqval,reqtype,data=data,stoponerror=0,noprint=1)
 
-                    if myresult != None: print("Note: Group: with id '"+id+"' and name '"+newgroup+"' created." )
+                    if myresult != None:
+                        print("Note: Group: with id '"+id+"' and name '"+newgroup+"' created." )
+                        groupslist.add(id)
+                        if isinstance(myresult,dict) and 'id' in myresult: identities.addgroup(myresult)
+                        else: identities.addgroup(data)
                     else: print("NOTE: group with name "+newgroup+"  and id "+id+" already exists." )
 
                 # 4th column is group membership either a userid or groupid, its optional.
@@ -144,12 +148,10 @@ if check:
                     if debug: print("NOTE: Trying to add identity '"+ member+ "' to group with id '"+id+"' and name '"+newgroup+"'")
 
                     #test that user exists
-                    reqval="/identities/users/"+member
-                    usertest=callrestapi(reqval,'get',noprint=1,stoponerror=0)
+                    usertest=identities.getuser(member)
 
                     # also test if it is nit a group
-                    reqval="/identities/groups/"+member
-                    grouptest=callrestapi(reqval,'get',noprint=1,stoponerror=0)
+                    grouptest=identities.getgroup(member)
 
                     # user exists try to add to group, if user does not exist print a message
                     if usertest!=None or grouptest!=None:
@@ -9,6 +9,10 @@
 # Change History
 #
 # 27SEP2024 Initial commit
+# 18OCT2026 Pages are read with iterpaged
+# 18OCT2026 Added --workers to request pages concurrently
+# 18OCT2026 Only the fields used are kept from each page, the item links are not requested
+# 18OCT2026 --write is refused when the listing stopped on an error
 #
 #
 # Copyright © 2018, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
@@ -22,7 +26,7 @@
 # 
 
 import argparse 
-from sharedfunctions import callrestapi
+from sharedfunctions import callrestapi, iterpaged
 
 # setup command-line arguements. In this block which is common to all the tools you setup what parameters
 # are passed to the tool
@@ -33,11 +37,13 @@ parser.add_argument("-f","--filter", help="Set a custom filter for objects, for
 parser.add_argument("-w","--write", help="Make the specified changes.",action="store_true",default=False)
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull in each REST API call. Default is 10.",default=10)
 parser.add_argument("-p","--pagelimit", type=int,help="Specify the number of pages to pull before stopping. Default is 10.",default=10)
+parser.add_argument("--workers", type=int,help="Specify the number of pages to request at the same time. Default is 1.",default=1)
 args = parser.parse_args()
 filter=args.filter
 write=args.write
 limit=args.limit
 pagelimit=args.pagelimit
+workers=args.workers
 
 # If no filter is set, we should still filter on objects that have a parentUri defined.
 if filter is None:
@@ -53,49 +59,28 @@ reqtype='get'
 # Set the endpoint to call
 reqval='/files/files?&filter='+filter+'&limit='+str(limit)
 print('Calling REST endpoint:',reqval)
-# Make the rest call using the callrestapi function.
-results=callrestapi(reqval,reqtype)
-
-count=results['count']
-print('Found',count,'matching our query.')
-
+# Read the pages of results as they arrive using the iterpaged generator, stop after pagelimit pages
+# with --workers the remaining pages are requested by offset, that many at a time
+pageinfo={}
 # Write the IDs we found to an array
 ids = []
-for item in results.get("items",[]):
+for item in iterpaged(reqval,page_size=limit,limit=limit*pagelimit,pageinfo=pageinfo,prefetch=workers,stoponerror=0,fields=['id']):
     ids.append(item.get("id"))
 
-# We need to tolerate paged output.
-next_link = None
-pages = 1
-
-for link in results.get("links",[]):
-    if link.get("rel") == "next":
-        next_link = link.get("href")
-        break
-
-while pages < pagelimit and next_link is not None:
-    
-    pages += 1
-
-    print('Calling REST endpoint from the "next" link:',next_link)
-    # Call the next link
-    results=callrestapi(next_link,reqtype)
-
-    # Pull the ids into the array
-    for item in results.get("items",[]):
-        ids.append(item.get("id"))
-    
-    # Check for a next link again.
-    next_link = None
-    for link in results.get("links",[]):
-        if link.get("rel") == "next":
-            next_link = link.get("href")
-            break
-print('Pages traversed:',pages)
+count=pageinfo['count']
+print('Found',count,'matching our query.')
+print('Pages traversed:',pageinfo['pages'])
 print('Found ids:',len(ids))
 
 if len(ids) != count:
     print('WARN: Captured IDs does not match total count:',count,'Increase page or limit settings to capture all results.')
+
+# a listing that stopped on an error is incomplete, nothing is deleted from it
+if pageinfo['error'] is not None:
+    print('ERROR: the listing stopped before the last page:',pageinfo['error'])
+    if write:
+        print('ERROR: no changes will be made from an incomplete listing, run again without errors to use --write.')
+        write=False
 # We now have an array "ids" of each ID matching our supplied filter.
 
 # Iterate through the IDs
@@ -9,6 +9,7 @@
 #
 # Change History
 #
+# 18oct2026 the groups are exported with the transfer REST API rather than the sas-viya CLI
 #
 # Copyright Â© 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -26,15 +27,14 @@
 #
 
 # Import Python modules
-import argparse, sys, subprocess, uuid, time, os, glob, json, tempfile
+import argparse, sys, uuid, time, os, glob, json
 
-from sharedfunctions import getfolderid, callrestapi, getapplicationproperties, printresult, getclicommand
+from sharedfunctions import getfolderid, callrestapi, getapplicationproperties, printresult
+from transfer import exporttofile
 
 # get python version
 version=int(str(sys.version_info[0]))
 
-tempdir=tempfile.gettempdir()
-
 # get input parameters
 parser = argparse.ArgumentParser(description="Export Custom Groups to a Package")
 
@@ -45,9 +45,6 @@ parser.add_argument("-t","--transferremove", help="Remove transfer file after do
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull. Default is 1000.",default=1000)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 
-# get cli location from properties, check that cli is there if not ERROR and stop
-clicommand=getclicommand()
-
 args= parser.parse_args()
 
 filename=args.filename
@@ -105,46 +102,13 @@ requests_dict["items"]=grouplist
 
 if debug: print(json.dumps(requests_dict,indent=2))
 
-# build the requests file from the list
-
-request_file=os.path.join(tempdir,filename+"_requests.json")
-
-with open(request_file, "w") as outfile:
-	json.dump(requests_dict, outfile)
-
-# export the groups to a package file
-
-command=clicommand+' transfer export -r @'+request_file+' --name "'+package_name+'"'
-
-try:
-	print(command)
-except UnicodeEncodeError:
-	print(command.encode('ascii','replace'))
-
-rc=subprocess.call(command, shell=True)
-
-# if the export command fails then skip to the next item
-if rc != 0:
-    sys.exit("ERROR: There was a problem exporting Custom Groups, command returned code "+str(rc))
-
-reqtype='get'
-reqval='/transfer/packages?filter=eq(name,"'+package_name+'")'
-package_info=callrestapi(reqval,reqtype)
-package_id=package_info['items'][0]['id']
+# export the groups to a package, download it to a file and remove it from the server if -t is set
 
 completefile=os.path.join(filename+'.json')
-command=clicommand+' transfer download --file '+completefile+' --id '+package_id
 
-try:
-	print(command)
-except UnicodeEncodeError:
-	print(command.encode('ascii','replace'))
+package_id=exporttofile(requests_dict["items"],completefile,name=package_name,description=requests_dict["description"],remove=autotransferremove)
 
-subprocess.call(command, shell=True)
+if package_id is None:
+    sys.exit("ERROR: There was a problem exporting Custom Groups")
 
-# if -t set then remove transfer package from infrastructure data server after download
-if autotransferremove:
-	print(clicommand+' transfer delete --id '+package_id+"\n")
-	remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-	remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-	remTransferObject.wait()
+print("NOTE: Custom Groups exported to json file "+completefile)
@@ -9,6 +9,7 @@
 #
 # Change History
 # 22aug2022 add option to auto delete transport file after download completes
+# 18oct2026 the folder is exported with the transfer REST API rather than the sas-viya CLI
 #
 # Copyright Â© 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -26,16 +27,14 @@
 #
 
 # Import Python modules
-import argparse, sys, subprocess, uuid, time, os, glob
+import argparse, sys, uuid, time, os, glob
 
-from sharedfunctions import getfolderid, callrestapi, getapplicationproperties, printresult, getclicommand
+from sharedfunctions import getfolderid, callrestapi, getapplicationproperties, printresult
+from transfer import exporttofile
 
 # get python version
 version=int(str(sys.version_info[0]))
 
-# get cli location from properties, check that cli is there if not ERROR and stop
-clicommand=getclicommand()
-
 # get input parameters
 parser = argparse.ArgumentParser(description="Export a Viya Folder and its sub-folders")
 
@@ -92,26 +91,15 @@ if areyousure.upper() =='Y':
         json_name=folderpath.replace("/","_")
         if filename !="XNOFILENAMEX" : json_name=filename
 
-        command=clicommand+' transfer export -u /folders/folders/'+id+' --name "'+package_name+'"'
-        print(command)
-        subprocess.call(command, shell=True)
-
-        reqtype='get'
-        reqval='/transfer/packages?filter=eq(name,"'+package_name+'")'
-        package_info=callrestapi(reqval,reqtype)
-        package_id=package_info['items'][0]['id']
-        
-        
         completefile=os.path.join(path,json_name+'.json')
         completefile = completefile.replace(" ", "-")
-        command=clicommand+' transfer download --file '+completefile+' --id '+package_id
-        print(command)
-        subprocess.call(command, shell=True)
-        if autotranferremove:
-                print(clicommand+' transfer delete --id '+package_id+"\n")
-                remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-                remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-                remTransferObject.wait()
+
+        # export the folder, download the package to a JSON file and remove it from the server if -t is set
+        package_id=exporttofile(['/folders/folders/'+id],completefile,name=package_name,remove=autotranferremove)
+
+        if package_id is None:
+                print("ERROR: There was a problem exporting Viya folder "+folderpath)
+                sys.exit(1)
 
 
         print("NOTE: Viya folder "+folderpath+ "  exported to json file "+completefile)
@@ -14,6 +14,7 @@
 # SEP2022 Added option to specify the root folder to start at
 # MAR2023 Option to remove transfer objects and some general cleanup
 # AUG2023 Option to suppress the incremental number suffix on downloaded file names 
+# OCT2026 Folders are exported with the transfer REST API rather than the sas-viya CLI
 #
 # Copyright Â© 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -31,9 +32,10 @@
 #
 
 # Import Python modules
-import argparse, sys, subprocess, uuid, time, os, glob, json
+import argparse, sys, uuid, time, os, glob, json
 
-from sharedfunctions import getfolderid, callrestapi,getapplicationproperties,getclicommand
+from sharedfunctions import getfolderid, callrestapi,getapplicationproperties
+from transfer import exporttofile
 
 # get python version
 version=int(str(sys.version_info[0]))
@@ -53,9 +55,6 @@ quietmode=args.quiet
 autotranferremove=args.tranferremove
 nonincrament=args.nonincrament
 
-# get cli location from properties, check that cli is available if not ERROR and stop processing
-clicommand=getclicommand()
-
 # prompt if directory exists because existing json files are deleted
 if os.path.exists(basedir):
 
@@ -134,29 +133,16 @@ if areyousure.upper() =='Y':
                 else:
                     json_name=theitem["name"].replace(" ","")+'_'+str(i)
 
-                # export
-                command=clicommand+' transfer export -u '+folderuri+' --name "'+package_name+'"'
-                print(command)
-                subprocess.call(command, shell=True)
-
-                # use the unique name to get the package and download it to a JSON file
-                reqval='/transfer/packages?filter=eq(name,"'+package_name+'")'
-                package_info=callrestapi(reqval,reqtype)
-                package_id=package_info['items'][0]['id']
-                
-                # download exported package
                 completefile=os.path.join(path,json_name+'.json')
                 completefile = completefile.replace(" ", "-")
-                command=clicommand+' transfer download --file '+completefile+' --id '+package_id
-                print(command)
-                subprocess.call(command, shell=True)
-
-                # if -t set then remove transfer package from infrastructure data server after download
-                if autotranferremove:
-                    print(clicommand+' transfer delete --id '+package_id+"\n")
-                    remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-                    remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-                    remTransferObject.wait()
+
+                # export the folder, download the package to a JSON file and remove it from the server if -t is set
+                package_id=exporttofile([folderuri],completefile,name=package_name,remove=autotranferremove)
+
+                if package_id is None:
+                    print("ERROR: There was a problem exporting folder '"+theitem["name"]+"'")
+                else:
+                    print("NOTE: folder '"+theitem["name"]+"' was exported to "+completefile)
 
     print("NOTE: Viya folders exported to json files in "+path)
 
@@ -9,6 +9,7 @@
 # Example usage:
 # python exportjobflow.py -fn "My Job Flow Name" -d /my/export/directory
 # python exportjobflow.py -ff /tmp/flowlist.json -d /my/export/directory --transferremove
+# OCT 2026 flows are exported with the transfer REST API rather than the sas-viya CLI
 # Copyright © 2025, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
 #  Licensed under the Apache License, Version 2.0 (the License);
@@ -24,9 +25,10 @@
 #  limitations under the License.
 #
 
-import argparse, sys, subprocess, uuid, time, os, glob, json, tempfile, re
+import argparse, sys, uuid, time, os, glob, json, tempfile, re
 
-from sharedfunctions import getidsanduris, callrestapi, getapplicationproperties, printresult, getclicommand, file_accessible
+from sharedfunctions import getidsanduris, callrestapi, getapplicationproperties, printresult, file_accessible
+from transfer import exporttofile
 
 ###### FUNCTIONS ######
 
@@ -112,32 +114,9 @@ def exportflow(flowname):
 
     addflowdependencies(flowdetails,data)
     
-    # create a temp file to hold the requests file that we build
+    # the package is named after the flow
     package_name=flow_actual_name+"Requests_"+flowid
-    request_file_name=package_name+".json"
     temp_dir = tempfile.gettempdir() 
-    requests_full_path = os.path.join(temp_dir, request_file_name)
-
-    #Write to requests file
-    with open(requests_full_path, "w") as f:
-        json.dump(data, f, indent=4)
-
-    # build the export command
-    command=clicommand+' transfer export --request @"'+requests_full_path+'" --name "'+package_name+'"'
-    print(command)
-
-    # Run the command and capture output 
-    result = subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-
-    # Get the stdout
-    output = result.stdout.strip()
-    #print("Command output:", output)
-
-    # Extract the ID using regex
-    match = re.search(r'ID\s([a-f0-9\-]+)', output)
-    if match:
-        package_id = match.group(1)
-        print("Captured ID:", package_id)
 
     # if no directory specified create one in the temp directory with the flow name
     if directory =="TEMP" : completefile=os.path.join(temp_dir, flowname)
@@ -149,22 +128,14 @@ def exportflow(flowname):
     if not completefile.lower().endswith(".json"):
         completefile += ".json"
 
-    # download the package to a file
-    command=clicommand+' transfer download --file "'+completefile+'" --id '+package_id
-    print(command)
-    rc=subprocess.call(command, shell=True)
-
+    # export the flow and its dependent objects, download the package to a file and
     # if autotranferremove is set remove the transfer package from Viya infrastructure data server
-    if autotransferremove:
-        print(clicommand+' transfer delete --id '+package_id+"\n")
-        remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-        remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-        remTransferObject.wait()
+    package_id=exporttofile(data["items"],completefile,name=package_name,description=data["description"],remove=autotransferremove)
 
     # with debug print the requests file content
     if debug: print(json.dumps(data, indent=4))
 
-    if rc == 0:
+    if package_id is not None:
         print("NOTE: Viya Job Flow "+flow_actual_name+ " and dependent objects exported to json file "+completefile)
     else:
         print("WARNING: there may be a problem exporting Viya Job Flow "+flow_actual_name+ " to json file "+completefile)
@@ -173,8 +144,6 @@ def exportflow(flowname):
 
 # get python version
 version=int(str(sys.version_info[0]))
-# get cli location from properties, check that cli is there if not ERROR and stop
-clicommand=getclicommand()
 
 # get input parameters
 parser = argparse.ArgumentParser(description="Export a Viya Job Flow or Flows to packages.")
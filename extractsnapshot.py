@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# extractsnapshot.py
+# October 2026
+#
+# list the runs in a snapshot store written by snapshotcontent.py or snapshotreports.py with --store, and
+# write the packages of a run back to json files that can be imported with the sas-viya CLI or importpackages.py
+#
+# Usage:
+# extractsnapshot.py -s STORE [-l] [-r RUN] [-n NAME] [-d DIRECTORY]
+#
+# Examples:
+#
+# 1. List the runs in a snapshot store and the number of packages in each
+#        ./extractsnapshot.py -s ~/snapshotstore -l
+#
+# 2. List the packages of a run
+#        ./extractsnapshot.py -s ~/snapshotstore -l -r 20261018T020000
+#
+# 3. Write all the packages of the latest run to json files in a directory
+#        ./extractsnapshot.py -s ~/snapshotstore -d /tmp/restore
+#
+# 4. Write the packages of a run whose name contains Sales to json files in a directory
+#        ./extractsnapshot.py -s ~/snapshotstore -r 20261018T020000 -n Sales -d /tmp/restore
+#
+# Change History
+#
+# 18oct2026 Initial development
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+# Import Python modules
+import argparse, sys, os
+from snapshotstore import SnapshotStore
+
+parser = argparse.ArgumentParser(description="List the runs of a snapshot store and extract their packages to json files")
+parser.add_argument("-s","--store", help="Directory of the snapshot store",required=True)
+parser.add_argument("-l","--list", help="List the runs, or the packages of the run given with --run.", action='store_true')
+parser.add_argument("-r","--run", help="Name of the run, default is the latest run.",default=None)
+parser.add_argument("-n","--name", help="Only packages whose name contains this string.",default=None)
+parser.add_argument("-d","--directory", help="Directory to write the package json files to.",default=None)
+
+args = parser.parse_args()
+
+if not os.path.isdir(os.path.join(args.store,'runs')):
+    print("ERROR: "+args.store+" is not a snapshot store.")
+    sys.exit(1)
+
+store=SnapshotStore(args.store)
+runs=store.getruns()
+
+# list the runs when no run was asked for
+if args.list and args.run is None:
+    for runname in runs:
+        print(runname+" "+str(len(store.getrun(runname)['packages']))+" packages")
+    sys.exit(0)
+
+if not runs:
+    print("ERROR: there are no runs in snapshot store "+args.store)
+    sys.exit(1)
+
+runname=args.run
+if runname is None:
+    runname=runs[-1]
+elif runname not in runs:
+    print("ERROR: run "+runname+" is not in snapshot store "+args.store)
+    sys.exit(1)
+
+names=sorted(store.getrun(runname)['packages'])
+if args.name is not None:
+    names=[name for name in names if args.name in name]
+
+if args.list:
+    for name in names:
+        print(name)
+    sys.exit(0)
+
+if args.directory is None:
+    print("ERROR: --directory is needed to extract the packages of a run.")
+    sys.exit(1)
+
+if not os.path.exists(args.directory):
+    os.makedirs(args.directory)
+
+extracted=0
+for name in names:
+    filename=os.path.join(args.directory,name+'.json')
+    try:
+        store.extract(runname,name,filename)
+    except IOError as e:
+        print("ERROR: "+str(e))
+        continue
+    extracted=extracted+1
+    print("NOTE: package "+name+" of run "+runname+" written to "+filename)
+
+print("NOTE: "+str(extracted)+" packages of run "+runname+" written to "+args.directory)
@@ -0,0 +1,305 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# foldertree.py
+# October 2026
+#
+# An in-memory index of the Viya folder tree, loaded in one pass: the root folders and then one recursive
+# members listing for each root folder. Tools that need to look at the folder hierarchy can use it instead of
+# walking the folders with a request per folder or a request per item.
+#
+# FolderTree
+#   load             read the folder tree from the server, includemembers=True also keeps the content of each folder
+#   getfolder        the folder json for an id, uri or path
+#   getfolderid      the id of a folder from its path
+#   getfolderpath    the full path of a folder from its id or uri, e.g. /gelcontent/reports
+#   getchildren      the sub-folders of a folder
+#   getancestors     the ancestor folders of a folder, from its parent up to the root folder
+#   iterfolders      the folders in a subtree, or the whole tree, parents before their children
+#   itermembers      the members of the folders in a subtree when the tree was loaded with includemembers
+#   primepathcache   add the tree to the path cache so getpath and getfolderid in sharedfunctions need no requests
+#   save / fromfile  write the tree to a json file and read it back so several tools in a pipeline can share it
+#
+# getfoldertree returns a tree read from a file when it is younger than maxage seconds and was built for the
+# same Viya server, otherwise it loads the tree from the server and saves it to the file. maxage defaults to
+# PYVIYA_FOLDERTREE_MAXAGE or pyviya.foldertree.maxage in application.properties, 3600 seconds.
+#
+# Example:
+#
+#   from foldertree import getfoldertree
+#
+#   tree=getfoldertree('/tmp/foldertree.json',maxage=3600)
+#   for folder in tree.iterfolders(tree.getfolderid('/gelcontent')):
+#       print(tree.getfolderpath(folder['id']))
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 The links of the folders and members are not requested
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import json
+import os
+import time
+
+from sharedfunctions import iterpaged, getbaseurl, getpathcache, getpyviyasetting
+
+FOLDERPREFIX='/folders/folders/'
+
+
+class FolderTree(object):
+
+    def __init__(self):
+
+        self.folders={}        # folder id to folder json, with parent and path added
+        self.children={}       # folder id to the ids of its sub-folders
+        self.paths={}          # full path to folder id
+        self.members={}        # folder id to its members, only when loaded with includemembers
+        self.roots=[]          # ids of the root folders
+        self.baseurl=None
+        self.created=None
+        self.includemembers=False
+
+    # read the tree from the server
+    def load(self,includemembers=False,workers=None):
+
+        if workers is None:
+            workers=int(getpyviyasetting('PYVIYA_WORKERS','pyviya.workers',8))
+
+        self.__init__()
+        self.baseurl=getbaseurl()
+        self.created=time.time()
+        self.includemembers=includemembers
+
+        for root in iterpaged('/folders/rootFolders',page_size=1000,excludelinks=True):
+            self.addfolder(root['id'],root,None)
+            self.roots.append(root['id'])
+
+        # one recursive listing for each root folder, only the folders unless the members are wanted
+        for rootid in self.roots:
+
+            reqval=FOLDERPREFIX+rootid+'/members?recursive=true'
+            if not includemembers:
+                reqval=reqval+"&filter=eq(contentType,'folder')"
+
+            for member in iterpaged(reqval,page_size=1000,prefetch=workers,excludelinks=True):
+
+                parentid=getidfromuri(member.get('parentFolderUri',FOLDERPREFIX+rootid))
+
+                if member.get('contentType')=='folder' and member.get('uri','').startswith(FOLDERPREFIX):
+                    self.addfolder(getidfromuri(member['uri']),member,parentid)
+
+                if includemembers:
+                    self.members.setdefault(parentid,[]).append(member)
+
+        self.buildpaths()
+
+        return self
+
+    def addfolder(self,folderid,folder,parentid):
+
+        folder=dict(folder)
+        folder['id']=folderid
+        folder['uri']=FOLDERPREFIX+folderid
+        folder['parent']=parentid
+
+        self.folders[folderid]=folder
+        self.children.setdefault(folderid,[])
+
+    # link each folder to its parent and work out the full paths from the roots down
+    def buildpaths(self):
+
+        self.paths={}
+
+        for folderid,folder in self.folders.items():
+            self.children.setdefault(folderid,[])
+            if folder['parent'] is not None:
+                self.children.setdefault(folder['parent'],[]).append(folderid)
+
+        for rootid in self.roots:
+            self.folders[rootid]['path']='/'+self.folders[rootid]['name']
+            for folder in self.iterfolders(rootid):
+                if folder['parent'] is not None:
+                    folder['path']=self.folders[folder['parent']]['path']+'/'+folder['name']
+                self.paths[folder['path']]=folder['id']
+
+    # the folder id from an id, a uri or a path
+    def getid(self,folder):
+
+        if folder is None:
+            return None
+        if folder.startswith(FOLDERPREFIX):
+            return getidfromuri(folder)
+        if folder.startswith('/'):
+            return self.getfolderid(folder)
+
+        return folder
+
+    def getfolder(self,folder):
+
+        return self.folders.get(self.getid(folder))
+
+    def getfolderid(self,path):
+
+        if path!='/':
+            path=path.rstrip('/')
+
+        return self.paths.get(path)
+
+    def getfolderpath(self,folder):
+
+        folder=self.getfolder(folder)
+
+        if folder is None:
+            return None
+
+        return folder.get('path')
+
+    def getchildren(self,folder):
+
+        return [self.folders[childid] for childid in self.children.get(self.getid(folder),[])]
+
+    # the same order as /folders/ancestors, the parent first and the root folder last
+    def getancestors(self,folder):
+
+        ancestors=[]
+        folder=self.getfolder(folder)
+
+        while folder is not None and folder['parent'] is not None:
+            folder=self.folders.get(folder['parent'])
+            if folder is None or folder in ancestors:
+                break
+            ancestors.append(folder)
+
+        return ancestors
+
+    # the folders in the subtree of folder, including folder itself, parents before their children
+    # with no folder every folder in the tree is returned
+    def iterfolders(self,folder=None):
+
+        if folder is None:
+            stack=list(reversed(self.roots))
+        else:
+            stack=[self.getid(folder)]
+
+        seen=set()
+
+        while stack:
+            folderid=stack.pop()
+            if folderid in seen or folderid not in self.folders:
+                continue
+            seen.add(folderid)
+            yield self.folders[folderid]
+            stack.extend(reversed(self.children.get(folderid,[])))
+
+    # the members of every folder in the subtree, each with the path of its folder added as pathtoitem
+    def itermembers(self,folder=None):
+
+        for subfolder in self.iterfolders(folder):
+            for member in self.members.get(subfolder['id'],[]):
+                member=dict(member)
+                member['pathtoitem']=subfolder['path']+'/'
+                yield member
+
+    # add every folder, and every member when they were loaded, to the path cache in sharedfunctions
+    def primepathcache(self):
+
+        pathcache=getpathcache()
+        pathcache.addmembers([member for members in self.members.values() for member in members])
+
+        with pathcache.lock:
+            for folder in self.folders.values():
+                if 'path' not in folder:
+                    continue
+                pathcache.folderpaths[folder['uri']]=folder['path']
+                if folder['parent'] is None:
+                    pathcache.parents[folder['uri']]=None
+                else:
+                    pathcache.parents[folder['uri']]=FOLDERPREFIX+folder['parent']
+
+    def save(self,filename):
+
+        content={'baseurl':self.baseurl,'created':self.created,'includemembers':self.includemembers,
+                 'roots':self.roots,'folders':list(self.folders.values()),'members':self.members}
+
+        tmpfile=filename+'.'+str(os.getpid())+'.tmp'
+        with open(tmpfile,'w') as f:
+            json.dump(content,f)
+        os.replace(tmpfile,filename)
+
+    @classmethod
+    def fromfile(cls,filename):
+
+        with open(filename) as f:
+            content=json.load(f)
+
+        tree=cls()
+        tree.baseurl=content['baseurl']
+        tree.created=content['created']
+        tree.includemembers=content['includemembers']
+        tree.roots=content['roots']
+        tree.members=content['members']
+
+        for folder in content['folders']:
+            tree.folders[folder['id']]=folder
+
+        tree.buildpaths()
+
+        return tree
+
+
+# getidfromuri
+# the id at the end of a uri, /folders/folders/1234 returns 1234
+# change history
+#   18OCT2026 initial development
+
+def getidfromuri(uri):
+
+    if uri is None:
+        return None
+
+    return uri.rstrip('/').split('/')[-1]
+
+
+# getfoldertree
+# return the folder tree from filename if it is younger than maxage seconds, was built for the current Viya server
+# and has the members if they are wanted, otherwise load it from the server and save it to filename
+# change history
+#   18OCT2026 initial development
+
+def getfoldertree(filename=None,maxage=None,includemembers=False,workers=None):
+
+    if maxage is None:
+        maxage=float(getpyviyasetting('PYVIYA_FOLDERTREE_MAXAGE','pyviya.foldertree.maxage',3600))
+
+    if filename is not None and os.path.isfile(filename):
+
+        try:
+            tree=FolderTree.fromfile(filename)
+        except (IOError, OSError, ValueError, KeyError):
+            tree=None
+
+        if tree is not None and tree.baseurl==getbaseurl() and (tree.includemembers or not includemembers):
+            if time.time()-tree.created<maxage:
+                return tree
+
+    tree=FolderTree().load(includemembers,workers)
+
+    if filename is not None:
+        tree.save(filename)
+
+    return tree
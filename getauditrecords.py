@@ -13,6 +13,8 @@
 # Change History
 #
 # 10JAN2020 Comments added
+# 18OCT2026 Entries are read in pages and printed as they arrive, json output is {"items": [...], "count": n}
+# 18OCT2026 Only the fields that are printed are requested and kept
 #
 # Copyright © 2018, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -28,7 +30,7 @@
 import json
 import socket
 import argparse, sys
-from sharedfunctions import callrestapi,getinputjson,simpleresults,getbaseurl,printresult
+from sharedfunctions import callrestapi,getinputjson,simpleresults,getbaseurl,printresult,iterpaged,printitems,getoutputfields
 
 # Sample reqval="/audit/entries?filter=and(eq(application,'reports'),eq(state,'success'),ge(timeStamp,'2018-11-20'),le(timeStamp,'2020-11-20T23:59:59.999Z'))&sortBy=timeStamp&limit=1000"
 
@@ -44,7 +46,7 @@ parser.add_argument("-u","--user", help="Filter by Username",default=None)
 parser.add_argument("-A","--after", help="Filter entries that are created after the specified timestamp. For example: 2020-01-03 or 2020-01-03T18:15Z",default=None)
 parser.add_argument("-B","--before", help="Filter entries that are created before the specified timestamp. For example: 2020-01-03 or 2020-01-03T18:15Z",default=None)
 parser.add_argument("-S","--sortby", help="Sort the output ascending by this field",default='timeStamp')
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='csv')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='csv')
 
 args = parser.parse_args()
 appname=args.application
@@ -82,7 +84,7 @@ baseurl=getbaseurl()
 endpoint=baseurl+reqval
 # print("REST endpoint: " +endpoint) 
 
-# Make REST API call, and process & print results
-files_result_json=callrestapi(reqval,reqtype)
+# Make REST API calls, and print the entries page by page as they arrive
 cols=['id','timeStamp','type','action','state','user','remoteAddress','application','description','uri']
-printresult(files_result_json,output_style,cols)
+entries=iterpaged(reqval,page_size=min(int(output_limit),1000),limit=int(output_limit),fields=getoutputfields(output_style,cols),excludelinks=output_style!='json')
+printitems(entries,output_style,cols)
@@ -39,7 +39,7 @@ from sharedfunctions import callrestapi, printresult, getconfigurationproperty
 # setup command-line arguements      
 parser = argparse.ArgumentParser(description="Return a set of configuration properties")
 parser.add_argument("-c","--configuration", help="Enter the configuration definition.",required='True')
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='json')
 
 args = parser.parse_args()
 configurationdef=args.configuration
@@ -8,9 +8,10 @@
 #
 # Change History
 # DDMMMYYY - 
+# 18OCT2026 Added --foldertree to find the paths in a saved folder tree
 #
 # Usage:
-# getpathsplus.py [-o] [-m "all", "name", "createdby"] -u objectURI [-d]
+# getpathsplus.py [-o] [-m "all", "name", "createdby"] -u objectURI [--foldertree FILE] [-d]
 #
 # Examples:
 #
@@ -53,6 +54,7 @@ import argparse
 import sys
 import os
 from sharedfunctions import getpath, getapplicationproperties, getobjectdetails
+from foldertree import getfoldertree
 
 # get python version
 version=int(str(sys.version_info[0]))
@@ -72,9 +74,11 @@ parser = argparse.ArgumentParser()
 parser.add_argument("-m","--more", action='store', const='all', nargs='?', choices=['all', 'name', 'createdby'], help="Returns additional details for each Object (default: all)")
 parser.add_argument("-o", action='store_const', const="yes", help="Prepends ObjectURIs to each row output")
 parser.add_argument("-u","--objecturi", action='store', dest='urilist', type=str, nargs='*', default=['objecturi1', 'objecturi2', 'objecturi3'], help="Object URI of folder or other object contained within a folder. Lists should be used WITHOUT quotes and delimited with a space. E.g. getpathsplus.py -u /files/files/1234 /files/files/abcd ", required=True)
+parser.add_argument("--foldertree", help="Find the paths in this folder tree file, it is created or refreshed when it is missing or too old")
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 args = parser.parse_args()
 urilist=args.urilist
+foldertreefile=args.foldertree
 more=args.more
 oid=args.o
 debug=args.debug
@@ -86,6 +90,10 @@ if len(urilist) == 0:
 else:
    print("Running...".format(args.urilist))
 
+# with a folder tree getpath finds the paths in memory
+if foldertreefile is not None:
+   getfoldertree(foldertreefile,includemembers=True).primepathcache()
+
 # checks for use of 'more' flag
 if more is None:
 
@@ -24,6 +24,7 @@
 import argparse, json
 
 from sharedfunctions import printresult, callrestapi
+from identitycache import IdentityCache
 
 # setup command-line arguements
 parser = argparse.ArgumentParser(description="Display POSIX attributes for group or all groups of no groups specified")
@@ -32,7 +33,7 @@ parser.add_argument("-g","--group", help="Enter the group id",default='all')
 parser.add_argument("-c","--custom", action='store_true', help="Display local (custom) groups as well")
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull. Default is 1000.",default=1000)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='simplejson')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='simplejson')
 
 args = parser.parse_args()
 group=args.group
@@ -58,16 +59,19 @@ if group=='all':
 
    groups = groupslist_result_json['items']
 
+   # the identifiers are requested concurrently
+   identifiers=IdentityCache().getidentifiers('groups',[group['id'] for group in groups])
+
    for group in groups:
        groupid=group['id']
-       reqval='/identities/groups/'+groupid+'/identifier'
 
-       if debug: print(reqval)
+       if debug: print('/identities/groups/'+groupid+'/identifier')
 
-       posixinfo_result_json=callrestapi(reqval,reqtype)
+       posixinfo_result_json=identifiers[groupid]
 
        # get gid
-       group["gid"]=posixinfo_result_json["gid"]
+       if isinstance(posixinfo_result_json,dict): group["gid"]=posixinfo_result_json["gid"]
+       else: group["gid"]=""
 
    cols=['id','gid','name','state','providerId']
    printresult(groupslist_result_json,output_style,cols)
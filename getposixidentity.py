@@ -24,6 +24,7 @@
 import argparse
 
 from sharedfunctions import printresult, callrestapi
+from identitycache import IdentityCache
 
 # setup command-line arguements
 parser = argparse.ArgumentParser(description="Display POSIX attributes for User or ALL users(default)")
@@ -33,7 +34,7 @@ parser.add_argument("-q","--query", help="Enter a valid rest query of usernames.
 parser.add_argument("-c","--custom", action='store_true', help="Display local (custom) users as well")
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull. Default is 1000.",default=1000)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='json')
 
 args = parser.parse_args()
 user=args.user
@@ -60,13 +61,15 @@ if user=='all':
 
      users = userslist_result_json['items']
 
+     # the identifiers are requested concurrently
+     identifiers=IdentityCache().getidentifiers('users',[user['id'] for user in users])
+
      for user in users:
          userid=user['id']
-         reqval='/identities/users/'+userid+'/identifier'
 
-         if debug: print(reqval)
+         if debug: print('/identities/users/'+userid+'/identifier')
 
-         posixinfo_result_json=callrestapi(reqval,reqtype,stoponerror=0,noprint=1)
+         posixinfo_result_json=identifiers[userid]
      
          # if a dictionary is returned posix attributes are available
          if isinstance(posixinfo_result_json,dict):
@@ -9,6 +9,9 @@
 # Change History
 #
 # 29OCT2024 Initial commit
+# 18OCT2026 Pages are read with iterpaged
+# 18OCT2026 Added --workers to request pages concurrently
+# 18OCT2026 Only the fields used are kept from each page, the item links are not requested
 #
 #
 # Copyright © 2018, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
@@ -22,7 +25,7 @@
 # 
 
 import argparse 
-from sharedfunctions import callrestapi
+from sharedfunctions import callrestapi, iterpaged
 
 # setup command-line arguements. In this block which is common to all the tools you setup what parameters
 # are passed to the tool
@@ -32,10 +35,12 @@ parser = argparse.ArgumentParser()
 parser.add_argument("-f","--filter", help="Set a custom filter for objects, for example eq(createdBy,sasdemo).")
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull in each REST API call. Default is 10.",default=10)
 parser.add_argument("-p","--pagelimit", type=int,help="Specify the number of pages to pull before stopping. Default is 10.",default=10)
+parser.add_argument("--workers", type=int,help="Specify the number of pages to request at the same time. Default is 1.",default=1)
 args = parser.parse_args()
 filter=args.filter
 limit=args.limit
 pagelimit=args.pagelimit
+workers=args.workers
 
 # Set the request type
 reqtype='get'
@@ -46,44 +51,17 @@ if filter is None:
 else:
     reqval='/scheduler/jobs?&filter='+filter+'&limit='+str(limit)
 
-# Make the rest call using the callrestapi function.
-results=callrestapi(reqval,reqtype)
-
-count=results['count']
-print('Found',count,'matching our query.')
-
+# Read the pages of results as they arrive using the iterpaged generator, stop after pagelimit pages
+# with --workers the remaining pages are requested by offset, that many at a time
+pageinfo={}
 # Write the IDs we found to an array
 ids = []
-for item in results.get("items",[]):
+for item in iterpaged(reqval,page_size=limit,limit=limit*pagelimit,pageinfo=pageinfo,prefetch=workers,fields=['id']):
     ids.append(item.get("id"))
 
-# We need to tolerate paged output.
-next_link = None
-pages = 1
-
-for link in results.get("links",[]):
-    if link.get("rel") == "next":
-        next_link = link.get("href")
-        break
-
-while pages < pagelimit and next_link is not None:
-    
-    pages += 1
-
-    # Call the next link
-    results=callrestapi(next_link,reqtype)
-
-    # Pull the ids into the array
-    for item in results.get("items",[]):
-        ids.append(item.get("id"))
-    
-    # Check for a next link again.
-    next_link = None
-    for link in results.get("links",[]):
-        if link.get("rel") == "next":
-            next_link = link.get("href")
-            break
-print('Pages traversed:',pages)
+count=pageinfo['count']
+print('Found',count,'matching our query.')
+print('Pages traversed:',pageinfo['pages'])
 print('Found ids:',len(ids))
 
 if len(ids) != count:
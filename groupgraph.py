@@ -0,0 +1,295 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# groupgraph.py
+# October 2026
+#
+# The group membership graph of the identities service, loaded with one listing of the groups and one members
+# request for each group, made concurrently. The effective (transitive) members of every group and the nesting
+# depth of each membership are then worked out in memory in one pass over the graph, instead of a recursive
+# request for each group. Users and groups are told apart by their type, so a user whose id is the same as the
+# id of a group is never taken for a nested group. Groups that are members of each other, directly or through other groups, are found
+# and reported as cycles, their members are still counted once with the shortest depth.
+#
+# GroupGraph
+#   load              read all groups and their direct members from the server
+#   getmembers        the direct or effective members of a group, each with the depth it is nested at, 1 is direct
+#   getmemberof       the groups a user or group is a direct or effective member of, with the same depth
+#   getnestingdepth   the number of levels of groups nested below a group, 0 when it has no group members
+#   itermemberships   every effective membership of every group, for reports of who is in what
+#   cycles            lists of group ids that are members of each other
+#
+# Example:
+#
+#   from groupgraph import GroupGraph
+#
+#   graph=GroupGraph().load(workers=10)
+#   for member in graph.getmembers('SASAdministrators'):
+#       print(member['id'],member['type'],member['depth'])
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 Identities are keyed by type and id, only members of type group are nested groups
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+from collections import deque
+
+from sharedfunctions import iterpaged, callrestapi_many
+
+MEMBERLIMIT=10000
+
+
+# getidentitykey
+# the (type,id) a user or group is kept under, a member without a type is taken to be a user
+# change history
+#   18OCT2026 initial development
+
+def getidentitykey(identity):
+
+    return (identity.get('type') or 'user',identity['id'])
+
+
+class GroupGraph(object):
+
+    def __init__(self):
+
+        self.groups={}         # group id to group json
+        self.identities={}     # (type,id) of a user or group to its json
+        self.members={}        # group id to the (type,id) of its direct members
+        self.errors={}         # group id to the error when its members could not be read
+        self.closure={}        # group id to a dictionary of the (type,id) of each effective member to its depth
+        self.nesting={}        # group id to its nesting depth
+        self.cycles=[]         # lists of group ids that are members of each other
+        self.memberof=None     # (type,id) of a member to a dictionary of group id to depth, built when it is first needed
+
+    # read every group and the direct members of each group, then work out the effective memberships
+    def load(self,workers=None):
+
+        self.__init__()
+
+        for group in iterpaged('/identities/groups',page_size=1000,prefetch=workers,excludelinks=True):
+            # groups with an empty id have been seen at customer sites, their members cannot be read
+            if group['id']!="":
+                self.groups[group['id']]=group
+                self.identities[('group',group['id'])]=group
+
+        groupids=list(self.groups)
+        requestlist=[{'reqval':'/identities/groups/'+groupid+'/members?excludeItemLinks=true&limit='+str(MEMBERLIMIT),'reqtype':'get'} for groupid in groupids]
+
+        for groupid,restresult in zip(groupids,callrestapi_many(requestlist,workers)):
+
+            if restresult.error is not None:
+                self.errors[groupid]=restresult.error
+                self.members[groupid]=[]
+                continue
+
+            items=restresult.result.get('items',[])
+
+            # a group with more members than one page holds reads the rest page by page
+            if restresult.result.get('count',0)>len(items):
+                items=items+list(iterpaged('/identities/groups/'+groupid+'/members',page_size=MEMBERLIMIT,start=len(items),excludelinks=True))
+
+            self.addmembers(groupid,items)
+
+        self.resolve()
+
+        return self
+
+    def addmembers(self,groupid,items):
+
+        memberkeys=self.members.setdefault(groupid,[])
+
+        for member in items:
+            memberkey=getidentitykey(member)
+            self.identities.setdefault(memberkey,member)
+            memberkeys.append(memberkey)
+
+    # the group ids among the direct members of a group, only members of type group
+    def getsubgroups(self,groupid):
+
+        return [memberid for membertype,memberid in self.members.get(groupid,[]) if membertype=='group' and memberid in self.groups]
+
+    # work out the effective members and nesting depth of every group
+    # the strongly connected components of the graph are visited children first, so the closure of every group
+    # a component contains is known when the component is reached and each membership is only followed once
+    def resolve(self):
+
+        self.closure={}
+        self.nesting={}
+        self.cycles=[]
+        self.memberof=None
+
+        for component in self.components():
+
+            inside=set(component)
+
+            if len(component)>1 or component[0] in self.getsubgroups(component[0]):
+                self.cycles.append(sorted(component))
+
+            # groups outside the component that it contains, they are already resolved
+            nesting=0
+            for groupid in component:
+                for subgroupid in self.getsubgroups(groupid):
+                    if subgroupid in inside: nesting=max(nesting,1)
+                    else: nesting=max(nesting,self.nesting[subgroupid]+1)
+
+            for groupid in component:
+                self.closure[groupid]=self._reach(groupid,inside)
+                self.nesting[groupid]=nesting
+
+    # breadth first from a group through the groups of its own component, the closure of a group outside the
+    # component is added with the depth it was reached at, the shortest depth wins
+    def _reach(self,groupid,inside):
+
+        reached={}
+        seen=set([groupid])
+        queue=deque([(groupid,0)])
+
+        while queue:
+
+            currentid,depth=queue.popleft()
+
+            for memberkey in self.members.get(currentid,[]):
+
+                if memberkey not in reached or reached[memberkey]>depth+1:
+                    reached[memberkey]=depth+1
+
+                membertype,memberid=memberkey
+                if membertype!='group':
+                    continue
+
+                if memberid in inside:
+                    if memberid not in seen:
+                        seen.add(memberid)
+                        queue.append((memberid,depth+1))
+                elif memberid in self.closure:
+                    for nestedkey,nesteddepth in self.closure[memberid].items():
+                        if nestedkey not in reached or reached[nestedkey]>depth+1+nesteddepth:
+                            reached[nestedkey]=depth+1+nesteddepth
+
+        return reached
+
+    # the strongly connected components of the groups, Tarjan's algorithm without recursion
+    # a component is returned after every component it has an edge to
+    def components(self):
+
+        index={}
+        lowlink={}
+        onstack=set()
+        stack=[]
+        components=[]
+        counter=0
+
+        for startid in self.groups:
+
+            if startid in index:
+                continue
+
+            work=[(startid,iter(self.getsubgroups(startid)))]
+            index[startid]=lowlink[startid]=counter
+            counter=counter+1
+            stack.append(startid)
+            onstack.add(startid)
+
+            while work:
+
+                groupid,children=work[-1]
+                advanced=False
+
+                for childid in children:
+                    if childid not in index:
+                        index[childid]=lowlink[childid]=counter
+                        counter=counter+1
+                        stack.append(childid)
+                        onstack.add(childid)
+                        work.append((childid,iter(self.getsubgroups(childid))))
+                        advanced=True
+                        break
+                    elif childid in onstack:
+                        lowlink[groupid]=min(lowlink[groupid],index[childid])
+
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parentid=work[-1][0]
+                    lowlink[parentid]=min(lowlink[parentid],lowlink[groupid])
+
+                if lowlink[groupid]==index[groupid]:
+                    component=[]
+                    while True:
+                        memberid=stack.pop()
+                        onstack.discard(memberid)
+                        component.append(memberid)
+                        if memberid==groupid: break
+                    components.append(component)
+
+        return components
+
+    # a copy of the user or group json with the depth added
+    def _withdepth(self,identitykey,depth):
+
+        identity=dict(self.identities.get(identitykey,{'id':identitykey[1],'type':identitykey[0]}))
+        identity['depth']=depth
+
+        return identity
+
+    # the members of a group sorted by depth, only the direct members when effective is False
+    def getmembers(self,groupid,effective=True):
+
+        if effective:
+            reached=self.closure.get(groupid,{})
+        else:
+            reached=dict((memberkey,1) for memberkey in self.members.get(groupid,[]))
+
+        return [self._withdepth(memberkey,depth) for memberkey,depth in sorted(reached.items(),key=lambda item:(item[1],item[0]))]
+
+    # the groups a user, or a group when identitytype is group, is a member of sorted by depth,
+    # only the direct ones when effective is False
+    def getmemberof(self,identityid,effective=True,identitytype='user'):
+
+        if self.memberof is None:
+            self.memberof={}
+            for groupid,reached in self.closure.items():
+                for memberkey,depth in reached.items():
+                    self.memberof.setdefault(memberkey,{})[groupid]=depth
+
+        reached=self.memberof.get((identitytype,identityid),{})
+        if not effective:
+            reached=dict((groupid,depth) for groupid,depth in reached.items() if depth==1)
+
+        return [self._withdepth(('group',groupid),depth) for groupid,depth in sorted(reached.items(),key=lambda item:(item[1],item[0]))]
+
+    def getnestingdepth(self,groupid):
+
+        return self.nesting.get(groupid,0)
+
+    # every effective membership, one dictionary for each group and member with the depth of the membership
+    def itermemberships(self,groupids=None):
+
+        if groupids is None:
+            groupids=list(self.groups)
+
+        for groupid in groupids:
+
+            group=self.groups[groupid]
+
+            for member in self.getmembers(groupid):
+                yield {'groupid':groupid,'groupname':group.get('name'),'memberid':member['id'],'membername':member.get('name'),
+                       'membertype':member.get('type'),'depth':member['depth']}
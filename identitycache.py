@@ -0,0 +1,248 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# identitycache.py
+# October 2026
+#
+# A cache of users, groups and their POSIX identifiers, so tools that look up the same identity for many rows
+# make one request for it, or none at all. Users and groups are fetched in bulk: all of them with a paged
+# listing (loadusers, loadgroups), or the ones asked for with in(id,...) filters in batches of up to batchsize
+# ids, the batches are requested concurrently. Identifiers have no bulk endpoint and are requested concurrently.
+# Identities that do not exist are remembered as None so they are not asked for again.
+#
+# IdentityCache
+#   loadusers, loadgroups      read all users or groups, optionally with a filter
+#   getusers, getgroups        dictionary of id to user or group json, None for ids that do not exist
+#   getuser, getgroup          one user or group, None if it does not exist
+#   getidentifiers             dictionary of id to the POSIX identifier json of users or groups
+#   adduser, addgroup          add an identity the tool created
+#
+# The cache lives for the run of the tool. With persist=True, PYVIYA_IDENTITY_CACHE=1 or pyviya.identity.cache=true
+# in application.properties it is also saved to ~/.sas/pyviyatools-cache/identities-<profile>.json when the tool
+# exits and read back by the next run, entries older than PYVIYA_IDENTITY_CACHE_TTL seconds (default 3600) are
+# fetched again.
+#
+# Example:
+#
+#   from identitycache import IdentityCache
+#
+#   identities=IdentityCache()
+#   users=identities.getusers(['geladm','Ahmed','Fay'])
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import atexit
+import json
+import os
+import threading
+import time
+
+from sharedfunctions import iterpaged, callrestapi_many, getcliprofile, getpyviyasetting
+
+# marks an identity that is not in the cache, None is an identity that does not exist
+MISSING=object()
+
+
+class IdentityCache(object):
+
+    def __init__(self,persist=None,ttl=None,workers=None,batchsize=50,filename=None):
+
+        if persist is None:
+            persist=str(getpyviyasetting('PYVIYA_IDENTITY_CACHE','pyviya.identity.cache','false')).lower() in ('true', '1', 't')
+        if ttl is None:
+            ttl=float(getpyviyasetting('PYVIYA_IDENTITY_CACHE_TTL','pyviya.identity.cachettl',3600))
+        if filename is None:
+            cachedir=getpyviyasetting('PYVIYA_CACHE_DIR','pyviya.cache.dir',os.path.join(os.path.expanduser('~'),'.sas','pyviyatools-cache'))
+            filename=os.path.join(cachedir,'identities-'+getcliprofile().name+'.json')
+
+        self.persist=persist
+        self.ttl=ttl
+        self.workers=workers
+        self.batchsize=batchsize
+        self.filename=filename
+        self.lock=threading.Lock()
+
+        # kind to id to [time fetched, json or None]
+        self.entries={'users':{},'groups':{},'users/identifier':{},'groups/identifier':{}}
+
+        if self.persist:
+            self.load()
+            atexit.register(self.save)
+
+    # return the entry json when it is cached and not too old, otherwise the marker MISSING
+    def _get(self,kind,identityid):
+
+        entry=self.entries[kind].get(identityid)
+
+        if entry is None or time.time()-entry[0]>self.ttl:
+            return MISSING
+
+        return entry[1]
+
+    def _put(self,kind,identityid,value):
+
+        with self.lock:
+            self.entries[kind][identityid]=[time.time(),value]
+
+    # read all users or groups that match the filter and keep them
+    def _loadall(self,kind,filter=None):
+
+        reqval='/identities/'+kind+'?excludeItemLinks=true'
+        params={}
+        if filter is not None: params['filter']=filter
+
+        identities={}
+        for identity in iterpaged(reqval,page_size=1000,params=params,prefetch=self.workers):
+            self._put(kind,identity['id'],identity)
+            identities[identity['id']]=identity
+
+        return identities
+
+    def loadusers(self,filter=None):
+
+        return self._loadall('users',filter)
+
+    def loadgroups(self,filter=None):
+
+        return self._loadall('groups',filter)
+
+    # fetch the ids that are not cached with in(id,...) filters, batchsize ids at a time
+    def _getmany(self,kind,ids):
+
+        result={}
+        wanted=[]
+
+        for identityid in ids:
+            value=self._get(kind,identityid)
+            if value is MISSING:
+                wanted.append(identityid)
+            else:
+                result[identityid]=value
+
+        # each id once, in the order asked for
+        wanted=list(dict.fromkeys(wanted))
+
+        batches=[wanted[i:i+self.batchsize] for i in range(0,len(wanted),self.batchsize)]
+        requestlist=[{'reqval':'/identities/'+kind+'?excludeItemLinks=true','reqtype':'get',
+                      'params':{'filter':'in(id,'+','.join(quoteid(identityid) for identityid in batch)+')','limit':len(batch)}} for batch in batches]
+
+        for batch,restresult in zip(batches,callrestapi_many(requestlist,self.workers)):
+
+            found={}
+            if restresult.error is None and isinstance(restresult.result,dict):
+                for identity in restresult.result.get('items',[]):
+                    found[identity['id']]=identity
+
+            for identityid in batch:
+                # a failed request is not remembered so the id is asked for again next time
+                if restresult.error is None: self._put(kind,identityid,found.get(identityid))
+                result[identityid]=found.get(identityid)
+
+        return result
+
+    def getusers(self,ids):
+
+        return self._getmany('users',ids)
+
+    def getgroups(self,ids):
+
+        return self._getmany('groups',ids)
+
+    def getuser(self,userid):
+
+        return self.getusers([userid])[userid]
+
+    def getgroup(self,groupid):
+
+        return self.getgroups([groupid])[groupid]
+
+    def adduser(self,user):
+
+        self._put('users',user['id'],user)
+
+    def addgroup(self,group):
+
+        self._put('groups',group['id'],group)
+
+    # the POSIX identifiers of users or groups, requested concurrently, None when there is none
+    def getidentifiers(self,kind,ids):
+
+        cachekind=kind+'/identifier'
+        result={}
+        wanted=[]
+
+        for identityid in ids:
+            value=self._get(cachekind,identityid)
+            if value is MISSING:
+                wanted.append(identityid)
+            else:
+                result[identityid]=value
+
+        # each id once, in the order asked for
+        wanted=list(dict.fromkeys(wanted))
+
+        requestlist=[{'reqval':'/identities/'+kind+'/'+identityid+'/identifier','reqtype':'get'} for identityid in wanted]
+
+        for identityid,restresult in zip(wanted,callrestapi_many(requestlist,self.workers)):
+
+            value=restresult.result if isinstance(restresult.result,dict) else None
+
+            # a 404 means there is no identifier, other errors are not remembered
+            if value is not None or restresult.status_code==404: self._put(cachekind,identityid,value)
+            result[identityid]=value
+
+        return result
+
+    def load(self):
+
+        try:
+            with open(self.filename) as f:
+                content=json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        for kind in self.entries:
+            for identityid,entry in content.get(kind,{}).items():
+                if time.time()-entry[0]<=self.ttl:
+                    self.entries[kind][identityid]=entry
+
+    def save(self):
+
+        directory=os.path.dirname(self.filename)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with self.lock:
+            content=json.dumps(self.entries)
+
+        tmpfile=self.filename+'.'+str(os.getpid())+'.tmp'
+        with open(tmpfile,'w') as f:
+            f.write(content)
+        os.replace(tmpfile,self.filename)
+
+
+# quoteid
+# quote an id for a filter, a quote in the id is doubled
+# change history
+#   18OCT2026 initial development
+
+def quoteid(identityid):
+
+    return "'"+identityid.replace("'","''")+"'"
@@ -4,6 +4,9 @@
 # jobmodule.py
 # August 2021
 # March 2023 - Issue #137
+# October 2026 - requests are made on the pooled session of the shared ViyaClient
+# October 2026 - getauthtoken and getbaseurl use the cached profile and token from sharedfunctions
+# October 2026 - execute_job waits for the job with a long poll of its state instead of polling every 10ms
 #
 # This module has the following functions in the folder.
 # submit_job_definition is used by submit_jobdef.py to submit a job based on the job definition id. Depending if a
@@ -14,12 +17,15 @@
 # submit_job_definition then it will create a job request after which it will call execute_job.
 #
 # execute_job is called by both submit_job_definition and submit_job_request and is responsible for submitting the job.
+# It then waits for the job with waitforjob from sharedfunctions, each request for the job state is held by the server
+# for up to 10 seconds until the state changes, so a finished job is seen at once without polling the server constantly.
 #
 # check_context verifies if the context provided by the user is the correct context, if it's not the program will error out
 #
 #
 #
-# NOTE: Above functions don't use callrestapi from the shared module, instead it makes requests calls.
+# NOTE: Above functions don't use callrestapi from the shared module, instead they make requests calls on the
+# pooled session returned by getviyaclient so they re-use the same keep-alive connections.
 # getauthtoken
 # getbaseurl
 # file_accessible
@@ -38,11 +44,15 @@
 #  express or implied. See the License for the specific language governing permissions and limitations under the License.
 #
 
-import requests, sys, os, time, json
-from sharedfunctions import callrestapi
+import sys, os, time, json, threading
+from sharedfunctions import callrestapi, getviyaclient, getauthtoken, getbaseurl, waitforjob
+
+# seconds the server holds a request for the job state until the state changes
+STATE_WAIT = 10
 
 class jobmodule:
     def __init__(self):
+        self.client = getviyaclient()
         self.head = {"Content-type": "application/json", "Accept": "application/json", "Authorization": jobmodule.getauthtoken(jobmodule.getbaseurl())}
         self.verbose = None
         self.sasjob_status = None
@@ -56,6 +66,7 @@ class jobmodule:
         self.sasjob_error_details = None
         self.cancel_job_uri = None
         self.cancel_job_method = None
+        self.cancel_wait = threading.Event()
 
 
 
@@ -69,7 +80,7 @@ class jobmodule:
         contextName = contextName
         jobDefinitionUri = "/jobDefinitions/definitions/" + jobID
         url = self.getbaseurl() + jobDefinitionUri
-        result = requests.get(url=url, headers=self.head)
+        result = self.client.request('get', url=url, headers=self.head)
         if result.status_code == 404:
             print("ERROR! Job Definition ID is invalid. No Job Definition was found with id: {}".format(id))
             return
@@ -79,7 +90,7 @@ class jobmodule:
         name = result.json()['name']
         desc = result.json()['name'].strip() + " created by: " + os.getlogin() + " using pyviyatools"
         url = self.getbaseurl() + "/jobExecution/jobRequests?filter=in('jobDefinitionUri','{}')&sortBy=modifiedTimeStamp:descending".format(jobDefinitionUri)
-        result = requests.get(url=url,headers=self.head)
+        result = self.client.request('get', url=url,headers=self.head)
         count = result.json()['count']
         if count == 0:
             if self.verbose:
@@ -115,7 +126,7 @@ class jobmodule:
             if self.verbose:
                 print ("Checking if the job request id {} is valid".format(id))
             url = self.getbaseurl() + "/jobExecution/jobRequests/{}".format(id)
-            result = requests.get(url=url,headers=self.head)
+            result = self.client.request('get', url=url,headers=self.head)
             if result.status_code == 404:
                 print("ERROR! Job Request ID is invalid. No Job Request was found with id: {}".format(kwargs['jobID']))
                 sys.exit(1)
@@ -129,7 +140,7 @@ class jobmodule:
                 print ("Submitting a new job request.")
             url = self.getbaseurl() + "/jobExecution/jobRequests"
             # March 2023 - Issue #137 Changed data to json.
-            result = requests.post(url=url,json=job_req_json,headers=self.head)
+            result = self.client.request('post', url=url,json=job_req_json,headers=self.head)
             print ("New Job Request has been created. {}".format(result.json()['id']))
             self.job_requests_id = result.json()['id']
             for links in result.json()['links']:
@@ -138,16 +149,19 @@ class jobmodule:
                     submit_job_url = self.getbaseurl() + links['uri'].strip()
                     self.execute_job(url=submit_job_url)
 
-    def execute_job(self, url):
+    def execute_job(self, url, timeout=None):
         sasout_loc = None
         saslog_loc = None
         sasresinfo = None
         job_error_details = None
         job_status_details = None
         jobStatusURI = None
-        result = requests.post(url=url, headers=self.head)
+        self.cancel_wait.clear()
+        result = self.client.request('post', url=url, headers=self.head)
         print ("Job Submitted.")
         print ("Job id: {} \nState: {}".format(result.json()['id'],result.json()['state']))
+        self.job_execution_id = result.json()['id']
+        self.sasjob_status = result.json()['state']
         for links in result.json()['links']:
             if links['rel'] == 'self':
                 jobStatusURI = links['uri']
@@ -157,14 +171,15 @@ class jobmodule:
                 self.cancel_job_method = links['method']
 
                 print ("Get Job Results > {}".format(url))
-                result = requests.get(url=url, headers=self.head)
-        while result.json()['state'] == 'running':
-            time.sleep(0.01)
-            url = self.getbaseurl() + jobStatusURI
-            result = requests.get(url=url,headers=self.head)
+                result = self.client.request('get', url=url, headers=self.head)
+        if result.json()['state'] in ['pending', 'running']:
+            state, error = waitforjob(lambda: self.get_job_state(jobStatusURI), lambda state: state not in ['pending', 'running'],
+                                      timeout=timeout, cancel=self.cancel_wait)
+            if error is not None:
+                print ("Job {} {}".format(self.job_execution_id, error))
 
         url = self.getbaseurl() + jobStatusURI
-        result = requests.get(url=url,headers=self.head)
+        result = self.client.request('get', url=url,headers=self.head)
         job_status = result.json()['state']
         if 'stateDetails' in result.json():
             print ("Job {} with {}".format(job_status,job_status_details))
@@ -188,7 +203,17 @@ class jobmodule:
         self.sasres_location = sasresinfo
         self.sasjob_error_details = job_error_details
 
+    # the state of a job, the request is held by the server for up to STATE_WAIT seconds while the job is running
+    def get_job_state(self, jobStatusURI):
+        url = self.getbaseurl() + jobStatusURI + "/state?wait={}".format(STATE_WAIT)
+        head = dict(self.head, Accept="text/plain")
+        result = self.client.request('get', url=url, headers=head)
+        if result.status_code != 200:
+            return None
+        return result.text.strip()
+
     def cancel_job(self):
+        self.cancel_wait.set()
         if self.sasjob_status == "running":
             result = callrestapi(self.cancel_job_uri, self.cancel_job_method, acceptType="text/plain", contentType="text/plain")
             return result.text
@@ -199,11 +224,11 @@ class jobmodule:
         if contextName not in context:
             print("Context provided, {} ,is not the default context".format(contextName))
             check_context_uri = self.getbaseurl() + "/compute/contexts?filter=eq('name','{}')".format(contextName)
-            check_context_resp = requests.get(check_context_uri,headers=self.head)
+            check_context_resp = self.client.request('get', check_context_uri,headers=self.head)
             count = check_context_resp.json()['count']
             if count == 0:
                 session_context_nf_uri = self.getbaseurl() + "/compute/contexts"
-                session_context_nf_result = requests.get(session_context_nf_uri,headers=self.head)
+                session_context_nf_result = self.client.request('get', session_context_nf_uri,headers=self.head)
                 listOfNames = []
                 for names in session_context_nf_result.json()['items']:
                     listOfNames.append(names['name'])
@@ -215,95 +240,17 @@ class jobmodule:
         return True
 
 
+    # the token and profile are cached by the shared CLIProfile and TokenManager
     @staticmethod
     def getauthtoken(baseurl):
 
-        #get authentication information for the header
-        credential_file=os.path.join(os.path.expanduser('~'),'.sas','credentials.json')
-
-        # check that credential file is available and can be read
-        access_file=jobmodule.file_accessible(credential_file, 'r')
-
-        if access_file==False:
-            oaval=None
-            print("ERROR: Cannot read authentication credentials at: ", credential_file)
-            print("ERROR: Try refreshing your token with sas-admin auth login")
-            sys.exit()
-
-        with open(credential_file) as json_file:
-            data = json.load(json_file)
-        type(data)
-
-        # the sas-admin profile init creates an empty credential file
-        # check that credential is in file, if it is add it to the header, if not exit
-
-         # get the profile environment variable to use it
-        # if it is not set default to the default profile
-
-        cur_profile=os.environ.get("SAS_CLI_PROFILE","Default")
-
-        #print("LOGON: ", cur_profile )
-
-        if cur_profile in data:
-            oauthToken=data[cur_profile]['access-token']
-            oauthTokenType="bearer"
-            oaval=oauthTokenType + ' ' + oauthToken
-
-            if oauthToken == "":
-                oaval = None
-                print("ERROR: access token not in file: ", credential_file)
-                print("ERROR: Try refreshing your token with sas-admin auth login")
-                sys.exit()
-
-        else:
-
-            oaval=None
-            print("ERROR: access token not in file: ", credential_file)
-            print("ERROR: Try refreshing your token with sas-admin auth login")
-            sys.exit()
-
-        return oaval
+        return getauthtoken(baseurl)
 
 
     @staticmethod
     def getbaseurl():
-        # check that profile file is available and can be read
-
-        # note the path to the profile is hard-coded right now
-        endpointfile=os.path.join(os.path.expanduser('~'),'.sas','config.json')
-        access_file= jobmodule.file_accessible(endpointfile, 'r')
-
-        #profile does not exist
-        if access_file==False:
-            print("ERROR: Cannot read CLI profile at:",endpointfile,". Recreate profile with sas-admin profile init.")
-            sys.exit()
-
-        #profile is empty file
-        if os.stat(endpointfile).st_size==0:
-             print("ERROR: Cannot read CLI profile empty file at:",endpointfile,". Recreate profile with sas-admin profile init.")
-             sys.exit()
-
-        # get json from profile
-        with open(endpointfile) as json_file:
-            data = json.load(json_file)
-
-        # get the profile environment variable to use it
-        # if it is not set default to the default profile
-
-        cur_profile=os.environ.get("SAS_CLI_PROFILE","Default")
-        #print("URL: ",cur_profile )
-
-        # check that information is in profile
-        if cur_profile in data:
-            baseurl=data[cur_profile]['sas-endpoint']
-        else:
-
-            baseurl=None
-            print("ERROR: profile "+cur_profile+" does not exist. Recreate profile with sas-admin profile init.")
-            sys.exit()
-
 
-        return baseurl
+        return getbaseurl()
 
     @staticmethod
     def file_accessible(filepath, mode):
@@ -32,7 +32,7 @@ from sharedfunctions import callrestapi,printresult
 
 parser = argparse.ArgumentParser() 
 parser.add_argument("-s","--server", help="The CAS SERVER.",required='True',default="cas-shared-default")
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='csv')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='csv')
 args = parser.parse_args()
 casserver=args.server
 output_style=args.output
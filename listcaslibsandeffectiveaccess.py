@@ -3,15 +3,23 @@
 #
 # listcaslibsandeffectiveaccess.py
 # January 2019
+# October 2026 added --workers to get caslib access concurrently
+# October 2026 caslibs on all servers are evaluated concurrently, added --perserver and --checkpoint
 #
 # Usage:
-# listcaslibsandeffectiveaccess.py [--noheader] [-d]
+# listcaslibsandeffectiveaccess.py [--noheader] [-d] [--workers WORKERS] [--perserver PERSERVER] [--checkpoint FILE]
 #
 # Examples:
 #
 # 1. Return list of all effective access on all CAS libraries on all servers
 #        ./listcaslibsandeffectiveaccess.py
 #
+# 2. As above, making 10 requests at a time
+#        ./listcaslibsandeffectiveaccess.py --workers 10
+#
+# 3. As above, at most 4 requests at a time to each CAS server, an interrupted run is resumed by running it again
+#        ./listcaslibsandeffectiveaccess.py --workers 10 --perserver 4 --checkpoint /tmp/caslibaccess.checkpoint >> /tmp/caslibaccess.csv
+#
 # Copyright © 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
 #  Licensed under the Apache License, Version 2.0 (the License);
@@ -33,7 +41,7 @@ debug=False
 # Import Python modules
 import argparse
 import sys
-from sharedfunctions import callrestapi
+from casaccess import CASAccessScanner
 
 # Define exception handler so that we only output trace info from errors when in debug mode
 def exception_handler(exception_type, exception, traceback, debug_hook=sys.excepthook):
@@ -50,67 +58,57 @@ permissions=['readInfo','select','limitedPromote','promote','createTable','dropT
 parser = argparse.ArgumentParser()
 parser.add_argument("-n","--name", help="Caslib name contains",default=None)
 parser.add_argument("--noheader", action='store_true', help="Do not print the header row")
+parser.add_argument("-w","--workers", type=int, help="Number of concurrent requests to make",default=1)
+parser.add_argument("--perserver", type=int, help="Number of concurrent requests to make to each CAS server",default=None)
+parser.add_argument("--checkpoint", help="File to record the caslibs that are done in, a run with the same file skips them",default=None)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 args = parser.parse_args()
 noheader=args.noheader
+workers=args.workers
+perserver=args.perserver
+checkpoint=args.checkpoint
 debug=args.debug
 
 nameval=args.name
 if nameval !=None: namefilter='&filter=contains(name,"'+nameval+'")'
 else: namefilter=""
 
-# Print header row unless noheader argument was specified
-if not noheader:
-    print('server,caslib,'+','.join(map(str, identity_cols))+','+','.join(map(str, permissions)))
-
-endpoint='/casManagement/servers'
-method='get'
-
-#make the rest call
-serverlist_result_json=callrestapi(endpoint,method)
-
-if debug:
-    print(serverlist_result_json)
-    print('serverlist_result_json is a '+type(serverlist_result_json).__name__+' object') #serverlist_result_json is a dict object
+scanner=CASAccessScanner(workers=workers,perserver=perserver,checkpoint=checkpoint)
 
-servers = serverlist_result_json['items']
-
-for server in servers:
-    servername=server['name']
-
-    # List the caslibs in this server
-    endpoint='/casManagement/servers/'+servername+'/caslibs?excludeItemLinks=true&limit=10000'+namefilter
-    method='get'
-
-    caslibs_result_json=callrestapi(endpoint,method)
-    if debug:
-        print(caslibs_result_json)
-        print('caslibs_result_json is a '+type(caslibs_result_json).__name__+' object') #caslibs_result_json is a dict object
-    caslibs=caslibs_result_json['items']
-
-    for caslib in caslibs:
-
-     
-            caslibname=caslib['name']
-            #print(servername+','+caslibname)
-
-            # Get effective Access Controls on this caslib
-            endpoint='/casAccessManagement/servers/'+servername+'/caslibControls/'+caslibname+'?accessControlType=effective&limit=10000'
-            method='get'
-            caslibaccess_result_json=callrestapi(endpoint,method)
-
-            #print(caslibaccess_result_json)
-            for ai in caslibaccess_result_json['items']:
-                output=servername+','+caslibname
-                for col in identity_cols:
-                    if col in ai:
-                        output=output+','+ai[col]
-                    else:
-                        output=output+','
-                for col in permissions:
-                    if col in ai:
-                        output=output+','+ai[col]
-                    else:
-                        output=output+','
-                print(output)
+# Print header row unless noheader argument was specified, or when a checkpointed run is resumed
+if not noheader and not scanner.resumed():
+    print('server,caslib,'+','.join(map(str, identity_cols))+','+','.join(map(str, permissions)))
 
+# the caslibs of all servers are evaluated concurrently and each caslib is printed as soon as its access is read
+for unit in scanner.scan(caslibfilter=namefilter):
+
+    servername=unit['server']
+    caslibname=unit['caslib']
+
+    if debug: print(unit)
+
+    if caslibname is None:
+        print(servername+',[error getting caslibs]')
+        continue
+
+    if unit['error'] is not None:
+        print(servername+','+caslibname+',[error getting access controls]')
+        continue
+
+    for ai in unit['items']:
+        output=servername+','+caslibname
+        for col in identity_cols:
+            if col in ai:
+                output=output+','+ai[col]
+            else:
+                output=output+','
+        for col in permissions:
+            if col in ai:
+                output=output+','+ai[col]
+            else:
+                output=output+','
+        print(output)
+
+    # the caslib is recorded in the checkpoint once its rows are written
+    sys.stdout.flush()
+    scanner.complete(unit)
@@ -4,15 +4,23 @@
 # listcastablesandeffectiveaccess.py
 # January 2019
 # April 2023 added -n for name filtering 
+# October 2026 added --workers to get tables and table access concurrently
+# October 2026 tables on all servers are evaluated concurrently, added --perserver and --checkpoint
 #
 # Usage:
-# listcastablesandeffectiveaccess.py [-n <name> ] [--noheader] [--rowlevelsecurity] [--sourcetables] [-d]
+# listcastablesandeffectiveaccess.py [-n <name> ] [--noheader] [--rowlevelsecurity] [--sourcetables] [-d] [--workers WORKERS] [--perserver PERSERVER] [--checkpoint FILE]
 #
 # Examples:
 #
 # 1. Return list of all effective access on all CAS tables in all CAS libraries on all servers
 #        ./listcastablesandeffectiveaccess.py
 #
+# 2. As above, making 10 requests at a time
+#        ./listcastablesandeffectiveaccess.py --workers 10
+#
+# 3. As above, at most 4 requests at a time to each CAS server, an interrupted run is resumed by running it again
+#        ./listcastablesandeffectiveaccess.py --workers 10 --perserver 4 --checkpoint /tmp/tableaccess.checkpoint >> /tmp/tableaccess.csv
+#
 # Copyright © 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
 #  Licensed under the Apache License, Version 2.0 (the License);
@@ -34,7 +42,7 @@ debug=False
 # Import Python modules
 import argparse
 import sys
-from sharedfunctions import callrestapi
+from casaccess import CASAccessScanner
 
 # Define exception handler so that we only output trace info from errors when in debug mode
 def exception_handler(exception_type, exception, traceback, debug_hook=sys.excepthook):
@@ -53,9 +61,15 @@ parser.add_argument("-n","--name", help="Table name contains",default=None)
 parser.add_argument("--noheader", action='store_true', help="Do not print the header row")
 parser.add_argument("--rowlevelsecurity", action='store_true', help="Get row level security (i.e. table filters on the select permission)")
 parser.add_argument("--sourcetables", action='store_true', help="Get effective permissions for source tables, rather than in-memory tables which is the default")
+parser.add_argument("-w","--workers", type=int, help="Number of concurrent requests to make",default=1)
+parser.add_argument("--perserver", type=int, help="Number of concurrent requests to make to each CAS server",default=None)
+parser.add_argument("--checkpoint", help="File to record the tables that are done in, a run with the same file skips them",default=None)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 args = parser.parse_args()
 noheader=args.noheader
+workers=args.workers
+perserver=args.perserver
+checkpoint=args.checkpoint
 rowlevelsecurity=args.rowlevelsecurity
 sourcetables=args.sourcetables
 debug=args.debug
@@ -67,82 +81,49 @@ else: namefilter=""
 if rowlevelsecurity:
     permissions.append("tableFilter")
 
-# Print header row unless noheader argument was specified
-if not noheader:
+scanner=CASAccessScanner(workers=workers,perserver=perserver,checkpoint=checkpoint)
+
+# Print header row unless noheader argument was specified, or when a checkpointed run is resumed
+if not noheader and not scanner.resumed():
     print('server,caslib,table,'+','.join(map(str, identity_cols))+','+','.join(map(str, permissions)))
 
 
-endpoint='/casManagement/servers'
-method='get'
+# the tables of all caslibs on all servers are evaluated concurrently and each table is printed as soon as its access is read
+for unit in scanner.scan(tables=True,tablefilter=namefilter,sourcetables=sourcetables):
 
-#make the rest call
-serverlist_result_json=callrestapi(endpoint,method)
+    servername=unit['server']
+    caslibname=unit['caslib']
+    tablename=unit['table']
 
-if debug:
-    print(serverlist_result_json)
-    print('serverlist_result_json is a '+type(serverlist_result_json).__name__+' object') #serverlist_result_json is a dict object
+    if debug: print(unit)
 
-servers = serverlist_result_json['items']
+    if caslibname is None:
+        print(servername+',[error getting caslibs]')
+        continue
 
-for server in servers:
-    servername=server['name']
+    if unit['message'] is not None:
+        print(servername+','+caslibname+','+str(unit['message']))
+    elif tablename=='' and unit['error'] is not None:
+        print(servername+','+caslibname+',[error getting tables]')
+        continue
+    elif unit['error'] is not None:
+        print(servername+','+caslibname+','+tablename+',[error getting access controls]')
+        continue
 
-    # List the caslibs in this server
-    endpoint='/casManagement/servers/'+servername+'/caslibs?excludeItemLinks=true&limit=10000'
-    method='get'
-    caslibs_result_json=callrestapi(endpoint,method)
-    if debug:
-        print(caslibs_result_json)
-        print('caslibs_result_json is a '+type(caslibs_result_json).__name__+' object') #caslibs_result_json is a dict object
-    caslibs=caslibs_result_json['items']
-
-    for caslib in caslibs:
-        caslibname=caslib['name']
-        #print(servername+','+caslibname)
-
-        # Get the tables in the caslib
-        endpoint='/casManagement/servers/'+servername+'/caslibs/'+caslibname+'/tables?excludeItemLinks=true&limit=10000'+namefilter
-        method='get'
-        #print('about to list tables')
-
-        tables_result_json=callrestapi(endpoint,method,stoponerror=False)
-
-        if debug:
-            print(tables_result_json)
-            print('tables_result_json is a '+type(tables_result_json).__name__+' object') #tables_result_json is a dict object
-        if tables_result_json is not None:
-            if tables_result_json['count']==0:
-                print(servername+','+caslibname+',[0 tables]')
-            if 'items' not in tables_result_json:
-                print(servername+','+caslibname+','+tables_result_json['message'])
+    for ai in unit['items']:
+        output=servername+','+caslibname+','+tablename
+        for col in identity_cols:
+            if col in ai:
+                output=output+','+ai[col]
+            else:
+                output=output+','
+        for col in permissions:
+            if col in ai:
+                output=output+','+ai[col]
             else:
-                tables=tables_result_json['items']
-                for table in tables:
-                    tablename=table['name']
-                    # We have the in-memory table name, but if the user requested it, try to use the source table name instead
-                    if sourcetables and 'tableReference' in table:
-                        if 'sourceTableName' in table['tableReference']:
-                            tablename=table['tableReference']['sourceTableName']
-
-                    # Get effective Access Controls on this table
-                    endpoint='/casAccessManagement/servers/'+servername+'/caslibs/'+caslibname+'/tableControls/'+tablename+'?accessControlType=effective'
-                    method='get'
-                    tableaccess_result_json=callrestapi(endpoint,method)
-
-                    #print(tableaccess_result_json)
-                    for ai in tableaccess_result_json['items']:
-                        output=servername+','+caslibname+','+tablename
-                        for col in identity_cols:
-                            if col in ai:
-                                output=output+','+ai[col]
-                            else:
-                                output=output+','
-                        for col in permissions:
-                            if col in ai:
-                                output=output+','+ai[col]
-                            else:
-                                output=output+','
-                        print(output)
-        else:
-            #tables_result_json is None
-            print(servername+','+caslibname+',[error getting tables]')
+                output=output+','
+        print(output)
+
+    # the table is recorded in the checkpoint once its rows are written
+    sys.stdout.flush()
+    scanner.complete(unit)
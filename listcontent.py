@@ -6,7 +6,11 @@
 #
 # Pass in a folder path and list content
 # Change History
-
+#
+# 18OCT2026 Added --workers to get the item paths concurrently
+# 18OCT2026 Item paths are built from the parentFolderUri of each item instead of a request per item
+# 18OCT2026 Added --foldertree to read the content from a saved folder tree
+# 18OCT2026 The item links are not requested unless the output style is json
 #
 # Copyright © 2018, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -27,7 +31,8 @@
 
 import argparse, sys
 
-from sharedfunctions import getfolderid, callrestapi, printresult, getfolderid, getidsanduris, getpath, json
+from sharedfunctions import getfolderid, callrestapi, printresult, getfolderid, getidsanduris, getpath, getpaths, getpathcache, json
+from foldertree import getfoldertree
 from datetime import datetime as dt, timedelta as td
 
 # get python version
@@ -37,7 +42,9 @@ version=int(str(sys.version_info[0]))
 parser = argparse.ArgumentParser(description="List folder and its sub-folders and content.")
 parser.add_argument("-f","--folderpath", help="Enter the path to the viya folder to start the listing.",required='True')
 parser.add_argument("-v","--verbosecsv", help="Verbose CSV(only used with -o=csv) ", action='store_true' )
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl'],default='json')
+parser.add_argument("-w","--workers", type=int, help="Number of concurrent requests to make",default=1)
+parser.add_argument("--foldertree", help="Read the folders and their content from this folder tree file, it is created or refreshed when it is missing or too old")
 parser.add_argument("--debug", action='store_true', help="Debug")
 
 args = parser.parse_args()
@@ -45,14 +52,30 @@ debug=args.debug
 path_to_folder=args.folderpath
 verbosecsv=args.verbosecsv
 output_style=args.output
+workers=args.workers
+foldertreefile=args.foldertree
 
 delimiter = ','
 
 if verbosecsv: cols=cols=["id","pathtoitem","name","type","contentType","description","typeDefName","documentType","contentDisposition","fileStatus","searchable","size","createdBy","creationTimeStamp","modifiedBy","modifiedTimeStamp","expirationTimeStamp","encoding","parentUri"]
 else: cols=["id","pathtoitem","name","contentType","createdBy","creationTimeStamp","modifiedBy","modifiedTimeStamp","uri"]
 
+# with a folder tree the content is read from the tree and no requests are made
+foldertree=None
+if foldertreefile is not None:
+    foldertree=getfoldertree(foldertreefile,includemembers=True,workers=workers)
+
 def getfoldercontent(path_to_folder):
 
+    if foldertree is not None:
+        if foldertree.getfolderid(path_to_folder) is None:
+            print("NOTE: Folder'"+path_to_folder+"' not found.")
+            return {'count':0,'items':[]}
+        itemlist=list(foldertree.itermembers(foldertree.getfolderid(path_to_folder)))
+        for item in itemlist:
+            item["pathanditemname"]=item["pathtoitem"]+item["name"]
+        return {'count':len(itemlist),'items':itemlist}
+
     # call getfolderid to get the folder id
     targets=getfolderid(path_to_folder)
 
@@ -65,6 +88,7 @@ def getfoldercontent(path_to_folder):
 
         #get folder content, recursive call returns all children
         reqval=uri+"/members?recursive=true&limit=100000"
+        if output_style!='json': reqval=reqval+"&excludeItemLinks=true"
         reqtype='get'
 
         if debug: print(reqval)
@@ -76,6 +100,11 @@ def getfoldercontent(path_to_folder):
         itemlist=folders_result_json['items']
         returned_items=len(itemlist)
 
+        # the recursive listing has the parent folder of every item, so the paths can be built from the path cache
+        # and only items it cannot place need a request, those requests are made concurrently
+        getpathcache().addmembers(itemlist,uri)
+        itempaths=getpaths([item["uri"] for item in itemlist],workers)
+
         for i in range(0,returned_items):
 
             if 'contentType' in itemlist[i]: contenttype=itemlist[i]["contentType"]
@@ -85,7 +114,7 @@ def getfoldercontent(path_to_folder):
             name=itemlist[i]["name"]
 
             parentFolderUri=itemlist[i]["parentFolderUri"]
-            path_to_item=getpath(itemuri)
+            path_to_item=itempaths[i]
 
             if path_to_item==None: path_to_item="No folder path."
             if debug: print(path_to_item,name,contenttype)
@@ -21,6 +21,8 @@
 # 27JAN2019 Comments added
 # 12SEP2019 Added the ability to specifiy a folder as an alternative to a URI
 # 15SEP2023 BUG need to quote modified by
+# 18OCT2026 Files are read in pages and printed as they arrive, json output is {"items": [...], "count": n}
+# 18OCT2026 Only the fields that are printed are requested and kept
 #
 # Copyright © 2018, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -33,7 +35,7 @@
 #
 
 import argparse , datetime, sys
-from sharedfunctions import callrestapi,printresult,getfolderid,getidsanduris,createdatefilter
+from sharedfunctions import callrestapi,printresult,getfolderid,getidsanduris,createdatefilter,iterpaged,printitems,getoutputfields
 from datetime import datetime as dt, timedelta as td
 
 # setup command-line arguements. In this block which is common to all the tools you setup what parameters
@@ -53,7 +55,7 @@ parser.add_argument("-m","--modifiedby", help="Last modified id equals",default=
 parser.add_argument("-s","--sortby", help="Sort the output by this field",default='modifiedTimeStamp')
 parser.add_argument("-so","--sortorder", help="Sort order",choices=['ascending','descending'],default='descending')
 parser.add_argument("-v","--verbosecsv", help="Verbose CSV(only used with -o=csv) ", action='store_false' )
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='json')
 parser.add_argument("--debug", action='store_true', help="Debug")
 
 args = parser.parse_args()
@@ -138,17 +140,18 @@ else:
 
 if debug: print(reqval)   
 
-files_result_json=callrestapi(reqval,reqtype)
 if verbosecsv:
    cols=['id','name','contentType','documentType','createdBy','modifiedTimeStamp','size','parentUri']
 else:
    cols=['id','name','contentType','description','typeDefName','documentType','contentDisposition','fileStatus','searchable','size','creationTimeStamp','createdBy','modifiedBy','modifiedTimeStamp','expirationTimeStamp','encoding','parentUri']
-# print result
+# print the files page by page as they arrive
 
-if files_result_json == None:
+pageinfo={}
+files=iterpaged(reqval,page_size=1000,limit=10000,pageinfo=pageinfo,fields=getoutputfields(output_style,cols),excludelinks=output_style!='json')
+printitems(files,output_style,cols)
+
+if pageinfo['pages']==0:
    print("WARNING: No files returned by query.")
-else:
-   printresult(files_result_json,output_style,cols)
  
    
  
@@ -6,9 +6,13 @@
 #
 # Change History:
 # 29APR2026 - Added filters for group/user and type of group/user
+# 18OCT2026 - Added --workers to fetch group members and user details concurrently
+# 18OCT2026 - The item links of groups and members are not requested
+# 18OCT2026 - User emails are fetched in batches with IdentityCache
+# 18OCT2026 - Added --effective to list the members of nested groups with their depth
 #
 # Usage:
-# listgroupsandmembers.py [--noheader] [-e] [-d]
+# listgroupsandmembers.py [--noheader] [-e] [--effective] [-d] [--workers WORKERS]
 #
 # Examples:
 #
@@ -25,6 +29,12 @@
 # 4. Return list of users in a and members that have been pushed by scim
 #       ./listgroupsandmembers.py --id SASAdministrators --type user --source scim
 #
+# 5. Return list of all groups and all their members, making 10 requests at a time
+#       ./listgroupsandmembers.py --workers 10
+#
+# 6. Return list of all groups and all their members, including the members of groups nested in them
+#       ./listgroupsandmembers.py --effective
+#
 # Copyright © 2020, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
 #  Licensed under the Apache License, Version 2.0 (the License);
@@ -44,7 +54,9 @@
 from __future__ import unicode_literals
 import argparse
 import sys
-from sharedfunctions import callrestapi
+from sharedfunctions import callrestapi, callrestapi_many, RestCallResult
+from identitycache import IdentityCache
+from groupgraph import GroupGraph
 
 # Define exception handler so that we only output trace info from errors when in debug mode
 def exception_handler(exception_type, exception, traceback, debug_hook=sys.excepthook):
@@ -62,12 +74,16 @@ parser.add_argument("--type", help="Subset based on type containing a string",ch
 parser.add_argument("--source", help="Subset based on providerId containing a string",choices=['local','scim','ldap'],default=None )
 parser.add_argument("--noheader", action='store_true', help="Do not print the header row")
 parser.add_argument("-e","--email", action='store_true', help="Show email addresses for users")
+parser.add_argument("--effective", action='store_true', help="Include the members of nested groups and the depth they are nested at")
+parser.add_argument("-w","--workers", type=int, help="Number of concurrent requests to make",default=1)
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 
 args = parser.parse_args()
 noheader=args.noheader
 debug=args.debug
 show_email=args.email
+effective=args.effective
+workers=args.workers
 idval=args.id
 nameval=args.name
 mtype=args.type
@@ -96,13 +112,13 @@ else:
 
 # Print header row unless noheader argument was specified
 if not noheader:
-    if show_email:
-        print('groupid,groupname,grouptype,groupproviderid,memberid,membername,membertype,memberproviderid,email')
-    else:
-        print('groupid,groupname,grouptype,groupproviderid,memberid,membername,membertype,memberproviderid')
+    header='groupid,groupname,grouptype,groupproviderid,memberid,membername,membertype,memberproviderid'
+    if show_email: header=header+',email'
+    if effective: header=header+',depth'
+    print(header)
 
 
-endpoint='/identities/groups?limit=10000&filter='+completefilter
+endpoint='/identities/groups?excludeItemLinks=true&limit=10000&filter='+completefilter
 method='get'
 
 if debug: print(endpoint)
@@ -116,56 +132,92 @@ if debug:
 
 groups = groupslist_result_json['items']
 
-for group in groups:
-    groupid=group['id']
-    groupname=group['name']
-    grouptype=group['type']
-    groupproviderid=group['providerId']
+# Skip groups with empty id (this has been seen at least once at a customer site), because we cannot fetch their members.
+groups = [group for group in groups if group['id']!=""]
 
-    if groupid!="": # Skip groups with empty id (this has been seen at least once at a customer site), because we cannot fetch their members.
+if effective:
 
-        # List the members of this group and apply filter if set
-        endpoint='/identities/groups/'+groupid+'/members?limit=10000'+groupfilter
-        method='get'
-        members_result_json=callrestapi(endpoint,method)
-        if debug:
-            print(members_result_json)
-            print('members_result_json is a '+type(members_result_json).__name__+' object') #members_result_json is a dict object
+    # the whole membership graph is loaded once and the nested members of every group are worked out from it
+    graph=GroupGraph().load(workers)
+
+    for cycle in graph.cycles:
+        sys.stderr.write("WARNING: groups "+', '.join(cycle)+" are members of each other\n")
+
+    memberresults=[]
+    for group in groups:
+        members=[member for member in graph.getmembers(group['id'])
+                 if (mtype is None or member.get('type')==mtype) and (gtype is None or member.get('providerId')==gtype)]
+        memberresults.append(RestCallResult(None,{'items':members},200,None,graph.errors.get(group['id'])))
+
+else:
 
-        members=members_result_json['items']
+    # List the members of each group and apply filter if set, the requests are made concurrently
+    memberrequests=[{'reqval':'/identities/groups/'+group['id']+'/members?excludeItemLinks=true&limit=10000'+groupfilter,'reqtype':'get'} for group in groups]
+    memberresults=callrestapi_many(memberrequests,workers)
+
+# get the details of each user once, even if they are a member of many groups
+user_emails={}
+if show_email:
+    userids=[]
+    for memberresult in memberresults:
+        if memberresult.error is None:
+            for member in memberresult.result['items']:
+                if member['type']=='user' and member['id'] not in user_emails:
+                    user_emails[member['id']]=''
+                    userids.append(member['id'])
+
+    # the users are fetched in batches with in(id,...) filters
+    users=IdentityCache(workers=workers).getusers(userids)
+
+    for memberid in userids:
+        user_details_json=users[memberid]
+        if debug:
+            print(user_details_json)
+            print('user_details_json is a '+type(user_details_json).__name__+' object') #user_details_json is a dict object
 
-        for member in members:
-            memberid=member['id']
-            membername=member['name']
-            membertype=member['type']
-            memberproviderid=member['providerId']
+        if isinstance(user_details_json,dict) and 'emailAddresses' in user_details_json:
             user_email_string=''
-            output=groupid+','+groupname+','+grouptype+','+groupproviderid+','+memberid+',"'+membername+'",'+membertype+','+memberproviderid
 
-            if show_email:
-                output=output+','
+            for email in user_details_json['emailAddresses']:
+                email_address=email['value']
+                if user_email_string!='':
+                    user_email_string=user_email_string+';'
+                user_email_string=user_email_string+email_address
+
+            user_emails[memberid]=user_email_string
+
+for group,memberresult in zip(groups,memberresults):
+    groupid=group['id']
+    groupname=group['name']
+    grouptype=group['type']
+    groupproviderid=group['providerId']
+
+    members_result_json=memberresult.result
+    if debug:
+        print(members_result_json)
+        print('members_result_json is a '+type(members_result_json).__name__+' object') #members_result_json is a dict object
+
+    if memberresult.error is not None:
+        print("ERROR: cannot get members of group "+groupid+": "+memberresult.error)
+        continue
 
+    members=members_result_json['items']
 
-            if membertype=='user' and show_email:
+    for member in members:
+        memberid=member['id']
+        membername=member['name']
+        membertype=member['type']
+        memberproviderid=member['providerId']
+        output=groupid+','+groupname+','+grouptype+','+groupproviderid+','+memberid+',"'+membername+'",'+membertype+','+memberproviderid
 
-                # List the members of this group
-                endpoint='/identities/users/'+memberid+'?limit=10000'
-                method='get'
-                user_details_json=callrestapi(endpoint,method)
-                if debug:
-                    print(user_details_json)
-                    print('user_details_json is a '+type(user_details_json).__name__+' object') #user_details_json is a dict object
+        if show_email:
+            output=output+','
 
-                if 'emailAddresses' in user_details_json:
-                    user_emails=user_details_json['emailAddresses']
-                    user_email_string=''
+        if membertype=='user' and show_email:
+            output=output+user_emails.get(memberid,'')
 
-                    for email in user_emails:
-                        email_address=email['value']
-                        if user_email_string!='':
-                            user_email_string=user_email_string+';'
-                        user_email_string=user_email_string+email_address
+        if effective:
+            output=output+','+str(member['depth'])
 
-                    output=output+user_email_string
+        print(output)
 
-            print(output)
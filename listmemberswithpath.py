@@ -5,7 +5,7 @@
 # January 2019
 #
 # Usage:
-# listmemberswithpath.py -u objectURI [-r] [-d]
+# listmemberswithpath.py -u objectURI [-r] [--foldertree FILE] [-d]
 #
 # Examples:
 #
@@ -18,6 +18,8 @@
 # Change History
 #
 # 09MAR2022 Python3 compatibility fix
+# 18OCT2026 Paths are built from the parent folder of each member, added --foldertree
+# 18OCT2026 The item links of the members are not requested
 #
 #
 # Copyright © 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
@@ -39,7 +41,8 @@
 from __future__ import unicode_literals
 import argparse
 import sys
-from sharedfunctions import callrestapi,getpath
+from sharedfunctions import callrestapi,getpath,getpathcache
+from foldertree import getfoldertree,getidfromuri
 
 debug=False
 
@@ -55,10 +58,12 @@ sys.excepthook = exception_handler
 parser = argparse.ArgumentParser()
 parser.add_argument("-u","--objecturi", help="Object URI of folder or other object that can be contained within a folder.", required=True)
 parser.add_argument("-r","--recursive", action='store_true', help="Debug")
+parser.add_argument("--foldertree", help="Read the members from this folder tree file, it is created or refreshed when it is missing or too old")
 parser.add_argument("-d","--debug", action='store_true', help="Debug")
 args = parser.parse_args()
 objecturi=args.objecturi
 recursive=args.recursive
+foldertreefile=args.foldertree
 debug=args.debug
 
 #We expect a URI, but if the objectURI does not begin with a /, assume it is a folder id. This may be nonsense, but it's much more likely to just fail than return data for the wrong object.
@@ -73,19 +78,34 @@ if not objecturi.startswith("/folders/folders/"):
 #See Folders API documentation in swagger at http://swagger.na.sas.com/apis/folders/v1/apidoc.html#op:getAncestors
 endpoint=objecturi+'/members'
 if recursive:
-    endpoint=endpoint+'?recursive=true&limit=10000'
+    endpoint=endpoint+'?recursive=true&excludeItemLinks=true&limit=10000'
 else:
-    endpoint=endpoint+'?limit=10000'
+    endpoint=endpoint+'?excludeItemLinks=true&limit=10000'
 method='get'
 
-#make the rest call
-members_result_json=callrestapi(endpoint,method)
+if foldertreefile is not None:
 
-if debug:
-    print(members_result_json)
-    #print('members_result_json is a '+type(members_result_json).__name__+' object') #members_result_json is a dict object
+    # read the members from the folder tree, no requests are made when the tree file is current
+    foldertree=getfoldertree(foldertreefile,includemembers=True)
+    foldertree.primepathcache()
+    if recursive:
+        members=list(foldertree.itermembers(objecturi))
+    else:
+        members=foldertree.members.get(getidfromuri(objecturi),[])
+
+else:
+
+    #make the rest call
+    members_result_json=callrestapi(endpoint,method)
+
+    if debug:
+        print(members_result_json)
+        #print('members_result_json is a '+type(members_result_json).__name__+' object') #members_result_json is a dict object
+
+    members = members_result_json['items']
 
-members = members_result_json['items']
+    # the members have their parent folder, so getpath only needs a request for folders it has not seen
+    getpathcache().addmembers(members,objecturi)
 
 for member in members:
     outstr=''
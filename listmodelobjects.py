@@ -28,7 +28,7 @@ parser.add_argument("-c","--type", help="Content Type (model, project or reposit
 parser.add_argument("-d","--days", help="List files older than this number of days",default='-1')
 parser.add_argument("-m","--modifiedby", help="Last modified id equals",default=None)
 parser.add_argument("-s","--sortby", help="Sort the output descending by this field",default='name')
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple'],default='csv')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','jsonl','parquet','arrow'],default='csv')
 parser.add_argument("--debug", action='store_true', help="Debug")
 
 
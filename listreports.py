@@ -38,7 +38,7 @@ parser.add_argument("-n","--name", help="Name contains?",default=None)
 parser.add_argument("-f","--folderpath", help="Folder Path starts with?",default="/")
 parser.add_argument("-c","--changeddays", help="Reports changed in the how many days (defaults to 15 years)?",default='5475')
 parser.add_argument("-m","--modifiedby", help="Last modified id equals?",default=None)
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple'],default='csv')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','jsonl','parquet','arrow'],default='csv')
 
 args= parser.parse_args()
 nameval=args.name
@@ -34,7 +34,7 @@ parser.add_argument("-d","--days", help="List files older than this number of da
 parser.add_argument("-do","--olderoryounger", help="For the date subsetting specify older or younger",choices=['older','younger'],default='older')
 parser.add_argument("-s","--sortby", help="Sort the output descending by this field",default='modifiedTimeStamp')
 parser.add_argument("-so","--sortorder", help="Sort order",choices=['ascending','descending'],default='descending')
-parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson'],default='json')
+parser.add_argument("-o","--output", help="Output Style", choices=['csv','json','simple','simplejson','jsonl','parquet','arrow'],default='json')
 parser.add_argument("--debug", action='store_true', help="Debug")
 
 args = parser.parse_args()
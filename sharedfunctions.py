@@ -44,6 +44,22 @@
 #  18JUL2025 if the clilocation path contains a tilde expand it
 #  02APR2026 Modified connection tests to account for removal of SASDrive
 #  10JUN2026 Add callpagedrestapi function
+#  18OCT2026 Added ViyaClient so all REST calls share one pooled keep-alive session per process
+#  18OCT2026 Added TokenManager, the token is cached in memory and refreshed on expiry or a 401 response
+#  18OCT2026 Added CLIProfile, config.json and credentials.json are only parsed again when they change
+#  18OCT2026 Added callrestapi_many to make a batch of requests concurrently
+#  18OCT2026 Added iterpaged generator to stream the items of paged collections
+#  18OCT2026 Added prefetch to iterpaged to request offset pages concurrently
+#  18OCT2026 Added RetryPolicy, the ViyaClient retries transient errors with backoff
+#  18OCT2026 Added AdaptiveLimiter and RateLimiter to control the load put on the server by concurrent requests
+#  18OCT2026 Added RequestProfiler, PYVIYA_PROFILE=1 or --profile prints request timings per endpoint at exit
+#  18OCT2026 Added ResponseCache, an opt-in on-disk cache of GET responses revalidated with If-None-Match
+#  18OCT2026 Added PathCache, getpath and getfolderid only call the server for folders they have not seen
+#  18OCT2026 Added ResultWriter and printitems, csv and simple output is buffered and can be streamed from iterpaged
+#  18OCT2026 Added the jsonl, parquet and arrow output styles
+#  18OCT2026 Added jsonloads, jsondumps and jsonbody, json is encoded and decoded with orjson when it is installed
+#  18OCT2026 Added fields, excludelinks and acceptItem to iterpaged to keep only the fields a tool uses
+#  18OCT2026 Added waitforjob to wait for server-side jobs with long polls and capped backoff
 #
 # Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -73,11 +89,990 @@ import inspect
 import re
 import platform
 import subprocess
+import threading
+import concurrent.futures
+import time
+import base64
+import calendar
+import random
+import email.utils
+import atexit
+import csv
+import io
+import hashlib
 from datetime import datetime as dt, timedelta as td
-from requests.exceptions import SSLError, RequestException
+from requests.exceptions import SSLError, RequestException, ConnectionError as RequestsConnectionError, ConnectTimeout, Timeout
 
 pp = pprint.PrettyPrinter(indent=4)
 
+# use orjson for json when it is installed, set PYVIYA_JSON_CODEC=json to use the json module
+try:
+    if os.environ.get('PYVIYA_JSON_CODEC','orjson').lower()=='json': raise ImportError
+    import orjson
+except ImportError:
+    orjson=None
+
+
+# jsonloads
+# decode json from the bytes or text of a response, raises ValueError when it is not json
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 json the json module accepts and orjson does not is decoded with the json module
+
+def jsonloads(content):
+
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson does not decode some json the json module does, e.g. integers of more than 64 bits or NaN
+            pass
+
+    return json.loads(content)
+
+
+# jsondumps
+# encode an object as json text, indent=2 gives the same layout as json.dumps with indent=2
+# orjson leaves non-ascii characters as they are rather than escaping them
+# change history
+#   18OCT2026 initial development
+
+def jsondumps(obj,indent=None):
+
+    if orjson is not None:
+        try:
+            if indent: return orjson.dumps(obj,option=orjson.OPT_INDENT_2).decode('utf-8')
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # orjson does not encode some objects json does, e.g. integers of more than 64 bits
+            pass
+
+    if indent: return json.dumps(obj,indent=indent)
+    return json.dumps(obj)
+
+
+# jsonbody
+# encode the data of a request as json bytes, non-ascii characters are utf-8 with orjson and escaped with json
+# change history
+#   18OCT2026 initial development
+
+def jsonbody(data):
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            pass
+
+    # if we don't do this any request with foreign characters fails
+    return json.dumps(data, ensure_ascii=True).encode('ascii')
+
+# getpyviyasetting
+# return a tuning setting for the tools, an environment variable takes precedence over
+# a value in application.properties, if neither is set the default is returned
+# change history
+#   18OCT2026 initial development
+
+_applicationproperties=None
+
+def getpyviyasetting(envname,propname,default=None):
+
+    global _applicationproperties
+
+    value=os.environ.get(envname)
+
+    if value is None or value=='':
+
+        # read application.properties once per process
+        if _applicationproperties is None:
+            try:
+                _applicationproperties=getapplicationproperties()
+            except (IOError, OSError, ValueError):
+                _applicationproperties={}
+
+        value=_applicationproperties.get(propname)
+
+    if value is None or value=='':
+        value=default
+
+    return value
+
+
+# RetryPolicy
+# decides when the ViyaClient retries a request that failed with a transient error and how long it waits
+# responses with a status in retry_statuses (default 429,502,503,504) and connection errors are retried
+# only methods in retry_methods are retried (default the idempotent GET,HEAD,PUT,DELETE,OPTIONS), a connect
+# timeout is retried for any method because the request was never sent
+# the wait is exponential backoff with full jitter, a Retry-After header from the server is used instead when present
+# budget is the total number of retries allowed for the process, so a service that is down does not
+# multiply the run time of a bulk tool by the number of retries
+# change history
+#   18OCT2026 initial development
+
+class RetryPolicy(object):
+
+    def __init__(self,max_retries=None,backoff=None,max_backoff=None,retry_statuses=None,retry_methods=None,budget=None):
+
+        if max_retries is None:
+            max_retries=int(getpyviyasetting('PYVIYA_RETRIES','pyviya.retry.max',3))
+        if backoff is None:
+            backoff=float(getpyviyasetting('PYVIYA_RETRY_BACKOFF','pyviya.retry.backoff',0.5))
+        if max_backoff is None:
+            max_backoff=float(getpyviyasetting('PYVIYA_RETRY_MAX_BACKOFF','pyviya.retry.maxbackoff',30))
+        if retry_statuses is None:
+            retry_statuses=getpyviyasetting('PYVIYA_RETRY_STATUSES','pyviya.retry.statuses','429,502,503,504')
+        if retry_methods is None:
+            retry_methods=getpyviyasetting('PYVIYA_RETRY_METHODS','pyviya.retry.methods','GET,HEAD,PUT,DELETE,OPTIONS')
+        if budget is None:
+            budget=int(getpyviyasetting('PYVIYA_RETRY_BUDGET','pyviya.retry.budget',100))
+
+        if not isinstance(retry_statuses,(list,tuple,set)): retry_statuses=[value for value in str(retry_statuses).split(',') if value.strip()]
+        if not isinstance(retry_methods,(list,tuple,set)): retry_methods=[value for value in str(retry_methods).split(',') if value.strip()]
+
+        self.max_retries=max_retries
+        self.backoff=backoff
+        self.max_backoff=max_backoff
+        self.retry_statuses=set(int(status) for status in retry_statuses)
+        self.retry_methods=set(method.strip().upper() for method in retry_methods)
+        self.budget=budget
+        self.lock=threading.Lock()
+
+    # True if the request can be retried, a retry is taken from the budget
+    def canretry(self,method,attempt,status_code=None,exception=None):
+
+        if attempt>=self.max_retries:
+            return False
+
+        if exception is not None:
+            retryable=isinstance(exception,ConnectTimeout) or (method.upper() in self.retry_methods and isinstance(exception,(RequestsConnectionError,Timeout)))
+        else:
+            retryable=method.upper() in self.retry_methods and status_code in self.retry_statuses
+
+        if not retryable:
+            return False
+
+        with self.lock:
+            if self.budget<=0:
+                return False
+            self.budget=self.budget-1
+
+        return True
+
+    # seconds to wait before the next attempt
+    def getdelay(self,attempt,response=None):
+
+        if response is not None:
+            retryafter=getretryafter(response.headers.get('Retry-After'))
+            if retryafter is not None:
+                return retryafter
+
+        return random.uniform(0,min(self.max_backoff,self.backoff*(2**attempt)))
+
+
+# getretryafter
+# return the seconds to wait from a Retry-After header, which is either seconds or an HTTP date
+# change history
+#   18OCT2026 initial development
+
+def getretryafter(value):
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0,float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0,email.utils.mktime_tz(email.utils.parsedate_tz(value))-time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+# waitforjob
+# wait for a job, session or other server side task to finish, poll returns its current state and finished
+# tells whether a state is final. Returns the last state and None, or the last state and a message when the
+# state could not be read (poll returned None), timeout seconds passed or the cancel event was set.
+# poll should pass nocache=True to callrestapi so the state is not answered from the response cache, and use
+# the long-poll wait parameter of the endpoint when it has one, e.g. state?wait=10, the server
+# then holds the request until the state changes and no wait is added. When the server answers at once the wait
+# between polls starts at minwait and doubles up to maxwait, so a long job is polled every few seconds.
+# timeout defaults to PYVIYA_JOB_TIMEOUT or pyviya.job.timeout in application.properties, 0 waits for ever
+# maxwait defaults to PYVIYA_JOB_MAXWAIT or pyviya.job.maxwait, 5 seconds
+# change history
+#   18OCT2026 initial development
+
+def waitforjob(poll,finished,timeout=None,minwait=0.1,maxwait=None,cancel=None):
+
+    if timeout is None:
+        timeout=float(getpyviyasetting('PYVIYA_JOB_TIMEOUT','pyviya.job.timeout',0))
+    if maxwait is None:
+        maxwait=float(getpyviyasetting('PYVIYA_JOB_MAXWAIT','pyviya.job.maxwait',5))
+    if cancel is None:
+        cancel=threading.Event()
+
+    starttime=time.time()
+    wait=minwait
+
+    while True:
+
+        pollstart=time.time()
+        state=poll()
+
+        if state is None:
+            return None,"cannot read the state"
+        if finished(state):
+            return state,None
+
+        now=time.time()
+        if timeout>0 and now-starttime>=timeout:
+            return state,"did not finish in "+str(timeout)+" seconds"
+        if cancel.is_set():
+            return state,"the wait was cancelled"
+
+        # the time a long poll was held by the server counts towards the wait
+        delay=wait-(now-pollstart)
+        if timeout>0:
+            delay=min(delay,starttime+timeout-now)
+        if delay>0 and cancel.wait(delay):
+            return state,"the wait was cancelled"
+
+        wait=min(wait*2,maxwait)
+
+
+# RateLimiter
+# spaces out requests so no more than rate requests per second are started, a rate of 0 is no limit
+# change history
+#   18OCT2026 initial development
+
+class RateLimiter(object):
+
+    def __init__(self,rate):
+
+        self.rate=float(rate)
+        self.nextstart=time.time()
+        self.lock=threading.Lock()
+
+    # wait until the next request may be started
+    def wait(self):
+
+        if self.rate<=0:
+            return
+
+        with self.lock:
+            now=time.time()
+            start=max(now,self.nextstart)
+            self.nextstart=start+1.0/self.rate
+
+        if start>now:
+            time.sleep(start-now)
+
+
+# AdaptiveLimiter
+# limits the number of requests in flight for the concurrent request functions and adjusts the limit
+# in AIMD style: each request that succeeds without a slow response adds 1/limit to the limit, so the limit
+# grows by about one each time a full window of requests completes. An error (429, 502, 503, 504 or a failed
+# connection) or a latency well above the lowest seen halves the limit, at most once per round trip.
+# max_limit is a hard cap, PYVIYA_MAX_CONCURRENCY or pyviya.concurrency.max in application.properties
+# change history
+#   18OCT2026 initial development
+
+class AdaptiveLimiter(object):
+
+    congestion_statuses=set([429,502,503,504])
+
+    def __init__(self,max_limit=None,initial_limit=None,min_limit=1,latency_factor=None):
+
+        if max_limit is None:
+            max_limit=int(getpyviyasetting('PYVIYA_MAX_CONCURRENCY','pyviya.concurrency.max',32))
+        if initial_limit is None:
+            initial_limit=int(getpyviyasetting('PYVIYA_INITIAL_CONCURRENCY','pyviya.concurrency.initial',4))
+        if latency_factor is None:
+            latency_factor=float(getpyviyasetting('PYVIYA_LATENCY_FACTOR','pyviya.concurrency.latencyfactor',3))
+
+        self.max_limit=max(1,max_limit)
+        self.min_limit=max(1,min(min_limit,self.max_limit))
+        self.limit=float(max(self.min_limit,min(initial_limit,self.max_limit)))
+        self.latency_factor=latency_factor
+
+        self.inflight=0
+        self.avglatency=None
+        self.minlatency=None
+        self.lastdecrease=0
+        self.condition=threading.Condition()
+
+    # wait for a free slot
+    def acquire(self):
+
+        with self.condition:
+            while self.inflight>=int(self.limit):
+                self.condition.wait()
+            self.inflight=self.inflight+1
+
+    # free the slot and adjust the limit from the outcome of the request
+    def release(self,latency,status_code=None,failed=False):
+
+        with self.condition:
+
+            self.inflight=self.inflight-1
+
+            if self.avglatency is None:
+                self.avglatency=latency
+            else:
+                self.avglatency=0.8*self.avglatency+0.2*latency
+
+            if self.minlatency is None or self.avglatency<self.minlatency:
+                self.minlatency=self.avglatency
+
+            congested=failed or status_code in self.congestion_statuses or self.avglatency>self.minlatency*self.latency_factor
+
+            if congested:
+                # decrease only once per round trip, the requests already in flight saw the same congestion
+                now=time.time()
+                if now-self.lastdecrease>self.avglatency:
+                    self.limit=max(float(self.min_limit),self.limit/2)
+                    self.lastdecrease=now
+            else:
+                self.limit=min(float(self.max_limit),self.limit+1.0/self.limit)
+
+            self.condition.notify_all()
+
+
+# getconcurrencylimiter
+# return the AdaptiveLimiter shared by the concurrent request functions of this process
+# change history
+#   18OCT2026 initial development
+
+_concurrencylimiter=None
+_concurrencylimiter_lock=threading.Lock()
+
+def getconcurrencylimiter():
+
+    global _concurrencylimiter
+
+    with _concurrencylimiter_lock:
+        if _concurrencylimiter is None:
+            _concurrencylimiter=AdaptiveLimiter()
+
+    return _concurrencylimiter
+
+
+# RequestProfiler
+# records the timing of every request when profiling is switched on with PYVIYA_PROFILE=1 or the --profile flag
+# on any tool. For each request it records the method, the endpoint with ids collapsed, the status, the bytes
+# returned and the connect (including DNS), TLS, time to first byte and total times. The time spent getting the
+# auth token and decoding json is also recorded. A summary is printed to stderr when the tool exits.
+# Set PYVIYA_PROFILE_TRACE or pass --profile-trace FILE to also write every request as a json line to a file.
+# change history
+#   18OCT2026 initial development
+
+class RequestProfiler(object):
+
+    def __init__(self,tracefile=None):
+
+        self.lock=threading.Lock()
+        self.local=threading.local()
+        self.starttime=time.time()
+        self.endpoints={}
+        self.timings={'auth':0.0,'network':0.0,'decode':0.0}
+        self.trace=None
+
+        if tracefile:
+            self.trace=open(tracefile,'a')
+
+    # connection timings are collected per thread while a request is made
+    def startrequest(self):
+
+        self.local.connect=0.0
+        self.local.tls=0.0
+
+    def addconnect(self,connect,tls):
+
+        self.local.connect=getattr(self.local,'connect',0.0)+connect
+        self.local.tls=getattr(self.local,'tls',0.0)+tls
+
+    def addtime(self,category,seconds):
+
+        with self.lock:
+            self.timings[category]=self.timings[category]+seconds
+
+    def record(self,method,url,status_code,nbytes,ttfb,total):
+
+        endpoint=getendpointtemplate(url)
+        connect=getattr(self.local,'connect',0.0)
+        tls=getattr(self.local,'tls',0.0)
+
+        with self.lock:
+
+            self.timings['network']=self.timings['network']+total
+
+            stats=self.endpoints.setdefault((method,endpoint),{'calls':0,'errors':0,'bytes':0,'times':[]})
+            stats['calls']=stats['calls']+1
+            stats['bytes']=stats['bytes']+nbytes
+            stats['times'].append(total)
+            if status_code is None or status_code>=400: stats['errors']=stats['errors']+1
+
+            if self.trace is not None:
+                self.trace.write(json.dumps({'time':time.time(),'method':method,'endpoint':endpoint,'url':url,'status':status_code,
+                    'bytes':nbytes,'connect':connect,'tls':tls,'ttfb':ttfb,'total':total})+'\n')
+
+    # print the summary, the slowest endpoints by total time first
+    def printsummary(self,out=None):
+
+        if out is None: out=sys.stderr
+
+        with self.lock:
+
+            calls=sum(stats['calls'] for stats in self.endpoints.values())
+            print("",file=out)
+            print("Profile: %d requests in %.2f seconds" % (calls,time.time()-self.starttime),file=out)
+            print("%-7s %-60s %7s %6s %9s %9s %9s %10s %12s" % ('method','endpoint','calls','errors','p50 ms','p95 ms','p99 ms','total s','bytes'),file=out)
+
+            for (method,endpoint),stats in sorted(self.endpoints.items(),key=lambda entry: -sum(entry[1]['times'])):
+                times=sorted(stats['times'])
+                print("%-7s %-60s %7d %6d %9.1f %9.1f %9.1f %10.2f %12d" % (method,endpoint,stats['calls'],stats['errors'],
+                    percentile(times,50)*1000,percentile(times,95)*1000,percentile(times,99)*1000,sum(times),stats['bytes']),file=out)
+
+            print("Time in auth: %.2f s, network: %.2f s, json decoding: %.2f s" % (self.timings['auth'],self.timings['network'],self.timings['decode']),file=out)
+
+            if self.trace is not None:
+                self.trace.close()
+                self.trace=None
+
+
+# percentile
+# return the p percentile of a sorted list of numbers, 0 for an empty list
+# change history
+#   18OCT2026 initial development
+
+def percentile(sortedvalues,p):
+
+    if not sortedvalues:
+        return 0.0
+
+    index=int(round((p/100.0)*(len(sortedvalues)-1)))
+
+    return sortedvalues[index]
+
+
+# getendpointtemplate
+# return the path of a url with the ids collapsed so requests to the same endpoint are grouped together
+# e.g. https://host/folders/folders/0b2a...e1/members?limit=10 becomes /folders/folders/{id}/members
+# change history
+#   18OCT2026 initial development
+
+_idpattern=re.compile(r'^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,}|[0-9]+)$')
+_namedcollections=set(['users','groups','servers','caslibs','tables','caslibControls','tableControls','sessions','jobs','contexts','definitions','jobRequests','packages','files','reports'])
+
+def getendpointtemplate(url):
+
+    path=re.sub(r'^[a-zA-Z]+://[^/]*','',url).split('?')[0]
+    segments=path.split('/')
+
+    for i in range(len(segments)):
+        if _idpattern.match(segments[i]) or (i>1 and segments[i-1] in _namedcollections and not segments[i].startswith('@')):
+            segments[i]='{id}'
+
+    return '/'.join(segments)
+
+
+# getcommandlineflag
+# return True if flag is on the command line and remove it, used for flags that every tool accepts such as
+# --profile and --no-cache, which are handled here rather than by the argparse of each tool
+# change history
+#   18OCT2026 initial development
+
+def getcommandlineflag(flag):
+
+    if flag in sys.argv:
+        sys.argv.remove(flag)
+        return True
+
+    return False
+
+
+# getprofiler
+# return the RequestProfiler if profiling is on, otherwise None
+# profiling is switched on by PYVIYA_PROFILE or by --profile on the command line of any tool, the flag is removed
+# from the arguments before the tool parses them
+# change history
+#   18OCT2026 initial development
+
+_profiler=None
+
+def getprofiler():
+
+    return _profiler
+
+def _startprofiler():
+
+    global _profiler
+
+    profile=os.environ.get('PYVIYA_PROFILE','').lower() in ('true', '1', 't')
+    tracefile=os.environ.get('PYVIYA_PROFILE_TRACE')
+
+    if getcommandlineflag('--profile'):
+        profile=True
+
+    if '--profile-trace' in sys.argv:
+        i=sys.argv.index('--profile-trace')
+        if i+1<len(sys.argv):
+            tracefile=sys.argv[i+1]
+            del sys.argv[i:i+2]
+        else:
+            del sys.argv[i]
+
+    if tracefile:
+        profile=True
+
+    if profile:
+        _profiler=RequestProfiler(tracefile)
+        atexit.register(_profiler.printsummary)
+
+_startprofiler()
+
+
+# _timedadapter
+# return an HTTPAdapter whose connections report their connect and TLS handshake times to the profiler
+# urllib3 resolves the host name and connects in one call, so DNS time is part of the connect time
+# change history
+#   18OCT2026 initial development
+
+def _timedadapter(pool_connections,pool_maxsize):
+
+    from requests.packages.urllib3.connection import HTTPConnection, HTTPSConnection
+    from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+
+        def _new_conn(self):
+            starttime=time.time()
+            conn=HTTPConnection._new_conn(self)
+            self._connecttime=time.time()-starttime
+            return conn
+
+        def connect(self):
+            self._connecttime=0.0
+            HTTPConnection.connect(self)
+            _profiler.addconnect(self._connecttime,0.0)
+
+    class TimedHTTPSConnection(HTTPSConnection):
+
+        def _new_conn(self):
+            starttime=time.time()
+            conn=HTTPSConnection._new_conn(self)
+            self._connecttime=time.time()-starttime
+            return conn
+
+        def connect(self):
+            self._connecttime=0.0
+            starttime=time.time()
+            HTTPSConnection.connect(self)
+            total=time.time()-starttime
+            _profiler.addconnect(self._connecttime,max(0.0,total-self._connecttime))
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls=TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls=TimedHTTPSConnection
+
+    adapter=requests.adapters.HTTPAdapter(pool_connections=pool_connections,pool_maxsize=pool_maxsize)
+    adapter.poolmanager.pool_classes_by_scheme={'http':TimedHTTPConnectionPool,'https':TimedHTTPSConnectionPool}
+
+    return adapter
+
+
+# ViyaClient
+# holds the requests.Session used for every REST call made by the tools. The session keeps
+# connections to the Viya ingress alive, so bulk tools do one TLS handshake per pooled
+# connection rather than one per request.
+# The pool sizes can be set with the environment variables PYVIYA_POOL_CONNECTIONS and PYVIYA_POOL_MAXSIZE
+# or with pyviya.pool.connections and pyviya.pool.maxsize in application.properties
+# transient errors are retried as set out by the RetryPolicy
+# no more than PYVIYA_MAX_RPS or pyviya.maxrps requests are started per second, the default 0 is no limit
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 retry transient errors
+#   18OCT2026 requests per second ceiling
+
+class ViyaClient(object):
+
+    def __init__(self,pool_connections=None,pool_maxsize=None,retrypolicy=None):
+
+        if pool_connections is None:
+            pool_connections=int(getpyviyasetting('PYVIYA_POOL_CONNECTIONS','pyviya.pool.connections',4))
+        if pool_maxsize is None:
+            pool_maxsize=int(getpyviyasetting('PYVIYA_POOL_MAXSIZE','pyviya.pool.maxsize',32))
+
+        self.pool_connections=pool_connections
+        self.pool_maxsize=pool_maxsize
+
+        # PYVIYAINSECURE is read once by the CLIProfile
+        if getcliprofile().insecure:
+            requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+            self.verify_ssl=False
+        else:
+            self.verify_ssl=True
+
+        self.session=requests.Session()
+
+        # one adapter for both schemes, pool_connections is the number of hosts kept
+        # and pool_maxsize the number of connections kept open per host
+        if getprofiler() is not None:
+            adapter=_timedadapter(pool_connections,pool_maxsize)
+        else:
+            adapter=requests.adapters.HTTPAdapter(pool_connections=pool_connections,pool_maxsize=pool_maxsize)
+        self.session.mount('https://',adapter)
+        self.session.mount('http://',adapter)
+
+        if retrypolicy is None:
+            retrypolicy=RetryPolicy()
+        self.retrypolicy=retrypolicy
+
+        self.ratelimiter=RateLimiter(float(getpyviyasetting('PYVIYA_MAX_RPS','pyviya.maxrps',0)))
+
+    # make a request on the pooled session, ssl verification follows PYVIYA_INSECURE unless passed in
+    # transient errors are retried after a wait when the retry policy allows it
+    def request(self,method,url,**kwargs):
+
+        kwargs.setdefault('verify',self.verify_ssl)
+        method=method.upper()
+        attempt=0
+
+        while True:
+
+            self.ratelimiter.wait()
+
+            profiler=getprofiler()
+            if profiler is not None:
+                profiler.startrequest()
+                starttime=time.time()
+
+            try:
+                ret=self.session.request(method,url,**kwargs)
+            except (RequestsConnectionError, Timeout) as e:
+                if profiler is not None:
+                    profiler.record(method,url,None,0,0.0,time.time()-starttime)
+                if isinstance(e,SSLError) or not self.retrypolicy.canretry(method,attempt,exception=e):
+                    raise
+                time.sleep(self.retrypolicy.getdelay(attempt))
+            else:
+                if profiler is not None:
+                    # reading content here means the total includes downloading the body, a streamed body is left for the caller
+                    if kwargs.get('stream'): size=int(ret.headers.get('content-length',0) or 0)
+                    else: size=len(ret.content or b'')
+                    profiler.record(method,url,ret.status_code,size,ret.elapsed.total_seconds(),time.time()-starttime)
+                if not self.retrypolicy.canretry(method,attempt,ret.status_code):
+                    return ret
+                time.sleep(self.retrypolicy.getdelay(attempt,ret))
+                ret.close()
+
+            attempt=attempt+1
+
+            # files that were sent must be read again from the start
+            rewindfiles(kwargs.get('files'))
+
+    def close(self):
+
+        self.session.close()
+
+
+# rewindfiles
+# seek the file objects of a multipart request back to the start so the request can be sent again
+# change history
+#   18OCT2026 initial development
+
+def rewindfiles(files):
+
+    for value in (files or {}).values():
+        fileobj=value[1] if isinstance(value,(tuple,list)) else value
+        if hasattr(fileobj,'seek'): fileobj.seek(0)
+
+
+# getviyaclient
+# return the ViyaClient for this process, it is created on first use
+# change history
+#   18OCT2026 initial development
+
+_viyaclient=None
+_viyaclient_lock=threading.Lock()
+
+def getviyaclient():
+
+    global _viyaclient
+
+    if _viyaclient is None:
+        with _viyaclient_lock:
+            if _viyaclient is None:
+                _viyaclient=ViyaClient()
+
+    return _viyaclient
+
+# ResponseCache
+# an opt-in on-disk cache of GET responses, switched on with PYVIYA_CACHE=1, pyviya.cache=true or --cache and
+# bypassed for one run with --no-cache. Responses are stored under ~/.sas/pyviyatools-cache keyed by the profile,
+# the url and the Accept header. A cached response is used without a request while it is younger than the TTL
+# for its endpoint, only endpoints listed in PYVIYA_CACHE_TTLS have one, after that the request is sent with
+# If-None-Match and If-Modified-Since so an unchanged resource comes back as a 304 with no body. A post, put,
+# patch or delete removes the cached responses of its url and of the collection above it. When the cache is
+# bigger than its size cap the least recently used responses are removed.
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 entries are removed when their url is changed, no default TTL, only the TTLs of listed endpoints
+
+class ResponseCache(object):
+
+    def __init__(self,directory=None,maxsize=None,ttls=None):
+
+        if directory is None:
+            directory=getpyviyasetting('PYVIYA_CACHE_DIR','pyviya.cache.dir',os.path.join(os.path.expanduser('~'),'.sas','pyviyatools-cache'))
+        if maxsize is None:
+            maxsize=int(float(getpyviyasetting('PYVIYA_CACHE_MAXSIZE','pyviya.cache.maxsize',100))*1024*1024)
+        if ttls is None:
+            ttls=getpyviyasetting('PYVIYA_CACHE_TTLS','pyviya.cache.ttls','')
+
+        self.directory=directory
+        self.maxsize=maxsize
+        self.ttls=getcachettls(ttls)
+        self.lock=threading.Lock()
+        self.index=None
+
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+    # the ttl of the longest matching endpoint prefix, 0 for endpoints that are not listed so they are revalidated
+    def getttl(self,url):
+
+        path=re.sub(r'^[a-zA-Z]+://[^/]*','',url)
+        ttl=0
+        matched=-1
+
+        for prefix,prefixttl in self.ttls:
+            if path.startswith(prefix) and len(prefix)>matched:
+                ttl=prefixttl
+                matched=len(prefix)
+
+        return ttl
+
+    # the key starts with the hash of the profile and the url without its query, so every entry of a url can be
+    # found when it is changed, and ends with the hash of the query, parameters and Accept header
+    def getkey(self,url,params,acceptType):
+
+        path,query=(url.split('?',1)+[''])[:2]
+        if params:
+            query=query+'&'+'&'.join(str(name)+'='+str(params[name]) for name in sorted(params))
+
+        return self.geturlkey(path)+'-'+hashlib.sha256('\n'.join([query,acceptType or '']).encode('utf-8')).hexdigest()[:32]
+
+    def geturlkey(self,path):
+
+        return hashlib.sha256('\n'.join([getcliprofile().name,path.rstrip('/')]).encode('utf-8')).hexdigest()
+
+    # remove the entries of a url that was changed and of the collection it is in, e.g. a delete of
+    # /folders/folders/123 removes /folders/folders/123 and the listings of /folders/folders
+    def invalidate(self,url):
+
+        path=url.split('?',1)[0].rstrip('/')
+        prefixes=set([self.geturlkey(path)+'-',self.geturlkey(path.rsplit('/',1)[0])+'-'])
+
+        with self.lock:
+            index=self.getindex()
+            for key in [key for key in index if key[:65] in prefixes]:
+                for suffix in ('.body','.json'):
+                    try:
+                        os.remove(os.path.join(self.directory,key+suffix))
+                    except OSError:
+                        pass
+                del index[key]
+
+    # the size and last use of every entry, read from the directory the first time it is needed
+    def getindex(self):
+
+        if self.index is None:
+            self.index={}
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.body'):
+                    filepath=os.path.join(self.directory,filename)
+                    try:
+                        self.index[filename[:-5]]=(os.path.getsize(filepath),os.path.getmtime(filepath))
+                    except OSError:
+                        pass
+
+        return self.index
+
+    # return the stored entry as a dict with the body, or None
+    def get(self,key):
+
+        metafile=os.path.join(self.directory,key+'.json')
+        bodyfile=os.path.join(self.directory,key+'.body')
+
+        try:
+            with open(metafile) as f:
+                entry=json.load(f)
+            with open(bodyfile,'rb') as f:
+                entry['body']=f.read()
+        except (IOError, OSError, ValueError):
+            return None
+
+        return entry
+
+    # mark an entry as used, and fresh again when the server confirmed it with a 304
+    def touch(self,key,entry=None):
+
+        now=time.time()
+
+        with self.lock:
+            try:
+                os.utime(os.path.join(self.directory,key+'.body'),(now,now))
+            except OSError:
+                return
+            index=self.getindex()
+            if key in index: index[key]=(index[key][0],now)
+
+        if entry is not None:
+            entry['stored']=now
+            self._write(key+'.json',json.dumps({name:value for name,value in entry.items() if name!='body'}).encode('utf-8'))
+
+    def put(self,key,url,ret):
+
+        entry={'url':url,'stored':time.time(),'status':ret.status_code,'headers':{name:value for name,value in ret.headers.items() if name.lower() in ('content-type','etag','last-modified')}}
+
+        body=ret.content or b''
+        if len(body)>self.maxsize:
+            return
+
+        self._write(key+'.body',body)
+        self._write(key+'.json',json.dumps(entry).encode('utf-8'))
+
+        with self.lock:
+            index=self.getindex()
+            index[key]=(len(body),time.time())
+            self.evict()
+
+    # write through a temporary file so other threads and processes never read half a file
+    def _write(self,filename,content):
+
+        tmpfile=os.path.join(self.directory,filename+'.'+str(os.getpid())+'.'+str(threading.current_thread().ident)+'.tmp')
+        with open(tmpfile,'wb') as f:
+            f.write(content)
+        os.replace(tmpfile,os.path.join(self.directory,filename))
+
+    # remove the least recently used entries until the cache is under its size cap, called with the lock held
+    def evict(self):
+
+        index=self.getindex()
+        total=sum(size for size,used in index.values())
+
+        if total<=self.maxsize:
+            return
+
+        for key,(size,used) in sorted(index.items(),key=lambda entry: entry[1][1]):
+            for suffix in ('.body','.json'):
+                try:
+                    os.remove(os.path.join(self.directory,key+suffix))
+                except OSError:
+                    pass
+            del index[key]
+            total=total-size
+            if total<=self.maxsize:
+                break
+
+    # make a GET through the cache, the arguments are the same as ViyaClient.request
+    def request(self,client,url,headers,params):
+
+        acceptType=headers.get('Accept')
+        key=self.getkey(url,params,acceptType)
+        entry=self.get(key)
+
+        if entry is not None:
+
+            if time.time()-entry['stored']<self.getttl(url):
+                self.touch(key)
+                return cachedresponse(url,entry)
+
+            headers=dict(headers)
+            for name,value in entry['headers'].items():
+                if name.lower()=='etag': headers['If-None-Match']=value
+                elif name.lower()=='last-modified': headers['If-Modified-Since']=value
+
+        ret=client.request('get',url,headers=headers,params=params)
+
+        if ret.status_code==304 and entry is not None:
+            ret.close()
+            self.touch(key,entry)
+            return cachedresponse(url,entry)
+
+        if ret.status_code==200:
+            cachecontrol=ret.headers.get('Cache-Control','').lower()
+            if 'no-store' not in cachecontrol:
+                self.put(key,url,ret)
+
+        return ret
+
+
+# getcachettls
+# parse the per endpoint TTLs, a comma separated list of endpoint=seconds, e.g. /folders=300,/identities=3600
+# change history
+#   18OCT2026 initial development
+
+def getcachettls(ttls):
+
+    result=[]
+
+    for setting in str(ttls).split(','):
+        if '=' in setting:
+            prefix,seconds=setting.split('=',1)
+            result.append((prefix.strip(),float(seconds)))
+
+    return result
+
+
+# cachedresponse
+# build a requests Response from a cached entry so callers cannot tell it from a response from the server
+# change history
+#   18OCT2026 initial development
+
+def cachedresponse(url,entry):
+
+    ret=requests.models.Response()
+    ret.status_code=entry['status']
+    ret.url=url
+    ret.headers=requests.structures.CaseInsensitiveDict(entry['headers'])
+    ret._content=entry['body']
+    ret.encoding='utf-8'
+
+    return ret
+
+
+# getresponsecache
+# return the ResponseCache if caching is on, otherwise None
+# change history
+#   18OCT2026 initial development
+
+_responsecache=None
+_responsecache_lock=threading.Lock()
+_nocache=getcommandlineflag('--no-cache')
+_usecache=getcommandlineflag('--cache')
+
+def getresponsecache():
+
+    global _responsecache
+
+    if _nocache:
+        return None
+
+    if _responsecache is None:
+        if not (_usecache or str(getpyviyasetting('PYVIYA_CACHE','pyviya.cache','false')).lower() in ('true', '1', 't')):
+            return None
+        with _responsecache_lock:
+            if _responsecache is None:
+                _responsecache=ResponseCache()
+
+    return _responsecache
+
+
 # validate rest api is not used at this time
 # not used
 
@@ -106,10 +1101,94 @@ def validaterestapi(baseurl, reqval, reqtype, data={}):
 #   20Feb2022 Support patch
 #   28Feb2022 Added functionality to optionally pass in etags, and to request they be returned, for API endpoints that use them
 #   15DEC2022 Added noprint, can be used to suppress the printing of the error messages when stoponerror is disabled, defaults to print for compatibility
+#   18OCT2026 Requests are made on the pooled session of the ViyaClient
+#   18OCT2026 Retry once with a refreshed token when the request returns a 401
+#   18OCT2026 Request building moved to _restcall so it can be shared with callrestapi_many
+#   18OCT2026 Only SSL errors are reported as CA bundle errors, other request errors follow stoponerror
+#   18OCT2026 Added nocache for polls, returnEtag requests are not answered from the response cache
+
+
+def callrestapi(reqval, reqtype, acceptType='application/json', contentType='application/json',data={},header={},params={},stoponerror=1,returnEtag=False,etagIn='',noprint=0,nocache=False):
+
+    # maybe this can be removed
+    global result
+
+    if reqtype not in RESTMETHODS:
+        result=None
+        print("NOTE: Invalid method")
+        sys.exit()
+
+    # call the rest api using the parameters passed in and the pooled session of the ViyaClient
+    try:
+        # the etag of a cached response may be out of date, it is read from the server for a later If-Match
+        ret=_restcall(reqval,reqtype,acceptType,contentType,data,header,params,etagIn,nocache=nocache or returnEtag)
+
+    except SSLError as e:
+        print("ERROR: SSL or CA Bundle Error occurred.")
+        print(f"Error details: {e}")
+        print(f"REQUESTS_CA_BUNDLE file path is: {os.getenv('REQUESTS_CA_BUNDLE')}")
+        print("Tip: Check if the path is correct.")
+        sys.exit(1)
+
+    # connection errors, timeouts and retries that ran out, the caller gets None when it does not stop on errors
+    except (RequestException, OSError) as e:
+        if not noprint: print("ERROR: request "+reqtype+" "+reqval+" failed: "+str(e))
+        if stoponerror: sys.exit(1)
+        ret=None
+
+    if ret is None:
+        result=None
+
+    # response error if status code between these numbers
+    # for head request, tolerate this 4xx+ responses
+    elif (400 <= ret.status_code <=599) and reqtype!="head":
+
+       if not noprint: print("http response code: "+ str(ret.status_code))
+       if not noprint: print("ret.text: "+ret.text)
+       result=None
+       if stoponerror: sys.exit()
+
+    # return the result
+    else:
+        result=_decoderesult(ret,reqtype)
 
+    # Capture the value of any etag returned in the headers
+    etagOut=None
+    statuscode=None
+    if ret is not None:
+        statuscode=ret.status_code
+        if 'etag' in ret.headers:
+            etagOut=ret.headers['etag']
+
+    # ONLY if the caller specifically asked for an etag to be returned, return one
+    # If using the HEAD method, return the status code as a separate result.
+    if returnEtag and reqtype!="head":
+        return result,etagOut;
+    elif returnEtag and reqtype=="head":
+        return result,etagOut,statuscode;
+    elif reqtype=="head":
+        return result,statuscode;
+    else:
+        # Otherwise, return only the result as normal.
+        # This avoids breaking anything that does not expect an etag to be returned
+        # in addition to the normal results.
+        return result;
 
-def callrestapi(reqval, reqtype, acceptType='application/json', contentType='application/json',data={},header={},params={},stoponerror=1,returnEtag=False,etagIn='',noprint=0):
+RESTMETHODS=["get","post","delete","put","patch","head","postmultipart","putmultipart"]
+
+# _restcall
+# build the headers and body for a request, send it and return the response
+# errors are not handled here so that callrestapi and callrestapi_many can deal with them differently
+# change history
+#   18OCT2026 initial development, split out of callrestapi
+#   18OCT2026 the request body is encoded with jsonbody
+#   18OCT2026 added stream to leave the body of the response to be read by the caller
+#   18OCT2026 added nocache to send a get to the server even when responses are cached
 
+def _restcall(reqval,reqtype,acceptType='application/json',contentType='application/json',data={},header={},params={},etagIn='',stream=False,nocache=False):
+
+    profiler=getprofiler()
+    if profiler is not None: starttime=time.time()
 
     # get the url from the default profile
     baseurl=getbaseurl()
@@ -117,7 +1196,7 @@ def callrestapi(reqval, reqtype, acceptType='application/json', contentType='app
     # get the auth token
     oaval=getauthtoken(baseurl)
 
-    #print(oaval)
+    if profiler is not None: profiler.addtime('auth',time.time()-starttime)
 
     # build the authorization header
     head= {'Content-type':contentType,'Accept':acceptType}
@@ -129,9 +1208,6 @@ def callrestapi(reqval, reqtype, acceptType='application/json', contentType='app
     if etagIn!='':
          head.update({"If-Match" : etagIn})
 
-    # maybe this can be removed
-    global result
-
     # Serialize non-multipart payloads as json. Multipart requests pass raw files via
     # the requests "files" argument and must not be json-serialized.
     json_data=None
@@ -142,91 +1218,244 @@ def callrestapi(reqval, reqtype, acceptType='application/json', contentType='app
         if "content-type" in head:
             del head["content-type"]
     else:
-        json_data=json.dumps(data, ensure_ascii=True)
+        json_data=jsonbody(data)
 
-        #convert if python 2
-        # get python version
-        # if we don't do this any request with foreign characters fails
-        version=int(str(sys.version_info[0]))
-        #if version==2: json_data = json_data.encode(encoding='utf-8')
-        json_data.encode(encoding='utf-8')
+    ret=_sendrequest(reqtype,baseurl+reqval,head,json_data,data,params,stream,nocache)
 
-    # call the rest api using the parameters passed in and the requests python library
+    # the token was rejected, refresh it and try the request once more
+    if ret.status_code==401:
+        ret.close()
+        oaval=gettokenmanager(baseurl).refresh(oaval)
+        head.update({"Authorization" : oaval})
+        if reqtype in ["postmultipart","putmultipart"]:
+            rewindfiles(data)
+        ret=_sendrequest(reqtype,baseurl+reqval,head,json_data,data,params,stream,nocache)
 
-    # read an environment variable PYVIYAINSECURE default to False even if variable does not exist
-    pyviya_insecure=os.getenv('PYVIYA_INSECURE', 'False').lower() in ('true', '1', 't') 
+    return ret
 
-    if pyviya_insecure:
-        requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
-        verify_ssl=False
-    else:
-        verify_ssl=True
-
-    if reqtype=="get":
-        ret = requests.get(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="post":
-        ret = requests.post(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="delete":
-        ret = requests.delete(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="put":
-        ret = requests.put(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="patch":
-        ret = requests.patch(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="head":
-        ret = requests.head(baseurl+reqval,headers=head,data=json_data, params=params, verify=verify_ssl)
-    elif reqtype=="postmultipart":
-        ret = requests.post(baseurl+reqval,headers=head,files=data, params=params, verify=verify_ssl)
+# _decoderesult
+# return the result of a successful request, headers for head, json if it can be decoded otherwise text
+# change history
+#   18OCT2026 initial development, split out of callrestapi
+#   18OCT2026 json is decoded from the response bytes with jsonloads
+
+def _decoderesult(ret,reqtype):
+
+    if reqtype=="head":
+        # If doing a HEAD request, return the headers as the result.
+        return ret.headers
+
+    profiler=getprofiler()
+    if profiler is not None: starttime=time.time()
+
+    # is it json
+    try:
+        result=jsonloads(ret.content)
+    except:
+        # is it text
+        try:
+            result=ret.text
+        except:
+            result=None
+            print("NOTE: No result to print")
+
+    if profiler is not None: profiler.addtime('decode',time.time()-starttime)
+
+    return result
+
+# downloadrestapi
+# stream the body of a get request to a file without holding it in memory, the file is written under a
+# temporary name and renamed when it is complete so a failed download does not leave a partial file
+# returns the number of bytes written, or None when the request failed and stoponerror is 0
+# change history
+#   18OCT2026 initial development
+
+def downloadrestapi(reqval,filename,acceptType='application/json',header={},params={},stoponerror=1,noprint=0,chunksize=1048576):
+
+    try:
+        ret=_restcall(reqval,'get',acceptType,header=header,params=params,stream=True)
+    except RequestException as e:
+        print("ERROR: cannot download "+reqval+": "+str(e))
+        if stoponerror: sys.exit(1)
+        return None
+
+    if 400 <= ret.status_code <=599:
+        if not noprint: print("http response code: "+ str(ret.status_code))
+        if not noprint: print("ret.text: "+ret.text)
+        ret.close()
+        if stoponerror: sys.exit()
+        return None
+
+    size=0
+    tmpfile=filename+'.'+str(os.getpid())+'.part'
+
+    try:
+        with open(tmpfile,'wb') as f:
+            for chunk in ret.iter_content(chunk_size=chunksize):
+                if chunk:
+                    f.write(chunk)
+                    size=size+len(chunk)
+        os.replace(tmpfile,filename)
+    except (RequestException, OSError) as e:
+        if os.path.exists(tmpfile): os.remove(tmpfile)
+        print("ERROR: cannot download "+reqval+" to "+filename+": "+str(e))
+        if stoponerror: sys.exit(1)
+        return None
+    finally:
+        ret.close()
+
+    return size
+
+# _sendrequest
+# send one request on the pooled session, multipart requests send data as files
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 streamed requests are not cached
+#   18OCT2026 added nocache, changes remove the cached responses of their url
+
+def _sendrequest(reqtype,url,head,json_data,data,params,stream=False,nocache=False):
+
+    client=getviyaclient()
+    responsecache=getresponsecache()
+
+    if reqtype=="postmultipart":
+        ret = client.request("post",url,headers=head,files=data, params=params)
     elif reqtype=="putmultipart":
-        ret = requests.put(baseurl+reqval,headers=head,files=data, params=params, verify=verify_ssl)
+        ret = client.request("put",url,headers=head,files=data, params=params)
+    elif reqtype=="get" and responsecache is not None and not stream and not nocache:
+        ret = responsecache.request(client,url,head,params)
+    elif stream:
+        ret = client.request(reqtype,url,headers=head,data=json_data, params=params, stream=True)
     else:
-        result=None
-        print("NOTE: Invalid method")
-        sys.exit()  
+        ret = client.request(reqtype,url,headers=head,data=json_data, params=params)
 
+    # cached responses of what was changed are out of date
+    if responsecache is not None and reqtype not in ["get","head"]:
+        responsecache.invalidate(url)
 
-    # response error if status code between these numbers
-    # for head request, tolerate this 4xx+ responses
-    if (400 <= ret.status_code <=599) and reqtype!="head":
+    return ret
 
-       if not noprint: print("http response code: "+ str(ret.status_code))
-       if not noprint: print("ret.text: "+ret.text)
-       result=None
-       if stoponerror: sys.exit()
 
-    # return the result
-    elif reqtype=="head":
-        # If doing a HEAD request, return the headers as the result.
-        result=ret.headers
-    else:
-         # is it json
-         try:
-             result=ret.json()
-         except:
-            # is it text
-            try:
-                result=ret.text
-            except:
-                result=None
-                print("NOTE: No result to print")
+# RestCallResult
+# the outcome of one request made by callrestapi_many
+# result is what callrestapi would have returned, error is None or a message when the request failed
+# change history
+#   18OCT2026 initial development
 
-    # Capture the value of any etag returned in the headers
-    etagOut=None
-    if 'etag' in ret.headers:
-        etagOut=ret.headers['etag']
+class RestCallResult(object):
 
-    # ONLY if the caller specifically asked for an etag to be returned, return one
-    # If using the HEAD method, return the status code as a separate result.
-    if returnEtag and reqtype!="head":
-        return result,etagOut;
-    elif returnEtag and reqtype=="head":
-        return result,etagOut,ret.status_code;
-    elif reqtype=="head":
-        return result,ret.status_code;
+    def __init__(self,request,result=None,status_code=None,etag=None,error=None):
+
+        self.request=request
+        self.result=result
+        self.status_code=status_code
+        self.etag=etag
+        self.error=error
+
+    def __repr__(self):
+
+        return "RestCallResult(status_code=%r, error=%r)" % (self.status_code,self.error)
+
+
+# callrestapi_many
+# make a batch of independent requests concurrently on a bounded thread pool over the shared session
+# each request is a dictionary of callrestapi keyword arguments e.g. {'reqval':'/folders/folders','reqtype':'get'}
+# or a tuple of its positional arguments e.g. ('/folders/folders','get')
+# a list of RestCallResult is returned in the same order as the requests, errors are captured in the
+# result rather than stopping processing
+# max_workers defaults to PYVIYA_WORKERS or pyviya.workers in application.properties
+# the number of requests actually in flight is adjusted by the shared AdaptiveLimiter and never exceeds
+# its hard cap, so a busy server is not overloaded by a large max_workers
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 requests in flight are limited by the AdaptiveLimiter
+
+def callrestapi_many(requestlist,max_workers=None):
+
+    if max_workers is None:
+        max_workers=int(getpyviyasetting('PYVIYA_WORKERS','pyviya.workers',8))
+
+    requestlist=list(requestlist)
+
+    if max_workers<=1 or len(requestlist)<=1:
+        return [_callrestapi_one(request) for request in requestlist]
+
+    max_workers=min(max_workers,getconcurrencylimiter().max_limit)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results=list(executor.map(_callrestapi_limited,requestlist))
+
+    return results
+
+# callrestapi_result
+# make one request described as in callrestapi_many and return its RestCallResult, waiting for a slot in the
+# AdaptiveLimiter first, for tools that schedule their own requests on a thread pool
+# change history
+#   18OCT2026 initial development
+
+def callrestapi_result(request):
+
+    return _callrestapi_limited(request)
+
+# _callrestapi_limited
+# make one request for callrestapi_many when a slot is free in the AdaptiveLimiter
+# the latency and outcome of the request are used to adjust the limit
+# change history
+#   18OCT2026 initial development
+
+def _callrestapi_limited(request):
+
+    limiter=getconcurrencylimiter()
+    limiter.acquire()
+
+    starttime=time.time()
+    restresult=None
+
+    try:
+        restresult=_callrestapi_one(request)
+    finally:
+        failed=restresult is None or (restresult.error is not None and restresult.status_code is None)
+        limiter.release(time.time()-starttime,None if restresult is None else restresult.status_code,failed)
+
+    return restresult
+
+# _callrestapi_one
+# make one request for callrestapi_many and capture the outcome in a RestCallResult
+# change history
+#   18OCT2026 initial development
+
+_callrestapi_argnames=['reqval','reqtype','acceptType','contentType','data','header','params','etagIn']
+
+def _callrestapi_one(request):
+
+    if isinstance(request,dict):
+        kwargs=dict(request)
     else:
-        # Otherwise, return only the result as normal.
-        # This avoids breaking anything that does not expect an etag to be returned
-        # in addition to the normal results.
-        return result;
+        kwargs=dict(zip(_callrestapi_argnames,request))
+
+    kwargs.setdefault('reqtype','get')
+
+    # these callrestapi arguments do not apply, the status, etag and error are always returned
+    for name in ['stoponerror','returnEtag','noprint']:
+        kwargs.pop(name,None)
+
+    if kwargs['reqtype'] not in RESTMETHODS:
+        return RestCallResult(request,error="Invalid method "+str(kwargs['reqtype']))
+
+    try:
+        ret=_restcall(**kwargs)
+    except SystemExit:
+        return RestCallResult(request,error="Request stopped, check the profile and credentials.")
+    except (RequestException, OSError) as e:
+        return RestCallResult(request,error=str(e))
+
+    etagOut=ret.headers.get('etag')
+
+    if (400 <= ret.status_code <=599) and kwargs['reqtype']!="head":
+        return RestCallResult(request,status_code=ret.status_code,etag=etagOut,error=ret.text)
+
+    return RestCallResult(request,_decoderesult(ret,kwargs['reqtype']),ret.status_code,etagOut)
+
 
 # getfolderid
 # when a Viya content path is passed in return the id, path and uri
@@ -234,14 +1463,24 @@ def callrestapi(reqval, reqtype, acceptType='application/json', contentType='app
 #   01dec2017 initial development
 #   08Feb2020 return full json as 4 item in list that is returned
 #   14OCT2022 added 'createdBy' to return array
+#   18OCT2026 use the returned result rather than the global so it can be called from threads
+#   18OCT2026 folders already found are returned from the path cache
 
 def getfolderid(path):
 
-    # build the request parameters
-    reqval="/folders/folders/@item?path="+path
-    reqtype='get'
+    pathcache=getpathcache()
+    result=pathcache.getfolder(path)
+
+    if result is None:
+
+        # build the request parameters
+        reqval="/folders/folders/@item?path="+path
+        reqtype='get'
+
+        result=callrestapi(reqval,reqtype)
 
-    callrestapi(reqval,reqtype)
+        if result is not None:
+            pathcache.addfolder(path,result)
 
     if result==None:
         print("NOTE: Folder'"+path+"' not found.")
@@ -259,224 +1498,318 @@ def getfolderid(path):
 
 
 
+# CLIProfile
+# the CLI profile (config.json) and credentials (credentials.json) for the current profile held in memory
+# each file is parsed again only when its modification time or size changes, for example when another
+# process refreshed the token. SAS_CLI_PROFILE and PYVIYA_INSECURE are read once when the profile is created.
+# change history
+#   18OCT2026 initial development
+
+class CLIProfile(object):
+
+    def __init__(self):
+
+        # get the profile environment variable to use it
+        # if it is not set default to the default profile
+        self.name=os.environ.get("SAS_CLI_PROFILE","Default")
+
+        # read an environment variable PYVIYAINSECURE default to False even if variable does not exist
+        self.insecure=os.getenv('PYVIYA_INSECURE', 'False').lower() in ('true', '1', 't')
+
+        # note the path to the profile is hard-coded right now
+        self.config_file=os.path.join(os.path.expanduser('~'),'.sas','config.json')
+        self.credential_file=os.path.join(os.path.expanduser('~'),'.sas','credentials.json')
+
+        self.files={}
+        self.lock=threading.Lock()
+
+    # return the parsed json of a file, None if it cannot be read and {} if it is empty
+    def readjson(self,filename):
+
+        try:
+            st=os.stat(filename)
+        except OSError:
+            return None
+
+        filekey=(st.st_mtime,st.st_size)
+
+        with self.lock:
+
+            cached=self.files.get(filename)
+            if cached is not None and cached[0]==filekey:
+                return cached[1]
+
+            if st.st_size==0:
+                data={}
+            else:
+                try:
+                    with open(filename) as json_file:
+                        data = json.load(json_file)
+                except IOError:
+                    return None
+
+            self.files[filename]=(filekey,data)
+
+        return data
+
+    # return the sas-endpoint of the profile
+    def getbaseurl(self):
+
+        data=self.readjson(self.config_file)
+
+        #profile does not exist
+        if data is None:
+            print("ERROR: Cannot read CLI profile at:",self.config_file,". Recreate profile with sas-admin profile init.")
+            sys.exit()
+
+        #profile is empty file
+        if data=={}:
+            print("ERROR: Cannot read CLI profile empty file at:",self.config_file,". Recreate profile with sas-admin profile init.")
+            sys.exit()
+
+        # check that information is in profile
+        if self.name not in data:
+            print("ERROR: profile "+self.name+" does not exist. Recreate profile with sas-admin profile init.")
+            sys.exit()
+
+        return data[self.name]['sas-endpoint']
+
+    # return the credentials of the profile, the same object is returned until the file changes
+    def getcredentials(self):
+
+        data=self.readjson(self.credential_file)
+
+        if data is None:
+            print("ERROR: Cannot read authentication credentials at: ", self.credential_file)
+            print("ERROR: Try refreshing your token with sas-admin auth login")
+            sys.exit()
+
+        # the sas-admin profile init creates an empty credential file
+        # check that credential is in file, if not exit
+        if self.name not in data or not data[self.name].get('access-token'):
+            print("ERROR: access token not in file: ", self.credential_file)
+            print("ERROR: Try refreshing your token with Viya CLI auth login")
+            sys.exit()
+
+        return data[self.name]
+
+
+# getcliprofile
+# return the CLIProfile for this process, it is created on first use
+# change history
+#   18OCT2026 initial development
+
+_cliprofile=None
+
+def getcliprofile():
+
+    global _cliprofile
+
+    if _cliprofile is None:
+        _cliprofile=CLIProfile()
+
+    return _cliprofile
+
+
 # getbaseurl
 # from the default profile return the baseurl of the Viya server
 # change history
 #   01dec2017 initial development
 #   01jun2018 Deal with empty profile error
 #   20nov2018 Use the SAS_CLI_PROFILE env variable
+#   18OCT2026 profile is cached by CLIProfile and only re-read when config.json changes
 
 
 def getbaseurl():
 
-    # check that profile file is available and can be read
-
-    # note the path to the profile is hard-coded right now
-    endpointfile=os.path.join(os.path.expanduser('~'),'.sas','config.json')
-    access_file=file_accessible(endpointfile,'r')
-
-    #profile does not exist
-    if access_file==False:
-        print("ERROR: Cannot read CLI profile at:",endpointfile,". Recreate profile with sas-admin profile init.")
-        sys.exit()
-
-    #profile is empty file
-    if os.stat(endpointfile).st_size==0:
-         print("ERROR: Cannot read CLI profile empty file at:",endpointfile,". Recreate profile with sas-admin profile init.")
-         sys.exit()
-
-    # get json from profile
-    with open(endpointfile) as json_file:
-        data = json.load(json_file)
+    baseurl=getcliprofile().getbaseurl()
 
-    # get the profile environment variable to use it
-    # if it is not set default to the default profile
+    return baseurl
 
-    cur_profile=os.environ.get("SAS_CLI_PROFILE","Default")
-    #print("URL: ",cur_profile )
 
-    # check that information is in profile
-    if cur_profile in data:
-        baseurl=data[cur_profile]['sas-endpoint']
-    else:
-
-        baseurl=None
-        print("ERROR: profile "+cur_profile+" does not exist. Recreate profile with sas-admin profile init.")
-        sys.exit()
+# TokenManager
+# keeps the bearer token for the current profile in memory so it is not re-read and re-validated on every call
+# the expiry is taken from the exp claim of the JWT access token, or the expiry stored by the CLI
+# the token is refreshed with the refresh token shortly before it expires, or when a request returns a 401
+# change history
+#   18OCT2026 initial development
 
+class TokenManager(object):
 
-    return baseurl
+    def __init__(self,baseurl):
 
+        self.baseurl=baseurl
+        self.cliprofile=getcliprofile()
 
-# getauthtoken
-# from the stored auth file get the authentication token for the request header
-# change history
-#   01dec2017 initial development
-# return oaval=None when no authtoken retrieved
-#   20nov2018 Use the SAS_CLI_PROFILE env variable
+        # refresh this many seconds before the token expires
+        self.refresh_seconds=int(getpyviyasetting('PYVIYA_TOKEN_REFRESH_SECONDS','pyviya.token.refreshseconds',60))
 
-def getauthtoken(baseurl):
+        self.credentials=None
+        self.access_token=None
+        self.refresh_token=None
+        self.expires_at=None
+        self.lock=threading.RLock()
 
+    # read the token for the profile from the credentials
+    # nothing is done unless credentials.json changed since the token was last read
+    def load(self):
 
-    #get authentication information for the header
-    credential_file=os.path.join(os.path.expanduser('~'),'.sas','credentials.json')
+        credentials=self.cliprofile.getcredentials()
 
-    # check that credential file is available and can be read
-    access_file=file_accessible(credential_file,'r')
+        if credentials is self.credentials:
+            return
 
-    if access_file==False:
-        oaval=None
-        print("ERROR: Cannot read authentication credentials at: ", credential_file)
-        print("ERROR: Try refreshing your token with sas-admin auth login")
-        sys.exit()
+        self.credentials=credentials
+        self.access_token=credentials['access-token']
+        self.refresh_token=credentials.get('refresh-token')
+        self.expires_at=gettokenexpiry(self.access_token,credentials.get('expiry'))
 
-    with open(credential_file) as json_file:
-        data = json.load(json_file)
+    # return the value for the Authorization header, refresh first if the token is about to expire
+    # a profile with only an access token keeps using it until it expires
+    def getauthheader(self):
 
-    # the sas-admin profile init creates an empty credential file
-    # check that credential is in file, if it is add it to the header, if not exit
+        with self.lock:
 
-     # get the profile environment variable to use it
-    # if it is not set default to the default profile
+            self.load()
 
-    cur_profile=os.environ.get("SAS_CLI_PROFILE","Default")
+            # without a refresh token the token is used until it has expired, a 401 still ends the tool in refresh
+            if self.refresh_token:
+                refreshat=self.expires_at-self.refresh_seconds if self.expires_at is not None else None
+            else:
+                refreshat=self.expires_at
 
-    #print("LOGON: ", cur_profile )
+            if refreshat is not None and time.time() >= refreshat:
+                self.refresh()
 
-    if cur_profile in data:
+            return "bearer " + self.access_token
 
-        oauthToken=data[cur_profile]['access-token']
-        refreshToken=data[cur_profile]['refresh-token']
+    # use the refresh token to get a new access token
+    # failedheader is the header that got a 401, if another thread already refreshed just use the new token
+    def refresh(self,failedheader=None):
 
-        oauthTokenType="bearer"
+        with self.lock:
 
-        oaval=oauthTokenType + ' ' + oauthToken
+            if failedheader is not None and self.access_token is not None and failedheader!="bearer " + self.access_token:
+                return "bearer " + self.access_token
 
-        head= {'Content-type':'application/json','Accept':'application/json' }
-        head.update({"Authorization" : oaval})
+            #do refresh token request
+            #curl -k "${INGRESS_URL}/SASLogon/oauth/token" -H "Accept: application/json" -H "Content-Type: application/x-www-form-urlencoded" -u "sas.cli:" \-d "grant_type=refresh_token&refresh_token=${REFRESH_TOKEN}"
 
-        # test a connection to rest api if it fails try using the refresh token to re-authenticate
-        # this code runs on each rest call so we trap errors here
+            refresh_headers = {"Accept": "application/json","Content-Type": "application/x-www-form-urlencoded",}
 
-        # read environment variable PYVIYAINSECURE to determine if we should verify ssl certificates or not
-        pyviya_insecure=os.getenv('PYVIYA_INSECURE', 'False').lower() in ('true', '1', 't')
-        if pyviya_insecure:
-            requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
-            verify_ssl=False
-        else:
-            verify_ssl=True
+            client_id="sas.cli"
+            client_secret=""
 
+            refresh_data = {}
+            refresh_data["grant_type"] =  "refresh_token"
+            refresh_data["refresh_token"] = self.refresh_token
 
-        try:
-            r = requests.get(baseurl + "/identities/users/@currentUser", headers=head, timeout=10,verify=verify_ssl)
-        except (SSLError, OSError) as e:
-            print("ERROR: SSL or CA Bundle Error occurred.")
-            print(f"Error details: {e}")
-            print(f"REQUESTS_CA_BUNDLE file path is: {os.getenv('REQUESTS_CA_BUNDLE')}")
-            print("Tip: Check if the path is correct.")
-            sys.exit(1)
+            response=None
+            if self.refresh_token:
+                response = getviyaclient().request("POST", url=self.baseurl+"/SASLogon/oauth/token", data=refresh_data, headers=refresh_headers,auth=(client_id, client_secret))
 
-        except RequestException as e:
-            print("General Request Error occurred!")
-            print(f"Error details: {e}")
-            sys.exit(1)
+            if response is None or (400 <= response.status_code <=599):
 
+                if response is not None: print(response.text)
+                print("ERROR: cannot connect to "+self.baseurl+" with refresh token is your refresh token expired?")
+                print("ERROR: Try refreshing your token with the CLI auth login")
+                sys.exit()
 
-        if (400 <= r.status_code <=599):
+            # set new token and update credentials.json
+            result=response.json()
+            self.access_token=result["access_token"]
+            expires_in=result["expires_in"]
+            self.expires_at=time.time()+expires_in
 
+            # calculate new expiration
+            newexpiry=(dt.utcnow()+td(seconds=expires_in)).strftime('%Y-%m-%dT%H:%M:%SZ')
 
-            #do refresh token request
-            #curl -k "${INGRESS_URL}/SASLogon/oauth/token" -H "Accept: application/json" -H "Content-Type: application/x-www-form-urlencoded" -u "sas.cli:" \-d "grant_type=refresh_token&refresh_token=${REFRESH_TOKEN}"
+            self.savetoken(newexpiry)
 
-            #did it work
+            return "bearer " + self.access_token
 
-            # set oauthToken again from the output of the request
+    # write the new token to the credentials file so the CLI and other tools can use it
+    # if we cannot just skip, the new token will be used with requests anyway
+    def savetoken(self,newexpiry):
 
-            # update oauthToken in credentials file from the output of the request
+        credential_file=self.cliprofile.credential_file
 
-             refresh_headers = {"Accept": "application/json","Content-Type": "application/x-www-form-urlencoded",}
+        try:
+            with open(credential_file) as json_file:
+                data = json.load(json_file)
 
-             client_id="sas.cli"
-             client_secret=""
+            data[self.cliprofile.name]['access-token']=self.access_token
+            data[self.cliprofile.name]['expiry']=newexpiry
 
-             refresh_data = {}
-             refresh_data["grant_type"] =  "refresh_token"
-             refresh_data["refresh_token"] = refreshToken
+            filecontent=json.dumps(data,indent=2)
 
-             response = requests.request("POST", url=baseurl+"/SASLogon/oauth/token", data=refresh_data, headers=refresh_headers,auth=(client_id, client_secret),verify=False)
+            if os.access(credential_file,os.W_OK):
+                with open(credential_file, "w") as outfile:
+                    outfile.write(filecontent)
 
-             if (400 <= response.status_code <=599):
+            # pick up the file we just wrote so the new token is not replaced by the old one
+            self.credentials=self.cliprofile.getcredentials()
+        except:
+            # fail silently if cannot write to credential file
+            message="NOTE: Cannot write to credential file."
+            #print(message)
 
-                oaval=None
-                print(r.text)
-                print("ERROR: cannot connect to "+baseurl+" with refresh token is your refresh token expired?")
-                print("ERROR: Try refreshing your token with the CLI auth login")
-                sys.exit()
 
-             else:
+# gettokenexpiry
+# return the expiry of an access token in seconds since the epoch, None if it cannot be determined
+# the exp claim of the JWT is used, if it is not available the expiry string written by the CLI is used
+# change history
+#   18OCT2026 initial development
 
-                # set new token and update credentials.json
-                result=response.json()
-                newtoken=result["access_token"]
-                expires_in=result["expires_in"]
+def gettokenexpiry(accesstoken,expiry=None):
 
-                # calculate new expiration
-                newexpiry=(dt.utcnow()+td(seconds=expires_in)).strftime('%Y-%m-%dT%H:%M:%SZ')
-                oaval=oauthTokenType + ' ' + newtoken
+    try:
+        payload=accesstoken.split('.')[1]
+        payload=payload+'='*(-len(payload)%4)
+        claims=json.loads(base64.urlsafe_b64decode(payload.encode('ascii')).decode('utf-8'))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        pass
+
+    if expiry:
+        try:
+            return float(calendar.timegm(time.strptime(expiry[:19],'%Y-%m-%dT%H:%M:%S')))
+        except ValueError:
+            pass
 
-                # write the new token to the credentials file
-                data[cur_profile]['access-token']=newtoken
-                data[cur_profile]['expiry']=newexpiry
+    return None
 
-                filecontent=json.dumps(data,indent=2)
 
-                # check if we can write to the credential file
-                # if we cannot just skip
-                # new token will be used with request anyway
+# gettokenmanager
+# return the TokenManager for this process, it is created on first use
+# change history
+#   18OCT2026 initial development
 
-                if os.access(credential_file,os.W_OK):
-                    try:
-                        with open(credential_file, "w") as outfile:
-                            outfile.write(filecontent)
-                    except:
-                        message="NOTE: Cannot open file just skip update of tokens."
-                        #print(message)
-                else:
+_tokenmanager=None
+_tokenmanager_lock=threading.Lock()
 
-                    # fail silently if cannot write to credential file
-                    message="NOTE: Cannot write to credential file."
-                    #print(message)
+def gettokenmanager(baseurl):
 
+    global _tokenmanager
 
-        head= {'Content-type':'application/json','Accept':'application/json' }
-        head.update({"Authorization" : oaval})
+    with _tokenmanager_lock:
+        if _tokenmanager is None or _tokenmanager.baseurl!=baseurl:
+            _tokenmanager=TokenManager(baseurl)
 
-        # test a connection to rest api again if it fails exit
-        # tell user to re-authenticate with the sas-viya CLI
+    return _tokenmanager
 
-        # read environment variable PYVIYAINSECURE to determine if we should verify ssl certificates or not
-        pyviya_insecure=os.getenv('PYVIYA_INSECURE', 'False').lower() in ('true', '1', 't')
-        if pyviya_insecure:
-            requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
-            verify_ssl=False
-        else:
-            verify_ssl=True     
 
-        r = requests.get(baseurl + "/identities/users/@currentUser", headers=head, verify=verify_ssl)
-        
-        if (400 <= r.status_code <=599):
+# getauthtoken
+# from the stored auth file get the authentication token for the request header
+# change history
+#   01dec2017 initial development
+# return oaval=None when no authtoken retrieved
+#   20nov2018 Use the SAS_CLI_PROFILE env variable
+#   18OCT2026 Token is cached by the TokenManager, the /identities/users/@currentUser check is no longer made on every call
 
-            oaval=None
-            print(r.text)
-            print("ERROR: cannot connect to "+baseurl+" is your token expired?")
-            print("ERROR: Try refreshing your token with the Viya CLI auth login")
-            sys.exit()
-    else:
+def getauthtoken(baseurl):
 
-        oaval=None
-        print("ERROR: access token not in file: ", credential_file)
-        print("ERROR: Try refreshing your token with Viya CLI auth login")
-        sys.exit()
+    oaval=gettokenmanager(baseurl).getauthheader()
 
     return oaval
 
@@ -497,6 +1830,7 @@ def getinputjson(input_file):
 # change history
 #   01dec2017 initial development
 #   20dec2018 simple output now alphibetical order by key
+#   18OCT2026 written with ResultWriter, the output is the same
 
 def simpleresults(resultdata):
 
@@ -508,37 +1842,18 @@ def simpleresults(resultdata):
 
         total_items=resultdata['count']
 
-        returned_items=len(resultdata['items'])
-
         if total_items == 0: print("Note: No items returned.")
 
-        for i in range(0,returned_items):
-
-            print ("=====Item ",i,"=======")
-
-            origpairs=resultdata['items'][i]
-
-            test=origpairs.get('description')
-            if test==None: origpairs['description']='None'
-
-            pairs=collections.OrderedDict(sorted(origpairs.items()))
-
-
-            for key,val in pairs.items():
-
-               if key != 'links':
-                   print(key,end="")
-                   print(" = ", val)
-
-        print("Result Summary: Total items available: ",total_items ,"Total items returned: ", returned_items)
+        writer=ResultWriter('simple')
+        for item in resultdata['items']:
+            writer.writeitem(item)
+        writer.close(total_items)
 
     elif 'id' in resultdata:  #one item returned by rest call
 
-        for key,val in resultdata.items():
-
-               if key != 'links':
-                   print(key,end="")
-                   print(" = ", val)
+        writer=ResultWriter('simple')
+        writer.writepairs(resultdata.items())
+        writer.flush()
 
     else:
         print("NOTE: No JSON Results Found")
@@ -550,113 +1865,280 @@ def simpleresults(resultdata):
 # change history
 #   01aug2018  initial development
 #   19dece2018 print  csv in column orderwith only common columns
+#   18OCT2026 written with ResultWriter, values are quoted by csv.writer so quotes inside values are escaped
 
 def csvresults(resultdata,columns=[],header=1):
-    
+
     if 'items' in resultdata:
 
-        returned_items=len(resultdata['items'])
-        total_items=resultdata.get('count',0)
+        writer=ResultWriter('csv',columns,header)
+        for item in resultdata['items']:
+            writer.writeitem(item)
+        writer.close()
 
-        if returned_items==0: print("Note: No items returned.")
+    elif 'id' in resultdata:  #one item returned by rest call
 
-        for i in range(0,returned_items):
+        writer=ResultWriter('csv',list(resultdata.keys()))
+        writer.writeitem(resultdata)
+        writer.close()
 
+    else:
+        print("NOTE: No JSON Results Found")
 
-            origpairs=resultdata['items'][i]
 
-            # create an ordered dictionary
-            pairs=collections.OrderedDict()
+# ResultWriter
+# writes items in the csv, simple, json, simplejson, jsonl, parquet and arrow output styles one at a time, so the
+# items of a paged collection can be printed as they arrive from iterpaged. The text output is collected in a
+# buffer that is written to stdout when it is full and when the writer is closed, rather than with a print for
+# every field. csv values are written by csv.writer with every value quoted and the header row is not quoted.
+# json and simplejson write {"items": [...], "count": n} with the same layout as json.dumps with indent=2.
+# jsonl writes one item per line. parquet and arrow write the csv columns in record batches of batchsize rows
+# to the binary stdout, they need pyarrow.
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 added the jsonl, parquet and arrow output styles
 
-            # loop thru the column list and insert to a new dictionary in that order
-            # this ensures that colums appear in this order in the csv
-            for keylabel in columns:
+class ResultWriter(object):
 
-                # get the value for the current column
-                curval=origpairs.get(keylabel)
+    def __init__(self,output_style,columns=None,header=1,out=None,buffersize=65536,batchsize=None):
 
-                if curval != None:
-                   pairs[keylabel] = curval
-                else:
-                   pairs[keylabel] = 'None'
+        self.output_style=output_style
+        self.columns=[column for column in (columns or []) if column!='links']
+        self.header=header
+        self.out=out if out is not None else sys.stdout
+        self.buffersize=buffersize
+        self.buffer=io.StringIO()
+        self.csvwriter=csv.writer(self.buffer,quoting=csv.QUOTE_ALL,lineterminator='')
+        self.count=0
 
-            numvals=len(columns)
-            z=0
+        # parquet and arrow
+        self.rows=[]
+        self.batchsize=batchsize if batchsize is not None else int(getpyviyasetting('PYVIYA_ARROW_BATCHSIZE','pyviya.arrow.batchsize',10000))
+        self.schema=None
+        self.columnarwriter=None
 
-            if header:
-                # print header row of column names
-                for key,val in pairs.items():
+        if output_style in COLUMNARSTYLES:
+            try:
+                global pyarrow
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                print("ERROR: The "+output_style+" output style needs pyarrow, install it with: pip install pyarrow")
+                sys.exit()
 
-                    z=z+1
+    def writeitem(self,item):
 
-                    # seperate with comma except last item
-                    if z==numvals: sep=''
-                    else: sep=','
+        if self.output_style in COLUMNARSTYLES:
 
-                    if i==0 and key in columns: print(key,sep,end="")
+            self.rows.append(item)
+            if len(self.rows)>=self.batchsize:
+                self.writebatch()
 
-            print("\n",end="")
+        elif self.output_style=='jsonl':
 
-            z=0
+            self.buffer.write(jsondumps(item)+'\n')
 
-            # print rows
-            for key,val in pairs.items():
+        elif self.output_style=='csv':
 
-                # seperate with comma except last item
-                z=z+1
-                if z==numvals: sep=''
-                else: sep=','
+            if self.count==0 and self.header:
+                self.buffer.write(' ,'.join(self.columns)+' ')
 
-                if key !=  'links' and key in columns:
+            # the values are in column order, a missing value is None
+            self.buffer.write('\n')
+            self.csvwriter.writerow([str(item.get(column)) if item.get(column) is not None else 'None' for column in self.columns])
 
-                    try:
-                        print('"'+str(val)+'"'+sep, end="")
-                    except UnicodeEncodeError:
-                        newval=val.encode('ascii','replace')
-                        print('"'+str(newval)+'"'+sep, end="")
+        elif self.output_style=='simple':
+
+            self.buffer.write('=====Item  '+str(self.count)+' =======\n')
 
+            pairs=dict(item)
+            if pairs.get('description') is None: pairs['description']='None'
+            self.writepairs(sorted(pairs.items()))
 
-        print("\n",end="")
+        else:
 
+            if self.output_style=='simplejson':
+                item={key:val for key,val in item.items() if key!='links'}
 
-    elif 'id' in resultdata:  #one item returned by rest call
+            if self.count==0: self.buffer.write('{\n  "items": [\n')
+            else: self.buffer.write(',\n')
 
-        numvals=len(resultdata.items())
-        z=0
+            # indent the item as json.dumps does for an item in a list in a dict
+            self.buffer.write('    '+jsondumps(item,indent=2).replace('\n','\n    '))
 
-        for key,val in resultdata.items():
+        self.count=self.count+1
 
-            # seperate with comma except last item
-            z=z+1
-            if z==numvals: sep=''
-            else: sep=','
+        if self.buffer.tell()>=self.buffersize:
+            self.flush()
 
-            if key != 'links': print(key,sep,end="")
+    def writepairs(self,pairs):
 
-        print("\n",end="")
+        for key,val in pairs:
+            if key != 'links':
+                self.buffer.write(str(key)+' =  '+str(val)+'\n')
 
+    # write the rows collected so far as one record batch, the column types are taken from the first batch
+    # a later value of a type that does not fit its column stops the output with an error, the schema of a
+    # parquet or arrow stream cannot change once it is written
+    def writebatch(self):
 
-        z=0
+        if self.columnarwriter is None:
 
-        for key,val in resultdata.items():
+            if not self.columns and self.rows:
+                self.columns=[key for key in self.rows[0].keys() if key!='links']
 
-            # seperate with comma except last item
-            z=z+1
-            if z==numvals: sep=''
-            else: sep=','
+            self.schema=pyarrow.schema([(column,getcolumnartype([row.get(column) for row in self.rows])) for column in self.columns])
 
-            if key != 'links':
+            # text already written goes first
+            self.flush()
+            sink=pyarrow.PythonFile(getattr(self.out,'buffer',self.out),mode='w')
 
+            if self.output_style=='parquet':
+                self.columnarwriter=pyarrow.parquet.ParquetWriter(sink,self.schema)
+            else:
+                self.columnarwriter=pyarrow.ipc.new_stream(sink,self.schema)
+
+        if self.rows:
+
+            arrays=[]
+            for field in self.schema:
                 try:
-                    print('"'+str(val)+'"'+sep, end="")
-                except UnicodeEncodeError:
-                    newval=val.encode('ascii','replace')
-                    print('"'+str(newval)+'"'+sep, end="")
+                    arrays.append(pyarrow.array([getcolumnarvalue(row.get(field.name),field.type) for row in self.rows],type=field.type))
+                except ValueError as e:
+                    print("ERROR: column "+field.name+" of the "+self.output_style+" output: "+str(e)+", the column types are taken from the first "+str(self.batchsize)+" items.",file=sys.stderr)
+                    print("ERROR: Set PYVIYA_ARROW_BATCHSIZE to more than the number of items, or use the jsonl or csv output.",file=sys.stderr)
+                    sys.exit(1)
 
-        print("\n",end="")
+            self.columnarwriter.write_table(pyarrow.Table.from_arrays(arrays,schema=self.schema))
+            self.rows=[]
 
-    else:
-        print("NOTE: No JSON Results Found")
+    # finish the output, total is the number of items available for the simple style summary
+    def close(self,total=None):
+
+        if self.output_style in COLUMNARSTYLES:
+
+            self.writebatch()
+            self.columnarwriter.close()
+            getattr(self.out,'buffer',self.out).flush()
+            return
+
+        elif self.output_style=='jsonl':
+
+            pass
+
+        elif self.output_style=='csv':
+
+            if self.count==0: self.buffer.write('Note: No items returned.\n')
+            self.buffer.write('\n')
+
+        elif self.output_style=='simple':
+
+            if total is None: total=self.count
+            self.buffer.write('Result Summary: Total items available:  '+str(total)+' Total items returned:  '+str(self.count)+'\n')
+
+        else:
+
+            if self.count==0: self.buffer.write('{\n  "items": [],\n')
+            else: self.buffer.write('\n  ],\n')
+            self.buffer.write('  "count": '+str(self.count)+'\n}\n')
+
+        self.flush()
+
+    def flush(self):
+
+        text=self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+        self.printtext(text,self.out)
+
+    # write text to stdout, characters the terminal cannot show are replaced
+    @staticmethod
+    def printtext(text,out=None):
+
+        if out is None: out=sys.stdout
+
+        try:
+            out.write(text)
+        except UnicodeEncodeError:
+            encoding=getattr(out,'encoding',None) or 'ascii'
+            out.write(text.encode(encoding,'replace').decode(encoding))
+
+        out.flush()
+
+
+COLUMNARSTYLES=['parquet','arrow']
+
+
+# getcolumnartype
+# the arrow type for a column from its values: bool, int64 or float64 when every value is one, otherwise string
+# integers too wide for int64 make the column a string so they are written exactly
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 integers wider than 64 bits give a string column
+
+def getcolumnartype(values):
+
+    values=[value for value in values if value is not None]
+    numbers=[value for value in values if isinstance(value,(int,float)) and not isinstance(value,bool)]
+
+    if any(isinstance(value,int) and not -2**63<=value<2**63 for value in numbers):
+        return pyarrow.string()
+
+    if values and all(isinstance(value,bool) for value in values):
+        return pyarrow.bool_()
+    if values and all(isinstance(value,int) for value in numbers) and len(numbers)==len(values):
+        return pyarrow.int64()
+    if values and len(numbers)==len(values):
+        return pyarrow.float64()
+
+    return pyarrow.string()
+
+
+# getcolumnarvalue
+# convert a value to the type of its column, lists and dicts become json, raises ValueError when a value does not
+# fit, e.g. a string in an int64 column, so no value is lost without notice
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 a value that does not fit raises ValueError instead of being written as None
+
+def getcolumnarvalue(value,arrowtype):
+
+    if value is None:
+        return None
+
+    if arrowtype==pyarrow.string():
+        if isinstance(value,(dict,list)): return jsondumps(value)
+        return str(value)
+
+    if arrowtype==pyarrow.bool_():
+        if isinstance(value,bool): return value
+
+    elif arrowtype==pyarrow.int64():
+        if isinstance(value,int) and not isinstance(value,bool) and -2**63<=value<2**63: return value
+        # a whole number written as a float, e.g. 3.0, still fits
+        if isinstance(value,float) and value.is_integer() and -2**63<=value<2**63: return int(value)
+
+    elif isinstance(value,(int,float)) and not isinstance(value,bool):
+        return float(value)
+
+    raise ValueError("the value "+repr(value)+" of type "+type(value).__name__+" does not fit a column of type "+str(arrowtype))
+
+
+# printitems
+# prints a list or a generator of items, for example from iterpaged, in the style requested as they arrive
+# all the styles of printresult are supported, json and simplejson print {"items": [...], "count": n}
+# change history
+#   18OCT2026 initial development
+
+def printitems(items,output_style,colsforcsv=["id","name","type","description","creationTimeStamp","modifiedTimeStamp"],header=1,total=None):
+
+    writer=ResultWriter(output_style,colsforcsv,header)
+
+    for item in items:
+        writer.writeitem(item)
+
+    writer.close(total)
 
 
 # file_accessible
@@ -681,6 +2163,8 @@ def file_accessible(filepath, mode):
 #   28oct2018 initial development
 #   22dec2018 add csv columns only relevent for csv output, defaults provided but can be overriden when called
 #   20feb2020 add simplejson output style
+#   18OCT2026 add jsonl, parquet and arrow output styles
+#   18OCT2026 json is encoded with jsondumps
 
 def printresult(result,output_style,colsforcsv=["id","name","type","description","creationTimeStamp","modifiedTimeStamp"],header=1):
 
@@ -688,14 +2172,17 @@ def printresult(result,output_style,colsforcsv=["id","name","type","description"
     # print rest call results
     if type(result) is dict:
 
-        if output_style=='simple':
+        if output_style in ['jsonl']+COLUMNARSTYLES:
+            if 'items' in result: printitems(result['items'],output_style,colsforcsv,header)
+            else: printitems([result],output_style,colsforcsv,header)
+        elif output_style=='simple':
             simpleresults(result)
         elif output_style=='simplejson':
             simplejsonresults(result)
         elif output_style=='csv':
             csvresults(result,columns=colsforcsv,header=header)
         else:
-            print(json.dumps(result,indent=2))
+            ResultWriter.printtext(jsondumps(result,indent=2)+'\n')
     else: print(result)
 
 
@@ -785,27 +2272,219 @@ def getprofileinfo(myprofile):
 
 
 
+# PathCache
+# the folder paths found so far by this process, so getpath and getfolderid only call the server for folders
+# they have not seen. Folders are keyed by uri and by path and every other object by the uri of its parent
+# folder. The cache is filled from results already in hand: the folders returned by getfolderid, every folder
+# in an ancestors response and the parentFolderUri of the items of a /members listing (addmembers).
+# getpath of an object is the path of its parent folder followed by a /, as returned by getpath.
+# change history
+#   18OCT2026 initial development
+
+class PathCache(object):
+
+    def __init__(self):
+
+        self.lock=threading.RLock()
+        self.folderpaths={}    # folder uri to path, /a/b
+        self.folders={}        # path to folder json returned by /folders/folders/@item
+        self.parents={}        # object uri to the uri of its parent folder
+        self.names={}          # folder uri to name, for folders whose path is not known yet
+
+    def clear(self):
+
+        with self.lock:
+            self.folderpaths.clear()
+            self.folders.clear()
+            self.parents.clear()
+            self.names.clear()
+
+    @staticmethod
+    def normalize(path):
+
+        if path!='/':
+            path=path.rstrip('/')
+
+        return path
+
+    def getfolder(self,path):
+
+        return self.folders.get(self.normalize(path))
+
+    def addfolder(self,path,folder):
+
+        path=self.normalize(path)
+
+        with self.lock:
+            self.folders[path]=folder
+            self.folderpaths['/folders/folders/'+folder['id']]=path
+            if 'parentFolderUri' in folder:
+                self.parents['/folders/folders/'+folder['id']]=folder['parentFolderUri']
+
+    # ancestors are in order from the parent folder of the object to the root folder
+    def addancestors(self,objecturi,ancestors):
+
+        with self.lock:
+
+            path=''
+            parenturi=None
+
+            for ancestor in reversed(ancestors):
+                folderuri='/folders/folders/'+ancestor['id']
+                path=path+'/'+ancestor['name']
+                self.folderpaths[folderuri]=path
+                if parenturi is not None: self.parents[folderuri]=parenturi
+                parenturi=folderuri
+
+            if parenturi is not None:
+                self.parents[objecturi]=parenturi
+            else:
+                # no ancestors, a root folder
+                self.parents[objecturi]=None
+
+    # the items of a /members listing, with recursive=true this gives the path of every folder below the one listed
+    def addmembers(self,items,parenturi=None):
+
+        with self.lock:
+            for item in items:
+                if 'uri' not in item:
+                    continue
+                itemparent=item.get('parentFolderUri',parenturi)
+                if itemparent is not None:
+                    self.parents[item['uri']]=itemparent
+                if item.get('contentType')=='folder' and 'name' in item:
+                    self.names[item['uri']]=item['name']
+
+    # the path of a folder from its uri, or None when it cannot be worked out from the cache
+    def getfolderpath(self,folderuri):
+
+        with self.lock:
+
+            unresolved=[]
+
+            while folderuri not in self.folderpaths:
+                if folderuri not in self.names or folderuri not in self.parents or self.parents[folderuri] is None or folderuri in unresolved:
+                    return None
+                unresolved.append(folderuri)
+                folderuri=self.parents[folderuri]
+
+            path=self.folderpaths[folderuri]
+
+            # build the paths of the folders on the way down and keep them
+            for folderuri in reversed(unresolved):
+                path=path+'/'+self.names[folderuri]
+                self.folderpaths[folderuri]=path
+
+            return path
+
+    # the path returned by getpath, or None when the object is not in the cache
+    def getpath(self,objecturi):
+
+        with self.lock:
+
+            if objecturi not in self.parents:
+                return None
+
+            parenturi=self.parents[objecturi]
+
+            # a root folder
+            if parenturi is None:
+                return '/'
+
+            parentpath=self.getfolderpath(parenturi)
+
+            if parentpath is None:
+                return None
+
+            return parentpath.rstrip('/')+'/'
+
+
+# getpathcache
+# return the PathCache for this process
+# change history
+#   18OCT2026 initial development
+
+_pathcache=PathCache()
+
+def getpathcache():
+
+    return _pathcache
+
+
 # getpath
 # when a Viya objectURI is passed in return the path
 # change history
 #   14JAN2019 initial development
+#   18OCT2026 path building moved to _ancestorspath so it can be shared with getpaths
+#   18OCT2026 the path is built from the path cache when the parent folder is known
 
 def getpath(objecturi):
 
-    # build the request parameters
-    reqval='/folders/ancestors?childUri='+objecturi
-    reqtype='get'
+    pathcache=getpathcache()
+    path=pathcache.getpath(objecturi)
+
+    if path is None:
+
+        # build the request parameters
+        reqval='/folders/ancestors?childUri='+objecturi
+        reqtype='get'
+        accept='application/vnd.sas.content.folder.ancestor+json'
+
+        ancestors_result_json=callrestapi(reqval,reqtype,accept)
+        #print(ancestors_result_json)
+
+        path=_ancestorspath(objecturi,ancestors_result_json)
+
+    return path
+
+# getpaths
+# return the paths of a list of objectURIs in the same order, the ancestor requests are made concurrently
+# an object whose ancestors cannot be retrieved has a path of None
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 only objects not in the path cache are requested
+
+def getpaths(objecturis,max_workers=None):
+
+    pathcache=getpathcache()
+
+    # only ask for the ancestors of objects whose path is not known already, once for each object
+    unknown=[]
+    for objecturi in objecturis:
+        if pathcache.getpath(objecturi) is None and objecturi not in unknown:
+            unknown.append(objecturi)
+
     accept='application/vnd.sas.content.folder.ancestor+json'
+    requestlist=[{'reqval':'/folders/ancestors?childUri='+objecturi,'reqtype':'get','acceptType':accept} for objecturi in unknown]
+
+    found={}
+    for objecturi,restresult in zip(unknown,callrestapi_many(requestlist,max_workers)):
+        found[objecturi]=_ancestorspath(objecturi,restresult.result)
+
+    paths=[]
+    for objecturi in objecturis:
+        if objecturi in found: paths.append(found[objecturi])
+        else: paths.append(pathcache.getpath(objecturi))
+
+    return paths
 
-    ancestors_result_json=callrestapi(reqval,reqtype,accept)
-    #print(ancestors_result_json)
+# _ancestorspath
+# build the path from the result of a /folders/ancestors request
+# change history
+#   18OCT2026 initial development, split out of getpath
+#   18OCT2026 add the ancestor folders to the path cache
+
+def _ancestorspath(objecturi,ancestors_result_json):
 
-    if not 'ancestors' in ancestors_result_json:
+    if not isinstance(ancestors_result_json,dict) or not 'ancestors' in ancestors_result_json:
         print("NOTE: Could not get ancestor folders of ObjectURI '"+objecturi+"'.")
         path=None
     else:
         ancestors = ancestors_result_json['ancestors']
 
+        # every ancestor is a folder whose path is now known
+        getpathcache().addancestors(objecturi,ancestors)
+
         path=''
 
         #For each principle's section in the explanations section of the data returned from the REST API call...
@@ -821,6 +2500,7 @@ def getpath(objecturi):
 # Viya objectURI is input, assorted fields are returned
 # change history
 #   14OCT2022 initial development
+#   18OCT2026 use the returned result rather than the global so it can be called from threads
 
 def getobjectdetails(objecturi):
 
@@ -828,7 +2508,7 @@ def getobjectdetails(objecturi):
     reqval=objecturi
     reqtype='get'
 
-    callrestapi(reqval,reqtype)
+    result=callrestapi(reqval,reqtype)
 
     # verfiyc objectURI input found and return attributes
     if result==None:
@@ -874,6 +2554,7 @@ def getidsanduris(resultdata):
 # this will return a more readable json output
 # change history
 #   20feb2020 initial development
+#   18OCT2026 json is encoded with jsondumps
 
 def simplejsonresults(resultdata):
 
@@ -894,12 +2575,12 @@ def simplejsonresults(resultdata):
                 if key=='links':
                      del resultdata['items'][i][key]
 
-        print(json.dumps(resultdata,indent=2))
+        ResultWriter.printtext(jsondumps(resultdata,indent=2)+'\n')
 
     elif 'id' in resultdata:  #one item returned by rest call
 
         del resultdata['links']
-        print(json.dumps(resultdata,indent=2))
+        ResultWriter.printtext(jsondumps(resultdata,indent=2)+'\n')
 
 
 #The get_valid_filename function is taken from https://github.com/django/django/blob/master/django/utils/text.py.
@@ -1022,29 +2703,211 @@ def updateconfigurationproperty(command):
 # Built in support for paging in the REST API, will loop through and get all pages of results
 # Change history
 #   10Jun2026 - Initial deployment
+#   18OCT2026 - Uses iterpaged, params are now passed to the request
+#   18OCT2026 - Added fields, excludelinks and acceptItem, see iterpaged
+
+def callpagedrestapi(reqval, reqtype, acceptType='application/json', contentType='application/json',data={},header={},stoponerror=1,params={},fields=None,excludelinks=None,acceptItem=None):
+
+    # get the items from all pages into one list
+    all_items = list(iterpaged(reqval, reqtype=reqtype, acceptType=acceptType, contentType=contentType, data=data, header=header, params=params, stoponerror=stoponerror, fields=fields, excludelinks=excludelinks, acceptItem=acceptItem))
+
+    return all_items
+
+# iterpaged
+# generator that yields the items of a collection as each page arrives, so processing can start
+# before the whole collection has been read and only one page is held in memory
+#   page_size   number of items requested per page (the limit query parameter)
+#   start       offset of the first item (the start query parameter)
+#   limit       stop after this many items have been returned, None returns all items
+#   pageinfo    optional dictionary, count is set from the first page and pages to the number of pages read,
+#               error is set when a page could not be read with stoponerror=0, the listing is then incomplete
+#   prefetch    number of pages to request concurrently, see below
+#   fields      the fields of each item the caller uses, the other fields are dropped as each page is decoded
+#   excludelinks  ask the service not to return the links of each item (excludeItemLinks=true), the default
+#               when fields is set and does not include links
+#   acceptItem  media type of the items, e.g. application/vnd.sas.summary+json for the compact summary of each
+#               item, only use it with services that support it
+# pages are read by following the link with rel=next. When prefetch is more than 1 the count returned with the
+# first page is used to request the remaining pages by start offset, with up to prefetch pages in flight at a
+# time. The items are still yielded in order. If the first page has no count the next links are followed.
+# Change history
+#   18OCT2026 - Initial deployment
+#   18OCT2026 - Added prefetch
+#   18OCT2026 - Added fields, excludelinks and acceptItem
+#   18OCT2026 - pageinfo error is set when the listing stopped on an error
 
-def callpagedrestapi(reqval, reqtype, acceptType='application/json', contentType='application/json',data={},header={},stoponerror=1):
+def iterpaged(reqval, page_size=None, start=None, limit=None, reqtype='get', acceptType='application/json', contentType='application/json',data={},header={},params={},stoponerror=1,pageinfo=None,prefetch=None,fields=None,excludelinks=None,acceptItem=None):
 
-    # Initialize an empty list to store the items from all pages
-    all_items = []
+    if pageinfo is None: pageinfo={}
+    pageinfo['count']=None
+    pageinfo['pages']=0
+    pageinfo['error']=None
 
-    # Call the REST API for the first page
-    response = callrestapi(reqval, reqtype, acceptType, contentType, data, header, stoponerror)
+    # limit and start replace any that are already in the request
+    if page_size is not None: reqval=setqueryparameter(reqval,'limit',page_size)
+    if start is not None: reqval=setqueryparameter(reqval,'start',start)
 
-    # Check for items in the response and add them to the list
-    if "items" in response:
-        all_items.extend(response["items"])
-    
-    # Check for a rel "next" link to see if there are more pages of results
-    while "links" in response and any(link.get("rel") == "next" for link in response["links"]):
-        next_link = next(link for link in response["links"] if link.get("rel") == "next")
-        next_url = next_link.get("href")
+    if excludelinks is None: excludelinks=fields is not None and 'links' not in fields
+    if excludelinks: reqval=setqueryparameter(reqval,'excludeItemLinks','true')
+
+    if acceptItem is not None:
+        acceptType='application/vnd.sas.collection+json'
+        header=dict(header)
+        header['Accept-Item']=acceptItem
+
+    returned=0
+
+    while reqval is not None:
+
+        if limit is not None and returned>=limit: return
+
+        response = callrestapi(reqval, reqtype, acceptType, contentType, data, header, params, stoponerror)
+
+        if not isinstance(response,dict):
+            pageinfo['error']="cannot read page "+reqval
+            return
+
+        firstpage=pageinfo['pages']==0
+
+        pageinfo['pages']=pageinfo['pages']+1
+        if pageinfo['count'] is None: pageinfo['count']=response.get('count')
+
+        for item in response.get('items',[]):
+
+            if limit is not None and returned>=limit: return
+
+            returned=returned+1
+            yield projectitem(item,fields)
+
+        # the next link already has the query parameters of the request
+        nextlink=getnextlink(response)
+
+        # the rest of the pages can be requested by offset
+        if firstpage and prefetch is not None and prefetch>1 and reqtype=='get' and nextlink is not None and isinstance(pageinfo['count'],int):
+
+            for item in _iterprefetchedpages(reqval,response,returned,limit,prefetch,acceptType,contentType,data,header,params,stoponerror,pageinfo):
+                yield projectitem(item,fields)
+            return
+
+        # make sure the next page leaves out the links as well
+        if nextlink is not None and excludelinks: nextlink=setqueryparameter(nextlink,'excludeItemLinks','true')
+
+        reqval=nextlink
+        params={}
+
+# _iterprefetchedpages
+# yield the items of the pages after the first one, requesting up to prefetch pages concurrently by start offset
+# Change history
+#   18OCT2026 - Initial deployment
+
+def _iterprefetchedpages(reqval,firstresponse,returned,limit,prefetch,acceptType,contentType,data,header,params,stoponerror,pageinfo):
+
+    # the page size is the limit the service used for the first page
+    pagesize=firstresponse.get('limit') or len(firstresponse.get('items',[]))
+    if not pagesize: return
+
+    firststart=firstresponse.get('start',0) or 0
+    total=pageinfo['count']
+    if limit is not None: total=min(total,firststart+limit)
+
+    pagerequests=[]
+    for pagestart in range(firststart+pagesize,total,pagesize):
+        pagereqval=setqueryparameter(setqueryparameter(reqval,'limit',pagesize),'start',pagestart)
+        pagerequests.append({'reqval':pagereqval,'reqtype':'get','acceptType':acceptType,'contentType':contentType,'data':data,'header':header,'params':params})
+
+    inflight=collections.deque()
+    pending=iter(pagerequests)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=prefetch) as executor:
+
+        # keep up to prefetch pages in flight, yield the oldest page first so items stay in order
+        for pagerequest in pending:
+            inflight.append(executor.submit(_callrestapi_limited,pagerequest))
+            if len(inflight)>=prefetch: break
+
+        while inflight:
+
+            restresult=inflight.popleft().result()
+
+            for pagerequest in pending:
+                inflight.append(executor.submit(_callrestapi_limited,pagerequest))
+                break
+
+            if restresult.error is not None:
+                # a request that failed without a response has no status code, only the error
+                if restresult.status_code is not None:
+                    print("http response code: "+ str(restresult.status_code))
+                    print("ret.text: "+restresult.error)
+                else:
+                    print("ERROR: request get "+restresult.request['reqval']+" failed: "+restresult.error)
+                for future in inflight: future.cancel()
+                if stoponerror: sys.exit()
+                pageinfo['error']=restresult.error
+                return
+
+            pageinfo['pages']=pageinfo['pages']+1
+
+            for item in restresult.result.get('items',[]):
+
+                if limit is not None and returned>=limit:
+                    for future in inflight: future.cancel()
+                    return
+
+                returned=returned+1
+                yield item
+
+# getnextlink
+# return the href of the link with rel=next in a collection response, None if it is the last page
+# Change history
+#   18OCT2026 - Initial deployment
+
+def getnextlink(response):
+
+    for link in response.get('links',[]):
+        if link.get('rel')=='next':
+            return link.get('href')
+
+    return None
+
+# projectitem
+# return an item with only the fields listed, or the item itself when fields is None
+# Change history
+#   18OCT2026 - Initial deployment
+
+def projectitem(item,fields):
+
+    if fields is None:
+        return item
+
+    return {field:item[field] for field in fields if field in item}
+
+
+# getoutputfields
+# the fields a tool needs to ask iterpaged for: the columns for output styles that only print the columns,
+# None for the json styles that print the whole item
+# Change history
+#   18OCT2026 - Initial deployment
+
+def getoutputfields(output_style,columns):
+
+    if output_style in ['csv']+COLUMNARSTYLES:
+        return list(columns)
+
+    return None
+
+
+# setqueryparameter
+# set a query parameter in a request, replacing the parameter if it is already there
+# Change history
+#   18OCT2026 - Initial deployment
+
+def setqueryparameter(reqval,name,value):
 
-        # Call the REST API for the next page
-        response = callrestapi(next_url, reqtype, acceptType, contentType, data, header, stoponerror)
+    reqval=re.sub(r'([?&])'+name+r'=[^&]*&?',r'\1',reqval)
+    reqval=reqval.rstrip('&')
 
-        # Check for items in the response and add them to the list
-        if "items" in response:
-            all_items.extend(response["items"])
+    if '?' not in reqval: sep='?'
+    elif reqval.endswith('?'): sep=''
+    else: sep='&'
 
-    return all_items
\ No newline at end of file
+    return reqval+sep+name+'='+str(value)
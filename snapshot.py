@@ -0,0 +1,230 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# snapshot.py
+# October 2026
+#
+# A pipeline that exports many objects, each to its own transfer package file, in three stages:
+#
+#   enumerate   the caller lists the objects to export, and can find their folder paths concurrently with getpaths
+#   export      an export job is created for each object and polled until its package is ready, at most
+#               workers export jobs run on the server at a time
+#   download    each package is streamed to its file, and deleted from the server when asked, on a separate pool
+#               so downloads run while the next exports are still in progress
+#
+# The stages overlap, so the time taken grows with the number of objects divided by the number of workers
+# rather than with the sum of the round trips. The results are returned as each object finishes.
+#
+# SnapshotPipeline
+#   run    export the items of an iterable, each a dictionary with uri, filename and optionally name and
+#          includedependencies, and return a result for each item as it finishes
+#
+# Each result is the item with packageid and error added, error is None when the package was written.
+#
+# SnapshotManifest
+#   a file in the snapshot directory with an entry for each object that has a package there: its id, uri,
+#   path, modifiedTimeStamp, etag and package file. ischanged tells whether an object was added or changed
+#   since its package was written, update records a package that was written and removeobsolete deletes the
+#   packages of objects that no longer exist, so a run only exports what has changed.
+#
+# Example:
+#
+#   from snapshot import SnapshotPipeline
+#
+#   pipeline=SnapshotPipeline(workers=4,remove=True)
+#   items=[{'uri':'/reports/reports/'+id,'filename':'/tmp/snapshot/'+id+'.json'} for id in reportids]
+#   for result in pipeline.run(items):
+#       print(result['uri'],result['error'] or 'exported')
+#
+#   manifest=SnapshotManifest('/tmp/snapshot')
+#   items=[item for item in items if manifest.ischanged(item['uri'],modified,path)]
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 Added SnapshotManifest for incremental snapshots
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import concurrent.futures
+import json
+import os
+import queue
+import threading
+import uuid
+
+from transfer import exportandwait, downloadpackage, deletepackage
+
+
+class SnapshotPipeline(object):
+
+    def __init__(self,workers=1,downloadworkers=None,remove=False,timeout=None):
+
+        if downloadworkers is None:
+            downloadworkers=workers
+
+        self.workers=max(1,workers)
+        self.downloadworkers=max(1,downloadworkers)
+        self.remove=remove
+        self.timeout=timeout
+
+    # export every item and return the results as they finish
+    # a new export is only started when one of the workers export jobs has finished, so the items are read
+    # from the iterable as the pipeline has room for them
+    def run(self,items):
+
+        results=queue.Queue()
+        slots=threading.Semaphore(self.workers)
+        pending=0
+
+        exporter=concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        downloader=concurrent.futures.ThreadPoolExecutor(max_workers=self.downloadworkers)
+
+        try:
+
+            for item in items:
+
+                # wait for a free export slot, handing back the results that finish in the meantime
+                while not slots.acquire(timeout=0.1):
+                    while True:
+                        try:
+                            result=results.get_nowait()
+                        except queue.Empty:
+                            break
+                        pending=pending-1
+                        yield result
+
+                exporter.submit(self._export,dict(item),slots,downloader,results)
+                pending=pending+1
+
+            while pending>0:
+                result=results.get()
+                pending=pending-1
+                yield result
+
+        finally:
+            exporter.shutdown(wait=True)
+            downloader.shutdown(wait=True)
+
+    # export stage, the slot is given back as soon as the package is ready so the next export can start
+    def _export(self,item,slots,downloader,results):
+
+        try:
+            packageid,error=exportandwait([item['uri']],item.get('name') or str(uuid.uuid1()),
+                                          includedependencies=item.get('includedependencies',False),timeout=self.timeout)
+        except (Exception, SystemExit) as e:
+            # a request that stops the tool must not leave the pipeline waiting for this item
+            packageid,error=None,str(e)
+        finally:
+            slots.release()
+
+        item['packageid']=packageid
+        item['error']=error
+
+        if packageid is None:
+            results.put(item)
+        else:
+            downloader.submit(self._download,item,results)
+
+    # download stage
+    def _download(self,item,results):
+
+        try:
+            if downloadpackage(item['packageid'],item['filename']) is None:
+                item['error']="cannot download package "+item['packageid']+" to "+item['filename']
+            elif self.remove:
+                deletepackage(item['packageid'])
+        except (Exception, SystemExit) as e:
+            item['error']=str(e)
+
+        results.put(item)
+
+
+class SnapshotManifest(object):
+
+    FILENAME='snapshot-manifest.json'
+
+    def __init__(self,directory):
+
+        self.directory=directory
+        self.filename=os.path.join(directory,self.FILENAME)
+        self.entries={}        # object uri to its entry
+        self.seen=set()        # uris of the objects that are still on the server
+
+        if os.path.isfile(self.filename):
+            with open(self.filename) as f:
+                self.entries=json.load(f).get('entries',{})
+
+    # True when the object is not in the manifest, its modifiedTimeStamp, etag or path is different, or its
+    # package file is missing, every object asked about is taken to still exist
+    def ischanged(self,uri,modified,path=None,etag=None):
+
+        self.seen.add(uri)
+        entry=self.entries.get(uri)
+
+        if entry is None:
+            return True
+        if entry.get('modifiedTimeStamp')!=modified or entry.get('path')!=path:
+            return True
+        if etag is not None and entry.get('etag')!=etag:
+            return True
+
+        return not os.path.isfile(os.path.join(self.directory,entry['filename']))
+
+    # the package file of an object from the last run, so a changed object keeps its file name
+    def getfilename(self,uri):
+
+        entry=self.entries.get(uri)
+        if entry is None:
+            return None
+
+        return os.path.join(self.directory,entry['filename'])
+
+    # record a package that was written, a file left from an earlier name of the object is removed
+    def update(self,uri,filename,modified,path=None,etag=None):
+
+        filename=os.path.relpath(filename,self.directory)
+        previous=self.entries.get(uri)
+
+        if previous is not None and previous['filename']!=filename:
+            self._removefile(previous['filename'])
+
+        self.entries[uri]={'id':uri.rstrip('/').split('/')[-1],'uri':uri,'path':path,'modifiedTimeStamp':modified,
+                           'etag':etag,'filename':filename}
+        self.seen.add(uri)
+
+    # remove the entries and package files of objects that were not seen in this run, returns their uris
+    def removeobsolete(self):
+
+        removed=[uri for uri in self.entries if uri not in self.seen]
+
+        for uri in removed:
+            self._removefile(self.entries.pop(uri)['filename'])
+
+        return removed
+
+    def _removefile(self,filename):
+
+        filename=os.path.join(self.directory,filename)
+        if os.path.isfile(filename):
+            os.remove(filename)
+
+    def save(self):
+
+        tmpfile=self.filename+'.'+str(os.getpid())+'.tmp'
+        with open(tmpfile,'w') as f:
+            json.dump({'version':1,'entries':self.entries},f,indent=1)
+        os.replace(tmpfile,self.filename)
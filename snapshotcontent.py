@@ -9,6 +9,13 @@
 # returning content modified in the last 1 day 
 # to get original beavhours behaviour use -c 25000
 #
+# October 2026 content is exported with the transfer REST API rather than the sas-viya CLI
+# October 2026 added --workers to export and download several items at a time
+# October 2026 added --incremental to export only the content added or changed since the last snapshot
+# October 2026 added --store and --keepdays to keep the packages in a deduplicated snapshot store
+# October 2026 an incremental snapshot also compares the ETag of the content, read with a HEAD request
+# October 2026 --keepdays without --store is an error
+#
 # this tool will export all the content in a specified folder to
 # individual json file in a directory.
 #
@@ -31,9 +38,11 @@
 
 # Import Python modules
 import re
-import argparse, sys, subprocess, uuid, time, os, glob, json
+import argparse, sys, uuid, time, os, glob, json
 from datetime import datetime, timedelta
-from sharedfunctions import getfolderid, callrestapi, getpath, getapplicationproperties, get_valid_filename, createdatefilter,getclicommand, getpath
+from sharedfunctions import getfolderid, callrestapi, callrestapi_many, iterpaged, getpaths, getpathcache, getapplicationproperties, get_valid_filename, createdatefilter
+from snapshot import SnapshotPipeline, SnapshotManifest
+from snapshotstore import SnapshotStore
 
 # get python version
 version=int(str(sys.version_info[0]))
@@ -48,6 +57,10 @@ parser.add_argument("-c","--changeddays", help="Content changed in the how many
 #parser.add_argument("--types", help="Content Type in.",default=None)
 parser.add_argument("-t","--transferremove", help="Remove transfer file from Infrastructure Data Server after download.", action='store_true')
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull. Default is 1000.",default=1000)
+parser.add_argument("-i","--incremental", help="Keep the packages in the directory and export only the content added or changed since they were written, packages of deleted content are removed. --changeddays is not used.", action='store_true')
+parser.add_argument("--store", help="Keep the packages in a deduplicated, compressed snapshot store in this directory rather than as json files in --directory.",default=None)
+parser.add_argument("--keepdays", type=int, help="With --store, remove runs older than this many days and the packages only they use.",default=None)
+parser.add_argument("-w","--workers", type=int,help="Number of export jobs to run on the server at a time. Default is 1.",default=1)
 
 args= parser.parse_args()
 
@@ -57,6 +70,21 @@ quietmode=args.quiet
 autotranferremove=args.transferremove
 folderpath=args.folderpath
 limit=args.limit
+workers=args.workers
+incremental=args.incremental
+storedir=args.store
+keepdays=args.keepdays
+
+# an incremental snapshot needs its packages in the directory
+if incremental and storedir is not None:
+    print("ERROR: --incremental and --store cannot be used together.")
+    sys.exit(1)
+
+# --keepdays removes old runs from a snapshot store
+if keepdays is not None and storedir is None:
+    print("ERROR: --keepdays can only be used with --store.")
+    sys.exit(1)
+
 days_delta=args.changeddays
 #type=args.type
 #includesubfolder=args.includesubfolder
@@ -70,11 +98,8 @@ except ValueError:
 today = datetime.now().date()
 modifiedafter_dt = datetime.combine(today - timedelta(days=days_delta), datetime.min.time())
 
-# get cli location from properties, check that cli is there if not ERROR and stop
-clicommand=getclicommand()
-
-# prompt if directory exists because existing json files are deleted
-if os.path.exists(basedir):
+# prompt if directory exists because existing json files are deleted, an incremental snapshot keeps them
+if os.path.exists(basedir) and not incremental:
 
 	# if the quiet mode flag is not passed then prompt to continue
 	if not quietmode:
@@ -104,7 +129,7 @@ if areyousure.upper() =='Y':
 
 	# create directory if it doesn't exist
 	if not os.path.exists(path): os.makedirs(path)
-	else:
+	elif not incremental:
 		filelist=glob.glob(path+"/*.json")
 		for file in filelist:
 			os.remove(file)
@@ -113,7 +138,13 @@ if areyousure.upper() =='Y':
 	reqtype='get'
 	reqval='/folders/folders/'+folderid+'/members?recursive=true&followReferences=true&limit='+str(limit)
 	
-	resultdata=callrestapi(reqval,reqtype)
+	# an incremental snapshot reads every page so that content missing from the listing has really been deleted
+	if incremental:
+		manifest=SnapshotManifest(path)
+		allitems=list(iterpaged(reqval,page_size=limit))
+		resultdata={'items':allitems,'count':len(allitems)}
+	else:
+		resultdata=callrestapi(reqval,reqtype)
 
 	#print(json.dumps(resultdata,indent=2))
 
@@ -130,6 +161,20 @@ if areyousure.upper() =='Y':
 
 			content_exported=0
 
+			# the paths of the items come from the listing, any that are not known are requested concurrently
+			getpathcache().addmembers(resultdata['items'],folderuri)
+			itempaths=getpaths([item["uri"] for item in resultdata['items']],workers)
+
+			# the etag of the content catches a change that leaves modifiedTimeStamp as it was, the listing has no etags
+			itemetags={}
+			if incremental:
+				itemuris=[item["uri"] for item in resultdata['items'] if item["contentType"]!="folder"]
+				headresults=callrestapi_many([{'reqval':uri,'reqtype':'head','nocache':True} for uri in itemuris],workers)
+				itemetags=dict(zip(itemuris,[result.etag for result in headresults]))
+
+			# the content to export, the exports run in the pipeline below
+			exportitems=[]
+
 			for i in range(0,returned_items):
 
 				id=resultdata['items'][i]["id"]
@@ -139,7 +184,7 @@ if areyousure.upper() =='Y':
 				created=resultdata['items'][i]["creationTimeStamp"]
 				name=resultdata['items'][i]["name"]
 
-				itempath=getpath(uri)
+				itempath=itempaths[i] or ""
 				startoffile=itempath.replace("/","_")
 				# Parse ISO 8601 dates for comparison
 				try:
@@ -155,55 +200,82 @@ if areyousure.upper() =='Y':
 					except ValueError:
 						modified_dt = None
 
-				if contenttype != "folder":
+				if contenttype != "folder" and incremental:
 
-					if (modified_dt >= modifiedafter_dt):
-				
-						json_name=get_valid_filename(startoffile+"_"+resultdata['items'][i]["name"].replace(" ","")+'_'+str(i))
-						package_name=str(uuid.uuid1())
-						command=clicommand+' transfer export -u '+uri+' --name "'+package_name+'"'
+					etag=itemetags.get(uri)
 
-						try:
-							print(command)
-						except UnicodeEncodeError:
-							print(command.encode('ascii','replace'))
+					if manifest.ischanged(uri,modified,itempath,etag):
 
-						rc=subprocess.call(command, shell=True)
-						
-						# if the export command fails then skip to the next item
-						if rc != 0:
-							print("ERROR: There was a problem exporting content '"+ name + "', command returned code "+str(rc))
-							continue
+						# the file name stays the same while the path of the content does not change
+						completefile=manifest.getfilename(uri)
+						if completefile is None or manifest.entries[uri].get('path')!=itempath:
+							json_name=get_valid_filename(startoffile+"_"+name.replace(" ","")+'_'+uri.rstrip('/').split('/')[-1])
+							completefile=os.path.join(path,json_name+'.json')
 
-						content_exported=content_exported+1	
-						reqval='/transfer/packages?filter=eq(name,"'+package_name+'")'
-						package_info=callrestapi(reqval,reqtype)
+						exportitems.append({'uri':uri,'filename':completefile,'name':str(uuid.uuid1()),'contenttype':contenttype,'itemname':name,'modified':modified,'itempath':itempath,'etag':etag})
 
-						package_id=package_info['items'][0]['id']
+				elif contenttype != "folder":
 
+					if (modified_dt >= modifiedafter_dt):
+				
+						json_name=get_valid_filename(startoffile+"_"+resultdata['items'][i]["name"].replace(" ","")+'_'+str(i))
 						completefile=os.path.join(path,json_name+'.json')
-						command=clicommand+' transfer download --file '+completefile+' --id '+package_id
-
-						try:
-							print(command)
-						except UnicodeEncodeError:
-							print(command.encode('ascii','replace'))
-
-						subprocess.call(command, shell=True)
-
-						print("NOTE: "+contenttype+" '"+ name + "' was exported to " + completefile + " (modified: " + str(modified) + ", after: " + str(modifiedafter_dt) + ")")
-						time.sleep(1)
-						if autotranferremove:
-							print(clicommand+' transfer delete --id '+package_id+"\n")
-							remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-							remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-							remTransferObject.wait()
+
+						exportitems.append({'uri':uri,'filename':completefile,'name':str(uuid.uuid1()),'contenttype':contenttype,'itemname':name,'modified':modified})
 					else:
 						if contenttype != "folder":
 							print("NOTE: " +contenttype+" '"+ name + "' was modified on "+str(modified)+", which is before "+str(modifiedafter_dt)+", content not exported.")
 
 
+			# export the content, download the packages and remove them from the server if asked to
+			pipeline=SnapshotPipeline(workers=workers,remove=autotranferremove)
+
+			store=None
+			if storedir is not None:
+				store=SnapshotStore(storedir)
+				store.startrun()
+
+			for result in pipeline.run(exportitems):
+
+				# if the export fails then go on to the next item
+				if result['error'] is not None:
+					print("ERROR: There was a problem exporting content '"+ result['itemname'] + "': "+result['error'])
+					continue
+
+				content_exported=content_exported+1
+
+				if incremental:
+					manifest.update(result['uri'],result['filename'],result['modified'],result['itempath'],result['etag'])
+					print("NOTE: "+result['contenttype']+" '"+ result['itemname'] + "' was exported to " + result['filename'] + " (modified: " + str(result['modified']) + ")")
+
+					# save the manifest now and then so an interrupted run does not export the same content again
+					if content_exported % 50 == 0: manifest.save()
+				else:
+					print("NOTE: "+result['contenttype']+" '"+ result['itemname'] + "' was exported to " + result['filename'] + " (modified: " + str(result['modified']) + ", after: " + str(modifiedafter_dt) + ")")
+
+				# the package is moved into the snapshot store, a package that is already there is not stored again
+				if store is not None:
+					store.putfile(os.path.splitext(os.path.basename(result['filename']))[0],result['filename'])
+					os.remove(result['filename'])
+
+			# write the index of this run and remove the runs that are past the retention period
+			if store is not None:
+				print("NOTE: run "+store.runname+" written to snapshot store "+store.saverun())
+				if keepdays is not None:
+					pruned=store.prune(keepdays)
+					if pruned is None:
+						print("NOTE: another run is using the snapshot store, old runs are removed by the next run")
+					else:
+						print("NOTE: "+str(len(pruned[0]))+" runs and "+str(pruned[1])+" packages removed from the snapshot store")
+
 			print("NOTE: "+str(content_exported)+" content items exported to json files in "+path)
 
+		# remove the packages of content that has been deleted
+		if incremental:
+			for uri in manifest.removeobsolete():
+				print("NOTE: content "+uri+" no longer exists, its package was removed")
+			manifest.save()
+			print("NOTE: "+str(len(manifest.entries))+" content items in the snapshot in "+path)
+
 else:
 	 print("NOTE: Operation cancelled")
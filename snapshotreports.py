@@ -23,6 +23,10 @@
 # 10aug2020 add option to auto delete transport file after download completes
 # 09dec2020 add get_valid_filename function to deal with invalid characters for Linux filesystem
 # 20jul2022 add option to include dependencies for reports
+# 18oct2026 reports are exported with the transfer REST API rather than the sas-viya CLI
+# 18oct2026 added --workers to export and download several reports at a time
+# 18oct2026 added --store and --keepdays to keep the packages in a deduplicated snapshot store
+# 18oct2026 --keepdays without --store is an error
 #
 # Copyright Ã‚Â© 2019, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
 #
@@ -41,9 +45,11 @@
 
 # Import Python modules
 import re
-import argparse, sys, subprocess, uuid, time, os, glob
+import argparse, sys, uuid, time, os, glob
 from datetime import datetime as dt, timedelta as td
-from sharedfunctions import getfolderid, callrestapi, getpath, getapplicationproperties, get_valid_filename, createdatefilter,getclicommand
+from sharedfunctions import getfolderid, callrestapi, getpaths, getapplicationproperties, get_valid_filename, createdatefilter
+from snapshot import SnapshotPipeline
+from snapshotstore import SnapshotStore
 
 
 # get python version
@@ -60,6 +66,9 @@ parser.add_argument("-f","--folderpath", help="Folder Path starts with?",default
 parser.add_argument("-t","--tranferremove", help="Remove transfer file after download?", action='store_true')
 parser.add_argument("-i","--includeDependencies", help="Specifies if dependencies want to be included for each of the reports being exported.", action='store_true')
 parser.add_argument("-l","--limit", type=int,help="Specify the number of records to pull. Default is 1000.",default=1000)
+parser.add_argument("--store", help="Keep the packages in a deduplicated, compressed snapshot store in this directory rather than as json files in --directory.",default=None)
+parser.add_argument("--keepdays", type=int, help="With --store, remove runs older than this many days and the packages only they use.",default=None)
+parser.add_argument("-w","--workers", type=int,help="Number of export jobs to run on the server at a time. Default is 1.",default=1)
 
 args= parser.parse_args()
 basedir=args.directory
@@ -67,6 +76,14 @@ quietmode=args.quiet
 autotranferremove=args.tranferremove
 autoIncludeDep=args.includeDependencies
 limit=args.limit
+workers=args.workers
+storedir=args.store
+keepdays=args.keepdays
+
+# --keepdays removes old runs from a snapshot store
+if keepdays is not None and storedir is None:
+    print("ERROR: --keepdays can only be used with --store.")
+    sys.exit(1)
 
 changeddays=args.changeddays
 modby=args.modifiedby
@@ -74,9 +91,6 @@ nameval=args.name
 folderpath=args.folderpath
 
 
-# get cli location from properties, check that cli is there if not ERROR and stop
-clicommand=getclicommand()
-
 # calculate time period for files
 # now=dt.today()-td(days=int(changeddays))
 # subset_date=now.strftime("%Y-%m-%dT%H:%M:%S")
@@ -143,13 +157,19 @@ if areyousure.upper() =='Y':
 
 			reports_exported=0
 
+			# the paths of the reports are requested concurrently
+			reportpaths=getpaths(["/reports/reports/"+item["id"] for item in resultdata['items']],workers)
+
+			# the reports to export, the exports run in the pipeline below
+			exportitems=[]
+
 			for i in range(0,returned_items):
 
 				id=resultdata['items'][i]["id"]
 
-				path_to_report=getpath("/reports/reports/"+id)
+				path_to_report=reportpaths[i]
 
-				if path_to_report.startswith(folderpath):
+				if path_to_report is not None and path_to_report.startswith(folderpath):
 
 					path_to_report=path_to_report.replace("/","_")
 
@@ -157,45 +177,42 @@ if areyousure.upper() =='Y':
 
 					json_name=get_valid_filename(path_to_report+resultdata['items'][i]["name"].replace(" ","")+'_'+str(i))
 					
-					if autoIncludeDep:
-						command=clicommand+' transfer export -u /reports/reports/'+id+' --name "'+package_name+'" -d'
-					else:
-						command=clicommand+' transfer export -u /reports/reports/'+id+' --name "'+package_name+'"'
+					completefile=os.path.join(path,json_name+'.json')
 
-					try:
-						print(command)
-					except UnicodeEncodeError:
-						print(command.encode('ascii','replace'))
-					
-					rc=subprocess.call(command, shell=True)
+					exportitems.append({'uri':'/reports/reports/'+id,'filename':completefile,'name':package_name,'includedependencies':autoIncludeDep,'itemname':resultdata['items'][i]["name"]})
 
-					# if the export command fails then skip to the next item
-					if rc != 0:
-						print("ERROR: There was a problem exporting content '"+ resultdata['items'][i]["name"] + "', command returned code "+str(rc))
-						continue
-					
-					reports_exported=reports_exported+1
-					reqval='/transfer/packages?filter=eq(name,"'+package_name+'")'
-					package_info=callrestapi(reqval,reqtype)
+			# export the reports, download the packages and remove them from the server if asked to
+			pipeline=SnapshotPipeline(workers=workers,remove=autotranferremove)
 
-					package_id=package_info['items'][0]['id']
+			store=None
+			if storedir is not None:
+				store=SnapshotStore(storedir)
+				store.startrun()
 
-					completefile=os.path.join(path,json_name+'.json')
-					command=clicommand+' transfer download --file '+completefile+' --id '+package_id
-					
-					try:
-						print(command)
-					except UnicodeEncodeError:
-						print(command.encode('ascii','replace'))
-										
-					subprocess.call(command, shell=True)
-					#time.sleep(1)
-					if autotranferremove:
-						print(clicommand+' transfer delete --id '+package_id+"\n")
-						remTransferObject = subprocess.Popen(clicommand+' transfer delete --id '+package_id, stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-						remTransferObjectOutput = remTransferObject.communicate(b'Y\n')
-						remTransferObject.wait()
+			for result in pipeline.run(exportitems):
+
+				# if the export fails then go on to the next report
+				if result['error'] is not None:
+					print("ERROR: There was a problem exporting content '"+ result['itemname'] + "': "+result['error'])
+					continue
 
+				reports_exported=reports_exported+1
+				print("NOTE: report '"+ result['itemname'] + "' was exported to " + result['filename'])
+
+				# the package is moved into the snapshot store, a package that is already there is not stored again
+				if store is not None:
+					store.putfile(os.path.splitext(os.path.basename(result['filename']))[0],result['filename'])
+					os.remove(result['filename'])
+
+			# write the index of this run and remove the runs that are past the retention period
+			if store is not None:
+				print("NOTE: run "+store.runname+" written to snapshot store "+store.saverun())
+				if keepdays is not None:
+					pruned=store.prune(keepdays)
+					if pruned is None:
+						print("NOTE: another run is using the snapshot store, old runs are removed by the next run")
+					else:
+						print("NOTE: "+str(len(pruned[0]))+" runs and "+str(pruned[1])+" packages removed from the snapshot store")
 
 			print("NOTE: "+str(total_items)+" total reports found, "+str(reports_exported)+" reports exported to json files in "+path)
 
@@ -0,0 +1,364 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# snapshotstore.py
+# October 2026
+#
+# A content-addressed store for snapshot packages. Each package is stored once, compressed, under the sha256
+# of its content in a shared objects directory, so a package that is the same as last night's takes no more
+# space. Each run writes a small index that maps the package names of that run to their hashes. Runs older than
+# the retention period are removed by deleting their index and then every object no remaining index refers to.
+#
+# Every export creates a package with a new id, name and timestamps, so the hash leaves out the top level fields
+# in PACKAGEFIELDS and is taken over the rest of the package with its keys sorted. A package whose objects have
+# not changed has the same hash as the last run and the package first stored with that hash is kept.
+#
+# Several runs can use the same store at once. A run holds a shared lock on the store lock file from startrun
+# to saverun and prune takes an exclusive lock, so objects a run has written but not yet indexed are never
+# removed. prune does not wait for a run, it removes nothing when one is in progress. Objects used or written
+# since the oldest run that is kept, less a grace period, are kept as well, for file systems without locks.
+#
+# Packages are compressed with zstd when the zstandard package is installed, otherwise with gzip. Objects
+# written with either can be read as long as the module that wrote them is available.
+#
+#   <store>/objects/ab/ab12...ef.json.zst    a package, named by its getpackagehash hash
+#   <store>/runs/20261018T020000.json        the index of a run, package name to hash
+#   <store>/store.lock                       locked by runs and prune
+#
+# SnapshotStore
+#   startrun    begin a run, the run name defaults to the current time
+#   putfile     add a package file to the current run, the file can then be removed
+#   saverun     write the index of the current run
+#   getruns     the names of the runs in the store, oldest first
+#   getrun      the index of a run
+#   extract     write a package of a run back to a json file
+#   prune       remove runs older than keepdays and the objects only they used
+#
+# getpackagehash  the hash of a package file that stays the same when the package is exported again
+#
+# Example:
+#
+#   from snapshotstore import SnapshotStore
+#
+#   store=SnapshotStore('/backup/snapshots')
+#   store.startrun()
+#   store.putfile('_gelcontent_reports_Sales','/tmp/snapshot/_gelcontent_reports_Sales.json')
+#   store.saverun()
+#   store.prune(keepdays=30)
+#
+# The package kept for a hash is the one first stored, so a package extracted from a run can have the name and
+# id of the package of an earlier run.
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 Packages are hashed without their id, name and timestamps, runs and prune lock the store
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# file locks are not available on every platform, without them prune relies on the grace period
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# file name extension of the objects written with each compression
+EXTENSIONS={'zstd':'.json.zst','gzip':'.json.gz'}
+
+# fields of a package that are different every time it is exported
+PACKAGEFIELDS=['id','name','description','version','createdBy','creationTimeStamp','modifiedBy','modifiedTimeStamp','links']
+
+# seconds before the oldest run that is kept in which objects are not removed by prune
+GRACESECONDS=86400
+
+
+# getpackagehash
+# the sha256 of a package without the fields in PACKAGEFIELDS, so the same objects exported again give the same
+# hash, a file that is not a json object is hashed as it is
+# change history
+#   18OCT2026 initial development
+
+def getpackagehash(filename):
+
+    try:
+        with open(filename,'rb') as f:
+            package=json.loads(f.read().decode('utf-8'))
+    except ValueError:
+        package=None
+
+    digest=hashlib.sha256()
+
+    if isinstance(package,dict):
+        for field in PACKAGEFIELDS:
+            package.pop(field,None)
+        digest.update(json.dumps(package,sort_keys=True,separators=(',',':')).encode('utf-8'))
+    else:
+        with open(filename,'rb') as f:
+            for chunk in iter(lambda: f.read(1048576),b''):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class SnapshotStore(object):
+
+    def __init__(self,directory,compression=None):
+
+        if compression is None:
+            compression='zstd' if zstandard is not None else 'gzip'
+
+        if compression not in EXTENSIONS:
+            raise ValueError("compression must be one of "+', '.join(EXTENSIONS))
+        if compression=='zstd' and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package, pip install zstandard")
+
+        self.directory=directory
+        self.compression=compression
+        self.objectsdir=os.path.join(directory,'objects')
+        self.runsdir=os.path.join(directory,'runs')
+        self.lockfilename=os.path.join(directory,'store.lock')
+        self.lock=threading.Lock()
+        self.runlock=None
+        self.run=None
+        self.runname=None
+
+        for subdir in [self.objectsdir,self.runsdir]:
+            if not os.path.isdir(subdir):
+                os.makedirs(subdir)
+
+    # begin a run, the store is locked for prune until saverun
+    # the empty index of the run is written at once, a run name that is already used gets a suffix, -2, -3 and so on,
+    # so runs started in the same second do not replace each other
+    def startrun(self,runname=None):
+
+        if runname is None:
+            runname=time.strftime('%Y%m%dT%H%M%S')
+
+        self.runlock=self._lock(shared=True)
+
+        basename=runname
+        suffix=1
+
+        while True:
+            try:
+                runfile=os.open(os.path.join(self.runsdir,runname+'.json'),os.O_CREAT|os.O_EXCL|os.O_WRONLY)
+                break
+            except FileExistsError:
+                suffix=suffix+1
+                runname=basename+'-'+str(suffix)
+
+        self.runname=runname
+        self.run={'name':runname,'created':time.time(),'compression':self.compression,'packages':{}}
+
+        with os.fdopen(runfile,'w') as f:
+            json.dump(self.run,f,indent=1,sort_keys=True)
+
+        return runname
+
+    # store a package file under its hash and add it to the current run as name
+    # the hash is returned, a package that is already in the store is not written again but its time is updated
+    # so prune sees it was used
+    def putfile(self,name,filename):
+
+        packagehash=getpackagehash(filename)
+
+        objectfile=self.getobjectfile(packagehash)
+        if objectfile is None:
+            self._writeobject(packagehash,filename)
+        else:
+            os.utime(objectfile,None)
+
+        with self.lock:
+            self.run['packages'][name]=packagehash
+
+        return packagehash
+
+    def _objectfile(self,packagehash,compression):
+
+        return os.path.join(self.objectsdir,packagehash[:2],packagehash+EXTENSIONS[compression])
+
+    # the file an object is stored in, with whichever compression it was written, or None
+    def getobjectfile(self,packagehash):
+
+        for compression in EXTENSIONS:
+            objectfile=self._objectfile(packagehash,compression)
+            if os.path.isfile(objectfile):
+                return objectfile
+
+        return None
+
+    def _writeobject(self,packagehash,filename):
+
+        objectfile=self._objectfile(packagehash,self.compression)
+        objectdir=os.path.dirname(objectfile)
+        if not os.path.isdir(objectdir):
+            os.makedirs(objectdir,exist_ok=True)
+
+        # written under a temporary name so a partly written object is never taken for a complete one
+        tmpfile=objectfile+'.'+str(os.getpid())+'.'+str(threading.get_ident())+'.tmp'
+
+        with open(filename,'rb') as source:
+            if self.compression=='zstd':
+                with open(tmpfile,'wb') as target:
+                    zstandard.ZstdCompressor(level=10).copy_stream(source,target)
+            else:
+                with gzip.open(tmpfile,'wb',compresslevel=6) as target:
+                    shutil.copyfileobj(source,target,1048576)
+
+        os.replace(tmpfile,objectfile)
+
+    def saverun(self):
+
+        runfile=os.path.join(self.runsdir,self.runname+'.json')
+        tmpfile=runfile+'.'+str(os.getpid())+'.tmp'
+
+        with self.lock:
+            with open(tmpfile,'w') as f:
+                json.dump(self.run,f,indent=1,sort_keys=True)
+
+        os.replace(tmpfile,runfile)
+
+        self._unlock(self.runlock)
+        self.runlock=None
+
+        return runfile
+
+    # lock the store lock file, shared for a run and exclusive for prune, returns the open lock file
+    # or None when an exclusive lock is asked for and a run holds the store
+    def _lock(self,shared):
+
+        lockfile=open(self.lockfilename,'a')
+
+        if fcntl is not None:
+            try:
+                if shared:
+                    fcntl.flock(lockfile,fcntl.LOCK_SH)
+                else:
+                    fcntl.flock(lockfile,fcntl.LOCK_EX|fcntl.LOCK_NB)
+            except (IOError, OSError):
+                lockfile.close()
+                return None
+
+        return lockfile
+
+    def _unlock(self,lockfile):
+
+        if lockfile is not None:
+            if fcntl is not None:
+                fcntl.flock(lockfile,fcntl.LOCK_UN)
+            lockfile.close()
+
+    # the names of the runs, oldest first
+    def getruns(self):
+
+        runs=[]
+        for filename in os.listdir(self.runsdir):
+            if filename.endswith('.json'):
+                runs.append(filename[:-len('.json')])
+
+        return sorted(runs,key=lambda runname:self.getrun(runname).get('created',0))
+
+    def getrun(self,runname):
+
+        with open(os.path.join(self.runsdir,runname+'.json')) as f:
+            return json.load(f)
+
+    # write the package name of a run to filename as the json file it was stored from
+    def extract(self,runname,name,filename):
+
+        packagehash=self.getrun(runname)['packages'][name]
+        objectfile=self.getobjectfile(packagehash)
+
+        if objectfile is None:
+            raise IOError("the package "+name+" of run "+runname+" is missing from the store, object "+packagehash)
+
+        with open(filename,'wb') as target:
+            if objectfile.endswith(EXTENSIONS['zstd']):
+                if zstandard is None:
+                    raise IOError("the package "+name+" is compressed with zstd, pip install zstandard to read it")
+                with open(objectfile,'rb') as source:
+                    zstandard.ZstdDecompressor().copy_stream(source,target)
+            else:
+                with gzip.open(objectfile,'rb') as source:
+                    shutil.copyfileobj(source,target,1048576)
+
+    # remove the runs created more than keepdays ago, never the current run or the newest one, and then
+    # every object that no remaining run refers to and that was last used before the oldest remaining run less
+    # GRACESECONDS, returns the names of the runs and the number of objects removed, or None when another run
+    # has the store locked and nothing was removed
+    def prune(self,keepdays):
+
+        lockfile=self._lock(shared=False)
+        if lockfile is None:
+            return None
+
+        try:
+            return self._prune(keepdays)
+        finally:
+            self._unlock(lockfile)
+
+    def _prune(self,keepdays):
+
+        cutoff=time.time()-keepdays*86400
+        runs=self.getruns()
+        removedruns=[]
+
+        for runname in runs[:-1]:
+            if runname!=self.runname and self.getrun(runname).get('created',0)<cutoff:
+                os.remove(os.path.join(self.runsdir,runname+'.json'))
+                removedruns.append(runname)
+
+        # the hashes still referred to by a run, and the time the oldest of those runs was created
+        referenced=set()
+        oldest=time.time()
+        for runname in self.getruns():
+            run=self.getrun(runname)
+            referenced.update(run['packages'].values())
+            oldest=min(oldest,run.get('created',oldest))
+        if self.run is not None:
+            referenced.update(self.run['packages'].values())
+            oldest=min(oldest,self.run['created'])
+        keepafter=oldest-GRACESECONDS
+
+        removedobjects=0
+        for subdir in os.listdir(self.objectsdir):
+            subdirpath=os.path.join(self.objectsdir,subdir)
+            if not os.path.isdir(subdirpath):
+                continue
+            for filename in os.listdir(subdirpath):
+                # objects being written by another run are left alone
+                if filename.endswith('.tmp'):
+                    continue
+                packagehash=filename.split('.')[0]
+                objectfile=os.path.join(subdirpath,filename)
+                if packagehash not in referenced and os.path.getmtime(objectfile)<keepafter:
+                    os.remove(objectfile)
+                    removedobjects=removedobjects+1
+
+        return removedruns,removedobjects
@@ -0,0 +1,190 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# transfer.py
+# October 2026
+#
+# Export Viya content to transfer packages with the /transfer REST API, without running the sas-viya CLI.
+# An export job is created for a list of object uris, its state is polled until it finishes, the package it
+# created is streamed to a json file and then, optionally, deleted from the server. The json file is the same
+# package the CLI "transfer download" command writes, so it can be imported with the CLI or importpackages.py.
+#
+#   exportpackage     create an export job for a list of uris
+#   waitforexport     poll an export job until it has completed or failed
+#   exportandwait     create an export job and wait for the package it creates
+#   getpackageid      the id of the package an export job created
+#   downloadpackage   stream a package to a json file
+#   deletepackage     delete a package from the server
+#   exporttofile      all of the above for one package, the function most tools need
+#
+# Example:
+#
+#   from transfer import exporttofile
+#
+#   exporttofile(['/reports/reports/1234'],'/tmp/myreport.json',includedependencies=True,remove=True)
+#
+# Change History
+#
+#  18OCT2026 Initial development
+#  18OCT2026 Added exportandwait for tools that download the packages themselves
+#  18OCT2026 waitforexport uses waitforjob from sharedfunctions
+#
+# Copyright © 2026, SAS Institute Inc., Cary, NC, USA.  All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the License);
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import uuid
+
+from sharedfunctions import callrestapi, downloadrestapi, getpyviyasetting, waitforjob
+
+EXPORTREQUEST='application/vnd.sas.transfer.export.request+json'
+EXPORTJOB='application/vnd.sas.transfer.export.job+json'
+PACKAGE='application/vnd.sas.transfer.package+json'
+
+# states an export job does not leave
+FINISHEDSTATES=['completed','failed','canceled','cancelled','timedOut']
+
+
+# exportpackage
+# create an export job for a list of object uris and return the job json, or None when it could not be created
+# the package is given a unique name unless one is passed in
+# change history
+#   18OCT2026 initial development
+
+def exportpackage(items,name=None,description=None,includedependencies=False,stoponerror=0):
+
+    if name is None:
+        name=str(uuid.uuid1())
+
+    data={'name':name,'items':list(items)}
+    if description is not None:
+        data['description']=description
+    if includedependencies:
+        data['options']={'includeDependencies':True}
+
+    return callrestapi('/transfer/exportJobs','post',acceptType=EXPORTJOB,contentType=EXPORTREQUEST,data=data,stoponerror=stoponerror)
+
+
+# waitforexport
+# poll an export job until it is in a finished state and return the job json, the wait between polls starts
+# short and doubles up to maxwait seconds, None is returned when the job cannot be read or timeout passes
+# timeout defaults to PYVIYA_TRANSFER_TIMEOUT or pyviya.transfer.timeout in application.properties, 3600 seconds
+# change history
+#   18OCT2026 initial development
+#   18OCT2026 the polling is done by waitforjob
+
+def waitforexport(job,timeout=None,minwait=0.1,maxwait=2.0):
+
+    if timeout is None:
+        timeout=float(getpyviyasetting('PYVIYA_TRANSFER_TIMEOUT','pyviya.transfer.timeout',3600))
+
+    if job is None or job.get('state') in FINISHEDSTATES:
+        return job
+
+    jobid=job['id']
+    job,error=waitforjob(lambda: callrestapi('/transfer/exportJobs/'+jobid,'get',acceptType=EXPORTJOB,stoponerror=0,nocache=True),
+                         lambda job: job.get('state') in FINISHEDSTATES,timeout=timeout,minwait=minwait,maxwait=maxwait)
+
+    if error is not None:
+        print("ERROR: export job "+jobid+" "+error)
+        return None
+
+    return job
+
+
+# getpackageid
+# the id of the package a completed export job created, from its packageUri or else by its unique name
+# change history
+#   18OCT2026 initial development
+
+def getpackageid(job):
+
+    packageuri=job.get('packageUri')
+    if packageuri:
+        return packageuri.rstrip('/').split('/')[-1]
+
+    package_info=callrestapi('/transfer/packages?filter=eq(name,"'+job['name']+'")','get',stoponerror=0)
+    if package_info is not None and package_info.get('items'):
+        return package_info['items'][0]['id']
+
+    return None
+
+
+# downloadpackage
+# stream a package to a file, returns the number of bytes written or None when the download failed
+# change history
+#   18OCT2026 initial development
+
+def downloadpackage(packageid,filename):
+
+    return downloadrestapi('/transfer/packages/'+packageid,filename,acceptType=PACKAGE,stoponerror=0)
+
+
+# deletepackage
+# delete a package from the server, True when it was deleted
+# change history
+#   18OCT2026 initial development
+
+def deletepackage(packageid):
+
+    return callrestapi('/transfer/packages/'+packageid,'delete',stoponerror=0) is not None
+
+
+# exportandwait
+# export a list of uris to one package and wait for the export to finish
+# returns the package id and None, or None and a message when the export failed
+# change history
+#   18OCT2026 initial development
+
+def exportandwait(items,name=None,description=None,includedependencies=False,timeout=None):
+
+    job=exportpackage(items,name,description,includedependencies)
+    if job is None:
+        return None,"cannot create an export job for "+', '.join(items)
+
+    job=waitforexport(job,timeout)
+    if job is None:
+        return None,"the export job for "+', '.join(items)+" did not finish"
+
+    if job.get('state')!='completed':
+        return None,"export job "+job['id']+" for "+', '.join(items)+" finished with state "+str(job.get('state'))
+
+    packageid=getpackageid(job)
+    if packageid is None:
+        return None,"cannot find the package created by export job "+job['id']
+
+    return packageid,None
+
+
+# exporttofile
+# export a list of uris to one package, download it to filename and delete it from the server when remove is True
+# returns the package id, or None after printing an error when any step failed
+# change history
+#   18OCT2026 initial development
+
+def exporttofile(items,filename,name=None,description=None,includedependencies=False,remove=False,timeout=None):
+
+    packageid,error=exportandwait(items,name,description,includedependencies,timeout)
+    if packageid is None:
+        print("ERROR: "+error)
+        return None
+
+    if downloadpackage(packageid,filename) is None:
+        print("ERROR: cannot download package "+packageid+" to "+filename)
+        return None
+
+    if remove:
+        deletepackage(packageid)
+
+    return packageid
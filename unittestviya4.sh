@@ -106,6 +106,20 @@ echo
 # snapshot reports
 ${pyversion} snapshotreports.py -d ${testdir}/reportsnapshot -f "/Products/SAS Visual Analytics/Samples" -q
 
+# snapshot the same reports twice into a snapshot store, reports that did not change are stored once
+echo "NOTE: snapshot reports to a snapshot store twice: ${pyversion} snapshotreports.py -d ${testdir}/storesnapshot -f /temporary --store ${testdir}/snapshotstore -q"
+${pyversion} snapshotreports.py -d ${testdir}/storesnapshot -f /temporary --store ${testdir}/snapshotstore -q
+storedfirst=$(find ${testdir}/snapshotstore/objects -name "*.json.*" | wc -l)
+${pyversion} snapshotreports.py -d ${testdir}/storesnapshot -f /temporary --store ${testdir}/snapshotstore -q
+storedsecond=$(find ${testdir}/snapshotstore/objects -name "*.json.*" | wc -l)
+if [ "${storedfirst}" -gt 0 ] && [ "${storedfirst}" -eq "${storedsecond}" ]; then
+  echo "NOTE: unchanged reports were stored once, ${storedsecond} packages in the snapshot store"
+else
+  echo "ERROR: the second snapshot stored more packages, ${storedfirst} after the first run and ${storedsecond} after the second"
+fi
+${pyversion} extractsnapshot.py -s ${testdir}/snapshotstore -l
+echo
+
 
 echo "NOTE: Create custom groups: ${pyversion} creategroups.py -f ${testdir}/creategroups.csv --skipfirstrow"
 
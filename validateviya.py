@@ -20,12 +20,13 @@
 # Change History
 #
 # AUG2023 Fixed bug in order of columns for HTML output
+# OCT2026 The compute job is waited for with waitforjob, with a timeout and backoff when the server does not hold the request
 #
 
 from __future__ import print_function
 
 import argparse
-from sharedfunctions import callrestapi,printresult,file_accessible
+from sharedfunctions import callrestapi,printresult,file_accessible,waitforjob
 import json
 import os
 import sys
@@ -332,10 +333,12 @@ if(len(computationTests) == 1):
 
             #Get job state - we want to see if it ran successfully
             getJobStateReq="/compute/sessions/" + sessionId + "/jobs/" + jobId + "/state?wait=10"
-            jobState = callrestapi(getJobStateReq, "get")
-            #Continually check the job state until it is no longer running:
-            while(jobState == "running"):
-                jobState = callrestapi(getJobStateReq, "get")
+            #Each request is held by the server for up to 10 seconds until the state changes:
+            jobState, waitError = waitforjob(lambda: callrestapi(getJobStateReq, "get", stoponerror=False, nocache=True),
+                                             lambda state: state not in ["pending", "running"])
+            if(waitError is not None):
+                print("Compute job " + jobId + " " + waitError)
+                jobState = str(jobState)
 
             #Record our final job state:
             executeData_result_json['jobState'] = jobState